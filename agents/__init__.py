@@ -5,27 +5,125 @@ outlined in the README. Each agent ships with a focused interface to keep
 orchestration frameworks free of boilerplate.
 """
 
-from .ai_delegate import AIDelegate
-from .api_docsmith import APIDocsmith
-from .base import BaseAgent
-from .config import AGENTS, AgentConfig
-from .dependency_steward import DependencySteward
-from .hallucination_sentinel import HallucinationSentinel
-from .first_prompt_trigger import FirstPromptTrigger
-from .lint_tester import LintTester
-from .socii_guardian import SOCIIGuardian
-from .tdd_enforcer import TDDEnforcer
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .advisories import AdvisoryIndex
+    from .ai_delegate import AIDelegate, SimulatedGenerator
+    from .api_docsmith import APIDocsmith
+    from .base import BaseAgent
+    from .config import AGENTS, AgentConfig
+    from .daemon import DaemonClient
+    from .daemon.server import AgentDaemon
+    from .delegate_cache import CachingAIDelegate
+    from .dependency_steward import DependencySteward
+    from .drift_tracker import DriftTracker
+    from .evidence_index import EvidenceIndex
+    from .findings import Finding
+    from .hallucination_sentinel import HallucinationSentinel
+    from .impact_analysis import ImportGraph, TestImpactAnalyzer
+    from .infra_scan import InfraScanner
+    from .first_prompt_trigger import FirstPromptTrigger
+    from .lint_cache import LintCache
+    from .lint_tester import LintTester
+    from .metrics import METRICS, Metrics
+    from .pipeline import Pipeline, Stage
+    from .port_policy import PortPolicy
+    from .socii_guardian import SOCIIGuardian
+    from .streaming_gate import StreamingGate
+    from .tdd_enforcer import TDDEnforcer
+    from .testfile_index import TestFileIndex
+    from .timing_db import TimingDatabase
+    from .work_queue import LocalQueue, SQLiteQueue, Worker
+
+# Public name -> submodule. Submodules load on first access, so lightweight
+# entry points (such as the daemon client) do not pay for importing every agent.
+_EXPORTS = {
+    "AdvisoryIndex": "advisories",
+    "AIDelegate": "ai_delegate",
+    "SimulatedGenerator": "ai_delegate",
+    "APIDocsmith": "api_docsmith",
+    "BaseAgent": "base",
+    "AGENTS": "config",
+    "AgentConfig": "config",
+    "AgentDaemon": "daemon.server",
+    "DaemonClient": "daemon",
+    "CachingAIDelegate": "delegate_cache",
+    "DependencySteward": "dependency_steward",
+    "DriftTracker": "drift_tracker",
+    "EvidenceIndex": "evidence_index",
+    "Finding": "findings",
+    "HallucinationSentinel": "hallucination_sentinel",
+    "ImportGraph": "impact_analysis",
+    "TestImpactAnalyzer": "impact_analysis",
+    "InfraScanner": "infra_scan",
+    "FirstPromptTrigger": "first_prompt_trigger",
+    "LintCache": "lint_cache",
+    "LintTester": "lint_tester",
+    "METRICS": "metrics",
+    "Metrics": "metrics",
+    "Pipeline": "pipeline",
+    "Stage": "pipeline",
+    "PortPolicy": "port_policy",
+    "SOCIIGuardian": "socii_guardian",
+    "StreamingGate": "streaming_gate",
+    "TDDEnforcer": "tdd_enforcer",
+    "TestFileIndex": "testfile_index",
+    "TimingDatabase": "timing_db",
+    "LocalQueue": "work_queue",
+    "SQLiteQueue": "work_queue",
+    "Worker": "work_queue",
+}
 
 __all__ = [
+    "AdvisoryIndex",
+    "AgentDaemon",
     "AIDelegate",
     "AGENTS",
     "APIDocsmith",
     "BaseAgent",
+    "DaemonClient",
     "DependencySteward",
+    "DriftTracker",
+    "EvidenceIndex",
+    "Finding",
     "FirstPromptTrigger",
     "HallucinationSentinel",
+    "ImportGraph",
+    "InfraScanner",
+    "LintCache",
     "LintTester",
+    "LocalQueue",
+    "METRICS",
+    "Metrics",
     "AgentConfig",
+    "Pipeline",
+    "PortPolicy",
+    "CachingAIDelegate",
     "SOCIIGuardian",
+    "SimulatedGenerator",
+    "SQLiteQueue",
+    "Stage",
+    "StreamingGate",
     "TDDEnforcer",
+    "TestImpactAnalyzer",
+    "TimingDatabase",
+    "TestFileIndex",
+    "Worker",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
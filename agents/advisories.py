@@ -0,0 +1,369 @@
+"""Precompiled advisory index for the Dependency Steward.
+
+Advisories are compiled once into per-package sorted, merged version
+intervals (plus exact version sets) so each dependency check is a dictionary
+lookup and a binary search. Indexes can be built from plain mappings, version
+specifiers such as ``>=1.2,<1.4.7``, or an offline OSV dump, and saved as
+JSON, so an index shared between hosts is plain data that loads quickly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .lockfiles import canonical_name
+from .storage import atomic_write_bytes
+
+VersionKey = tuple
+# (lower, lower_inclusive, upper, upper_inclusive)
+Interval = Tuple[VersionKey, bool, VersionKey, bool]
+
+MIN_KEY: VersionKey = (-2,)
+MAX_KEY: VersionKey = (float("inf"),)
+# Bumped when the payload changes. Versions 1 and 2 were marshal and pickle
+# payloads; version 3 is JSON, which cannot run code when an index is loaded.
+_FORMAT_MAGIC = b"AIDX3\n"
+
+_VERSION = re.compile(r"^\s*v?(?:(\d+)!)?(\d+(?:\.\d+)*)(.*)$", re.IGNORECASE)
+_PRE = re.compile(r"^[-_.]?(a|b|c|rc|alpha|beta|pre|preview)[-_.]?(\d*)", re.IGNORECASE)
+_POST = re.compile(r"^(?:[-_.]?(?:post|rev|r)[-_.]?(\d*)|-(\d+))", re.IGNORECASE)
+_DEV = re.compile(r"^[-_.]?dev[-_.]?(\d*)", re.IGNORECASE)
+_SEMVER_PRE = re.compile(r"^-([0-9A-Za-z.-]+)")
+_PRE_RANK = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+_SPECIFIER = re.compile(r"^\s*(===|==|!=|~=|>=|<=|>|<)?\s*(\S+)\s*$")
+# A release prefix that ``==X.*`` and ``~=X.Y`` can bump: digits and dots, with an optional epoch.
+_RELEASE_PREFIX = re.compile(r"^(?:\d+!)?\d+(?:\.\d+)*$")
+
+
+@lru_cache(maxsize=1 << 16)
+def version_key(version: str) -> VersionKey:
+    """Return a sortable key approximating PEP 440 (and SemVer) ordering.
+
+    ``X.devN < X.aN < X.bN < X.rcN < X < X.postN``; trailing zero release
+    segments are ignored and local versions (``+local``) do not affect order.
+    Unparsable versions sort before every parsable one.
+    """
+
+    match = _VERSION.match(version)
+    if not match:
+        return (-1, (), (), (), (version,))
+    epoch = int(match.group(1) or 0)
+    release = tuple(int(part) for part in match.group(2).split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    rest = match.group(3).split("+", 1)[0]
+
+    pre: tuple = ()
+    pre_match = _PRE.match(rest)
+    if pre_match:
+        pre = (0, _PRE_RANK[pre_match.group(1).lower()], int(pre_match.group(2) or 0))
+        rest = rest[pre_match.end() :]
+    else:
+        semver = _SEMVER_PRE.match(rest)
+        if semver and not semver.group(1).isdigit():
+            identifiers = tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in semver.group(1).split("."))
+            pre = (0, -1, 0, identifiers)
+            rest = ""
+    post: tuple = ()
+    post_match = _POST.match(rest)
+    if post_match:
+        post = (int(post_match.group(1) or post_match.group(2) or 0),)
+        rest = rest[post_match.end() :]
+    dev: tuple = (1,)
+    dev_match = _DEV.match(rest)
+    if dev_match:
+        dev = (0, int(dev_match.group(1) or 0))
+    if not pre:
+        # A bare dev release precedes every pre-release of the same version.
+        pre = (-1,) if dev_match and not post else (1,)
+    return (epoch, release, pre, post, dev)
+
+
+def _contains(interval: Interval, key: VersionKey) -> bool:
+    lower, lower_inclusive, upper, upper_inclusive = interval
+    above = lower < key or (lower_inclusive and lower == key)
+    below = key < upper or (upper_inclusive and key == upper)
+    return above and below
+
+
+def _merge(intervals: Iterable[Interval]) -> List[Interval]:
+    """Merge overlapping or touching intervals into a sorted disjoint list."""
+
+    merged: List[List] = []
+    for lower, lower_inclusive, upper, upper_inclusive in sorted(intervals, key=lambda iv: (iv[0], not iv[1])):
+        if merged:
+            previous = merged[-1]
+            touches = lower < previous[2] or (lower == previous[2] and (previous[3] or lower_inclusive))
+            if touches:
+                if upper > previous[2]:
+                    previous[2], previous[3] = upper, upper_inclusive
+                elif upper == previous[2]:
+                    previous[3] = previous[3] or upper_inclusive
+                continue
+        merged.append([lower, lower_inclusive, upper, upper_inclusive])
+    return [tuple(interval) for interval in merged]  # type: ignore[misc]
+
+
+class AdvisoryIndex:
+    """Per-package vulnerable version sets compiled for fast lookups."""
+
+    def __init__(self) -> None:
+        self._exact: Dict[str, Set[str]] = {}
+        self._pending: Dict[str, List[Interval]] = {}
+        # package -> (sorted lower bounds, disjoint intervals)
+        self._compiled: Dict[str, Tuple[List[VersionKey], List[Interval]]] = {}
+        self.invalid: List[Tuple[str, str]] = []
+        """``(package, specifier)`` entries skipped by :meth:`add_specifier` as malformed."""
+
+    def __len__(self) -> int:
+        return len(set(self._exact) | set(self._pending) | set(self._compiled))
+
+    def add_version(self, package: str, version: str) -> None:
+        """Flag one exact version string."""
+
+        self._exact.setdefault(canonical_name(package), set()).add(version)
+
+    def add_range(
+        self,
+        package: str,
+        lower: Optional[str] = None,
+        upper: Optional[str] = None,
+        lower_inclusive: bool = True,
+        upper_inclusive: bool = False,
+    ) -> None:
+        """Flag every version between ``lower`` and ``upper`` (None means unbounded)."""
+
+        interval = (
+            version_key(lower) if lower is not None else MIN_KEY,
+            lower_inclusive and lower is not None,
+            version_key(upper) if upper is not None else MAX_KEY,
+            upper_inclusive and upper is not None,
+        )
+        self._pending.setdefault(canonical_name(package), []).append(interval)
+
+    def add_specifier(self, package: str, specifier: str) -> None:
+        """Flag versions matching a specifier set such as ``>=1.2,<1.4.7`` or ``==2.0``.
+
+        Bare versions without an operator are flagged as exact version strings;
+        the operator clauses are intersected into one range. ``!=`` clauses
+        cannot mark a version vulnerable and are ignored. An entry that is not
+        a specifier set at all (say ``1.0 beta``) is flagged verbatim, as the
+        plain ``{package: [version, ...]}`` advisories always were. A
+        specifier whose wildcard or ``~=`` version has no numeric release to
+        bump (say ``==1.0rc.*``) is skipped and recorded in :attr:`invalid`.
+        """
+
+        clauses = [clause for clause in specifier.split(",") if clause.strip()]
+        matches = [_SPECIFIER.match(clause) for clause in clauses]
+        if not clauses or None in matches:
+            if specifier.strip():
+                self.add_version(package, specifier.strip())
+            return
+        for match in matches:
+            operator, version = match.groups()  # type: ignore[union-attr]
+            wildcard = operator in ("==", "===") and version.endswith(".*")
+            if (wildcard and _next_release(version[:-2]) is None) or (
+                operator == "~=" and ("." not in version or _next_release(version.rsplit(".", 1)[0]) is None)
+            ):
+                self.invalid.append((canonical_name(package), specifier))
+                return
+        lower: Optional[str] = None
+        upper: Optional[str] = None
+        lower_inclusive = upper_inclusive = True
+        bounded = False
+        for match in matches:
+            operator, version = match.groups()  # type: ignore[union-attr]
+            if operator is None:
+                self.add_version(package, version)
+                continue
+            if operator == "!=":
+                continue
+            bounded = True
+            if operator in ("==", "==="):
+                if version.endswith(".*"):
+                    prefix = version[:-2]
+                    lower, lower_inclusive = prefix, True
+                    upper, upper_inclusive = _next_release(prefix), False
+                else:
+                    lower = upper = version
+                    lower_inclusive = upper_inclusive = True
+            elif operator in (">=", ">"):
+                lower, lower_inclusive = version, operator == ">="
+            elif operator in ("<=", "<"):
+                upper, upper_inclusive = version, operator == "<="
+            elif operator == "~=":
+                lower, lower_inclusive = version, True
+                upper, upper_inclusive = _next_release(version.rsplit(".", 1)[0]), False
+        if bounded:
+            self.add_range(package, lower, upper, lower_inclusive, upper_inclusive)
+
+    @classmethod
+    def from_mapping(cls, advisories: Mapping[str, Iterable[str]]) -> "AdvisoryIndex":
+        """Build an index from ``{package: [version or specifier, ...]}``."""
+
+        index = cls()
+        for package, entries in advisories.items():
+            for entry in entries:
+                index.add_specifier(package, entry)
+        return index.compile()
+
+    @classmethod
+    def from_osv(cls, directory: str | Path, ecosystem: str) -> "AdvisoryIndex":
+        """Build an index from an offline OSV dump (one JSON advisory per file).
+
+        Only packages from ``ecosystem`` (e.g. ``"PyPI"`` or ``"npm"``) are
+        indexed: the index is keyed by package name alone, and the same name
+        can belong to unrelated packages in different ecosystems.
+        """
+
+        index = cls()
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.endswith(".json"):
+                    with open(os.path.join(root, filename), encoding="utf-8") as handle:
+                        index.add_osv_record(json.load(handle), ecosystem=ecosystem)
+        return index.compile()
+
+    def add_osv_record(self, record: Mapping, ecosystem: str) -> None:
+        """Fold the packages of one OSV advisory that belong to ``ecosystem`` into the index."""
+
+        for affected in record.get("affected", []):
+            package = affected.get("package", {})
+            if package.get("ecosystem") != ecosystem:
+                continue
+            name = package.get("name")
+            if not name:
+                continue
+            for version in affected.get("versions", []):
+                self.add_version(name, version)
+            for version_range in affected.get("ranges", []):
+                if version_range.get("type") == "GIT":
+                    continue
+                introduced: Optional[str] = None
+                is_open = False
+                for event in version_range.get("events", []):
+                    if "introduced" in event:
+                        introduced = None if event["introduced"] == "0" else event["introduced"]
+                        is_open = True
+                    elif is_open and "fixed" in event:
+                        self.add_range(name, introduced, event["fixed"], upper_inclusive=False)
+                        is_open = False
+                    elif is_open and "last_affected" in event:
+                        self.add_range(name, introduced, event["last_affected"], upper_inclusive=True)
+                        is_open = False
+                if is_open:
+                    self.add_range(name, introduced, None)
+
+    def compile(self) -> "AdvisoryIndex":
+        """Merge pending ranges into sorted disjoint intervals; returns self."""
+
+        for package, intervals in self._pending.items():
+            existing = self._compiled.get(package, ([], []))[1]
+            merged = _merge([*existing, *intervals])
+            self._compiled[package] = ([interval[0] for interval in merged], merged)
+        self._pending.clear()
+        return self
+
+    def is_vulnerable(self, package: str, version: str) -> bool:
+        """Return whether ``package`` at ``version`` matches any advisory."""
+
+        if self._pending:
+            self.compile()
+        name = canonical_name(package)
+        if version in self._exact.get(name, ()):
+            return True
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            return False
+        lowers, intervals = compiled
+        key = version_key(version)
+        position = bisect_right(lowers, key) - 1
+        return position >= 0 and _contains(intervals[position], key)
+
+    def save(self, path: str | Path) -> None:
+        """Atomically serialize the compiled index as JSON.
+
+        Interval bounds are stored as version keys (nested lists), with null
+        for an unbounded end, so loading never re-parses version strings.
+        """
+
+        self.compile()
+        payload = {
+            "exact": {package: sorted(versions) for package, versions in sorted(self._exact.items())},
+            "ranges": {
+                package: [
+                    [
+                        None if lower == MIN_KEY else _encode_key(lower),
+                        lower_inclusive,
+                        None if upper == MAX_KEY else _encode_key(upper),
+                        upper_inclusive,
+                    ]
+                    for lower, lower_inclusive, upper, upper_inclusive in intervals
+                ]
+                for package, (_, intervals) in sorted(self._compiled.items())
+            },
+        }
+        atomic_write_bytes(path, _FORMAT_MAGIC + json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "AdvisoryIndex":
+        """Load an index written by :meth:`save`.
+
+        Raises:
+            ValueError: The file is not a current advisory index, or its payload is malformed.
+        """
+
+        data = Path(path).read_bytes()
+        if not data.startswith(_FORMAT_MAGIC):
+            raise ValueError(f"{path} is not an advisory index file (or was written by an older version).")
+        try:
+            payload = json.loads(data[len(_FORMAT_MAGIC) :])
+            index = cls()
+            index._exact = {
+                str(package): {str(version) for version in versions} for package, versions in payload["exact"].items()
+            }
+            for package, entries in payload["ranges"].items():
+                intervals: List[Interval] = [
+                    (
+                        MIN_KEY if lower is None else _decode_key(lower),
+                        bool(lower_inclusive),
+                        MAX_KEY if upper is None else _decode_key(upper),
+                        bool(upper_inclusive),
+                    )
+                    for lower, lower_inclusive, upper, upper_inclusive in entries
+                ]
+                index._compiled[str(package)] = ([interval[0] for interval in intervals], intervals)
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            raise ValueError(f"{path} holds a malformed advisory index: {exc}") from exc
+        return index
+
+
+def _next_release(prefix: str) -> Optional[str]:
+    """Return the smallest release above every version starting with ``prefix`` (None if it is no release)."""
+
+    if not _RELEASE_PREFIX.match(prefix):
+        return None
+    epoch, bang, release = prefix.rpartition("!")
+    parts = release.split(".")
+    parts[-1] = str(int(parts[-1]) + 1)
+    return f"{epoch}{bang}" + ".".join(parts) + ".dev0"
+
+
+def _encode_key(key: Any) -> Any:
+    return [_encode_key(part) for part in key] if isinstance(key, tuple) else key
+
+
+def _decode_key(value: Any) -> Any:
+    """Rebuild a version key from its JSON form, accepting only nested lists of ints and strings."""
+
+    if isinstance(value, list):
+        return tuple(_decode_key(part) for part in value)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"unexpected version key component {value!r}")
+    return value
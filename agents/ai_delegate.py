@@ -7,8 +7,18 @@ available.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, List, Optional
+import asyncio
+import inspect
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+EnhanceRequest = Tuple[str, Optional[List[str]]]
+BatchGenerator = Callable[[Sequence[EnhanceRequest]], List[str]]
+_RequestKey = Tuple[str, Tuple[str, ...]]
 
 
 def _fallback_generator(report: str, context: Optional[List[str]] = None) -> str:
@@ -18,13 +28,239 @@ def _fallback_generator(report: str, context: Optional[List[str]] = None) -> str
     return context_hint + "AI-enhanced summary:\n- " + "\n- ".join(report.splitlines())
 
 
+def _request_key(report: str, context: Optional[Sequence[str]]) -> _RequestKey:
+    return report, tuple(context or ())
+
+
+@dataclass
+class SimulatedGenerator:
+    """Deterministic stand-in for an LLM that simulates call latency.
+
+    Use it to exercise and benchmark the batching, concurrency, and coalescing
+    paths offline. It can be passed as ``generator`` (sync), ``generator=sim.agenerate``
+    (coroutine), and ``batch_generator=sim.batch``.
+    """
+
+    latency_seconds: float = 0.05
+    batch_overhead_seconds: float = 0.05
+    per_item_seconds: float = 0.005
+    calls: int = 0
+    batch_calls: int = 0
+    peak_concurrency: int = 0
+    _active: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _enter(self, batch: bool = False) -> None:
+        with self._lock:
+            if batch:
+                self.batch_calls += 1
+            else:
+                self.calls += 1
+            self._active += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._active)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def __call__(self, report: str, context: Optional[List[str]] = None) -> str:
+        self._enter()
+        try:
+            time.sleep(self.latency_seconds)
+            return _fallback_generator(report, context)
+        finally:
+            self._exit()
+
+    async def agenerate(self, report: str, context: Optional[List[str]] = None) -> str:
+        self._enter()
+        try:
+            await asyncio.sleep(self.latency_seconds)
+            return _fallback_generator(report, context)
+        finally:
+            self._exit()
+
+    def batch(self, requests: Sequence[EnhanceRequest]) -> List[str]:
+        self._enter(batch=True)
+        try:
+            time.sleep(self.batch_overhead_seconds + self.per_item_seconds * len(requests))
+            return [_fallback_generator(report, context) for report, context in requests]
+        finally:
+            self._exit()
+
+
 @dataclass
 class AIDelegate:
-    """Lightweight wrapper that can call into an LLM or heuristic enhancer."""
+    """Lightweight wrapper that can call into an LLM or heuristic enhancer.
+
+    Besides the one-report ``enhance`` call, the delegate offers
+    ``enhance_many`` and ``enhance_async``. Both merge identical in-flight
+    requests into a single generator call and run at most ``max_concurrency``
+    generator calls at once (per ``enhance_many`` call, or per event loop for
+    ``enhance_async``). When ``batch_generator`` is set, ``enhance_many`` sends
+    requests in batches of up to ``batch_size``.
+
+    Every entry point produces results through :meth:`_generate`, the one
+    hook subclasses override (for example, to memoize).
+    """
 
-    generator: Callable[[str, Optional[List[str]]], str] = _fallback_generator
+    generator: Callable[[str, Optional[List[str]]], Union[str, Awaitable[str]]] = _fallback_generator
+    batch_generator: Optional[BatchGenerator] = None
+    max_concurrency: int = 4
+    batch_size: int = 16
+    _inflight: Dict[_RequestKey, Future] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _inflight_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _async_state: Any = field(default_factory=weakref.WeakKeyDictionary, init=False, repr=False, compare=False)
 
     def enhance(self, report: str, context: Optional[List[str]] = None) -> str:
-        """Produce an AI-augmented report without changing core results."""
+        """Produce an AI-augmented report without changing core results.
+
+        Coroutine generators are run to completion, on a helper thread when
+        called from inside a running event loop; prefer :meth:`enhance_async`
+        there.
+        """
+
+        return _complete(self._generate([(report, context)]))[0]
+
+    def _generate(self, requests: Sequence[EnhanceRequest]) -> Union[List[str], Awaitable[List[str]]]:
+        """Produce one result per request, in order.
+
+        Several requests go to ``batch_generator`` when it is set; otherwise
+        ``generator`` is called per request. With a coroutine generator an
+        awaitable of the results is returned, which the caller awaits (or runs
+        to completion on synchronous paths).
+        """
+
+        if self.batch_generator is not None and len(requests) > 1:
+            return self.batch_generator(requests)
+        results = [self.generator(report, context) for report, context in requests]
+        if any(inspect.isawaitable(result) for result in results):
+            return _gather(results)
+        return results  # type: ignore[return-value]
+
+    def enhance_many(self, requests: Iterable[Union[str, EnhanceRequest]]) -> List[str]:
+        """Enhance several reports, returning results in request order.
+
+        Args:
+            requests: Reports, or ``(report, context)`` pairs.
+        """
+
+        normalized = [(r, None) if isinstance(r, str) else (r[0], r[1]) for r in requests]
+        keys = [_request_key(report, context) for report, context in normalized]
+
+        owned: Dict[_RequestKey, Future] = {}
+        waiting: Dict[_RequestKey, Future] = {}
+        with self._inflight_lock:
+            for key in dict.fromkeys(keys):
+                existing = self._inflight.get(key)
+                if existing is not None:
+                    waiting[key] = existing
+                else:
+                    owned[key] = self._inflight[key] = Future()
+
+        try:
+            self._resolve(owned)
+        finally:
+            with self._inflight_lock:
+                for key in owned:
+                    self._inflight.pop(key, None)
+
+        futures = {**waiting, **owned}
+        return [futures[key].result() for key in keys]
+
+    def _resolve(self, futures: Dict[_RequestKey, Future]) -> None:
+        """Run generator calls for the owned requests and complete their futures."""
+
+        keys = list(futures)
+        if not keys:
+            return
+
+        def _settle(group: Sequence[_RequestKey], produce: Callable[[], List[str]]) -> None:
+            try:
+                results = produce()
+                if len(results) != len(group):
+                    raise ValueError("batch_generator returned a different number of results than requests.")
+            except BaseException as exc:
+                for key in group:
+                    futures[key].set_exception(exc)
+                return
+            for key, result in zip(group, results):
+                futures[key].set_result(result)
+
+        size = self.batch_size if self.batch_generator is not None else 1
+        groups = [keys[i : i + size] for i in range(0, len(keys), size)]
+
+        def _produce(group: Sequence[_RequestKey]) -> List[str]:
+            return _complete(self._generate([(report, list(context) or None) for report, context in group]))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(groups)))) as pool:
+            for group in groups:
+                pool.submit(_settle, group, lambda group=group: _produce(group))
+
+    async def enhance_async(self, report: str, context: Optional[List[str]] = None) -> str:
+        """Asynchronously enhance a report.
+
+        Coroutine generators are awaited directly; synchronous generators run
+        on the loop's default executor. Identical concurrent requests share one
+        generator call.
+        """
+
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            state = self._async_state[loop] = (asyncio.Semaphore(max(1, self.max_concurrency)), {})
+        semaphore, inflight = state
+
+        key = _request_key(report, context)
+        pending = inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        pending = inflight[key] = loop.create_future()
+        try:
+            async with semaphore:
+                if inspect.iscoroutinefunction(self.generator):
+                    produced = self._generate([(report, context)])
+                    results = await produced if inspect.isawaitable(produced) else produced
+                else:
+                    results = await loop.run_in_executor(None, lambda: _complete(self._generate([(report, context)])))
+                result = results[0]
+            pending.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except BaseException as exc:
+            pending.set_exception(exc)
+            # Mark the exception as retrieved when no coalesced waiter picks it up.
+            pending.exception()
+            raise
+        finally:
+            inflight.pop(key, None)
+
+
+async def _gather(results: Sequence[Union[str, Awaitable[str]]]) -> List[str]:
+    async def _one(result: Union[str, Awaitable[str]]) -> str:
+        return await result if inspect.isawaitable(result) else result
+
+    return list(await asyncio.gather(*(_one(result) for result in results)))
+
+
+def _complete(results: Union[List[str], Awaitable[List[str]]]) -> List[str]:
+    """Return ``results``, running an awaitable to completion first.
+
+    ``asyncio.run`` cannot start inside a running event loop, so in that case
+    the awaitable runs on a helper thread with its own loop.
+    """
+
+    if not inspect.isawaitable(results):
+        return results
+
+    async def _wait() -> List[str]:
+        return await results
 
-        return self.generator(report, context)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_wait())
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-delegate") as pool:
+        return pool.submit(asyncio.run, _wait()).result()
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable, List, Mapping
+from typing import Any, Iterable, Mapping
 
+from .api_reference import iter_openapi_endpoints, write_reference
 from .base import BaseAgent
 from .config import AGENTS
+from .docs_site import build_site
 
 
 class APIDocsmith(BaseAgent):
@@ -16,19 +18,48 @@ class APIDocsmith(BaseAgent):
         super().__init__(config=AGENTS["api_docsmith"])
 
     def generate_markdown(self, endpoints: Iterable[Mapping[str, str]], output_path: str | Path) -> str:
-        """Generate a simple Markdown reference for the provided endpoints."""
-
-        output_path = Path(output_path)
-        lines: List[str] = ["# API Reference", ""]
-        for endpoint in endpoints:
-            name = endpoint.get("name", "Unnamed Endpoint")
-            method = endpoint.get("method", "GET")
-            path = endpoint.get("path", "/")
-            description = endpoint.get("description", "No description provided.")
-            lines.extend([f"## {name}", f"**Method:** `{method}`", f"**Path:** `{path}`", "", description, ""])
-
-        output_path.write_text("\n".join(lines))
-        report = f"Wrote documentation to {output_path}"
+        """Generate a simple Markdown reference for the provided endpoints.
+
+        The file is streamed and replaced atomically. A sidecar manifest
+        (``<output>.manifest.json``) fingerprints each endpoint section, so
+        regenerations only write sections that changed and copy the rest from
+        the previous output.
+        """
+
+        build = write_reference(endpoints, output_path)
+        if build.unchanged:
+            detail = f"unchanged, {build.reused} endpoint(s) up to date"
+        else:
+            detail = f"{build.rendered} endpoint(s) rendered, {build.reused} reused, {build.removed} removed"
+        report = f"Wrote documentation to {build.output_path} ({detail})"
+        return self.deliver(report, context=["api", "docs"])
+
+    def generate_from_openapi(self, spec: Mapping[str, Any] | str | Path, output_path: str | Path) -> str:
+        """Generate the Markdown reference from an OpenAPI document or file."""
+
+        return self.generate_markdown(iter_openapi_endpoints(spec), output_path)
+
+    def build_site(
+        self,
+        endpoints: Iterable[Mapping[str, Any]] | str | Path,
+        output_dir: str | Path,
+        workers: int | None = None,
+    ) -> str:
+        """Build a multi-page docs site with a prebuilt search index.
+
+        Endpoints are split into one page per (version, tag) and rendered in
+        parallel; ``endpoints`` may also be an OpenAPI file path. Artifacts get
+        content-hashed names listed in ``manifest.json``.
+        """
+
+        if isinstance(endpoints, (str, Path)) or (isinstance(endpoints, Mapping) and "paths" in endpoints):
+            endpoints = iter_openapi_endpoints(endpoints)
+        build = build_site(endpoints, output_dir, workers=workers)
+        report = (
+            f"Built documentation site in {build.output_dir}: {build.pages} page(s) for {build.endpoints} "
+            f"endpoint(s) ({build.pages_written} written, {build.pages - build.pages_written} unchanged), "
+            f"{build.search_files} search file(s), {build.removed} stale artifact(s) removed"
+        )
         return self.deliver(report, context=["api", "docs"])
 
     def summarize_changes(self, changelog: Iterable[str]) -> str:
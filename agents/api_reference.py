@@ -0,0 +1,311 @@
+"""OpenAPI ingestion and incremental Markdown rendering for the API Docsmith.
+
+Endpoints come from hand-built mappings or an OpenAPI (JSON, or YAML when
+PyYAML is installed) document. :func:`write_reference` streams the reference
+to a temporary file and atomically replaces the output. A sidecar manifest
+records a fingerprint and byte range per endpoint section, so a regeneration
+only writes sections whose rendering changed and copies every unchanged run of
+sections straight from the previous output (in-kernel where the platform
+supports ``copy_file_range``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .storage import atomic_write_text
+
+HEADER = "# API Reference\n"
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+_MANIFEST_VERSION = 2
+_COPY_CHUNK = 1 << 20
+# Keeps Windows from translating line endings in the raw descriptors used for copying.
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def render_endpoint(endpoint: Mapping[str, Any]) -> str:
+    """Render one endpoint section (with its leading blank line)."""
+
+    name = endpoint.get("name", "Unnamed Endpoint")
+    method = endpoint.get("method", "GET")
+    path = endpoint.get("path", "/")
+    description = endpoint.get("description", "No description provided.")
+    return f"\n## {name}\n**Method:** `{method}`\n**Path:** `{path}`\n\n{description}\n"
+
+
+def endpoint_key(endpoint: Mapping[str, Any]) -> str:
+    """Return the identity of an endpoint: ``"METHOD /path"``."""
+
+    return f"{endpoint.get('method', 'GET')} {endpoint.get('path', '/')}"
+
+
+def fingerprint(section: bytes) -> str:
+    """Hash a rendered endpoint section."""
+
+    return hashlib.blake2b(section, digest_size=12).hexdigest()
+
+
+def load_openapi(path: str | Path) -> Dict[str, Any]:
+    """Load an OpenAPI document from JSON, or YAML when PyYAML is installed."""
+
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError("Reading YAML OpenAPI specs requires the 'PyYAML' package.") from exc
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def iter_openapi_endpoints(spec: Mapping[str, Any] | str | Path) -> Iterator[Dict[str, str]]:
+    """Yield endpoint mappings (name, method, path, description, tags, version) from an OpenAPI spec."""
+
+    if not isinstance(spec, Mapping):
+        spec = load_openapi(spec)
+    version = str(spec.get("info", {}).get("version", ""))
+    for path, item in spec.get("paths", {}).items():
+        if not isinstance(item, Mapping):
+            continue
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if not isinstance(operation, Mapping):
+                continue
+            summary = operation.get("summary") or operation.get("operationId") or f"{method.upper()} {path}"
+            description = operation.get("description") or item.get("description") or "No description provided."
+            yield {
+                "name": summary.strip(),
+                "method": method.upper(),
+                "path": path,
+                "description": description.strip(),
+                "tags": ",".join(operation.get("tags") or []),
+                "version": version,
+            }
+
+
+@dataclass
+class ReferenceBuild:
+    """What a :func:`write_reference` call did."""
+
+    output_path: Path
+    rendered: int = 0
+    reused: int = 0
+    removed: int = 0
+    bytes_written: int = 0
+    bytes_copied: int = 0
+    unchanged: bool = False
+
+
+def manifest_path_for(output_path: str | Path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".manifest.json")
+
+
+def _load_manifest(stat: os.stat_result, manifest_path: Path) -> Dict[str, Tuple[str, int, int]]:
+    """Return ``{key: (fingerprint, offset, length)}`` when the manifest matches the output file ``stat``."""
+
+    try:
+        payload = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if (
+        payload.get("version") != _MANIFEST_VERSION
+        or payload.get("size") != stat.st_size
+        or payload.get("mtime_ns") != stat.st_mtime_ns
+        or payload.get("inode") != stat.st_ino
+    ):
+        return {}
+    return {key: (digest, offset, length) for key, digest, offset, length in payload["sections"]}
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _copy_range(source: int, target: int, offset: int, length: int) -> None:
+    """Append ``length`` bytes of ``source`` starting at ``offset`` to ``target``."""
+
+    copy_file_range = getattr(os, "copy_file_range", None)
+    while length > 0 and copy_file_range is not None:
+        try:
+            copied = copy_file_range(source, target, length, offset)
+        except OSError:
+            break  # e.g. cross-device or unsupported file system: fall back to read/write
+        if copied == 0:
+            break
+        offset += copied
+        length -= copied
+    if length > 0:
+        os.lseek(source, offset, os.SEEK_SET)  # os.pread is not available on Windows before Python 3.13
+    while length > 0:
+        data = os.read(source, min(length, _COPY_CHUNK))
+        if not data:
+            raise OSError(f"Unexpected end of file while copying {length} bytes.")
+        _write_all(target, data)
+        length -= len(data)
+
+
+def write_reference(
+    endpoints: Iterable[Mapping[str, Any]],
+    output_path: str | Path,
+    manifest_path: str | Path | None = None,
+) -> ReferenceBuild:
+    """Write the Markdown reference, writing only the endpoint sections that changed.
+
+    The document is streamed to a uniquely named temporary file next to
+    ``output_path`` and moved into place with :func:`os.replace`, so readers
+    never see a partial file and concurrent builds never share a staging file.
+    When no section changed, the output is left untouched.
+    """
+
+    output_path = Path(output_path)
+    manifest_path = Path(manifest_path) if manifest_path is not None else manifest_path_for(output_path)
+    # Sections are copied from this descriptor, so the manifest is checked against it rather
+    # than against whatever file a concurrent build may have moved into place since.
+    try:
+        old_fd = os.open(output_path, os.O_RDONLY | _O_BINARY)
+    except FileNotFoundError:
+        old_fd = -1
+    try:
+        previous = _load_manifest(os.fstat(old_fd), manifest_path) if old_fd != -1 else {}
+        build, staged = _write_sections(endpoints, output_path, previous, old_fd)
+    finally:
+        # Closed before the replace: Windows cannot replace a file that is still open.
+        if old_fd != -1:
+            os.close(old_fd)
+    if staged is None:
+        return build
+
+    staging_path, stat, sections = staged
+    try:
+        os.replace(staging_path, output_path)
+    except BaseException:
+        _discard(staging_path)
+        raise
+    payload = {
+        "version": _MANIFEST_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "sections": sections,
+    }
+    atomic_write_text(manifest_path, json.dumps(payload, separators=(",", ":")))
+    return build
+
+
+def _discard(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _write_sections(
+    endpoints: Iterable[Mapping[str, Any]],
+    output_path: Path,
+    previous: Dict[str, Tuple[str, int, int]],
+    old_fd: int,
+) -> Tuple[ReferenceBuild, Optional[Tuple[Path, os.stat_result, List[List[Any]]]]]:
+    """Stream the document to a staging file next to ``output_path``.
+
+    Returns the build counters and, unless nothing changed, the staging path,
+    its final ``stat``, and the manifest's section list.
+    """
+
+    build = ReferenceBuild(output_path=output_path)
+
+    # Resolve every section first: (key, fingerprint, new section bytes or None to reuse).
+    plan: List[Tuple[str, str, Optional[bytes]]] = []
+    seen: Dict[str, int] = {}
+    for endpoint in endpoints:
+        key = endpoint_key(endpoint)
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        if occurrence:
+            key = f"{key}#{occurrence}"
+        section = render_endpoint(endpoint).encode("utf-8")
+        digest = fingerprint(section)
+        cached = previous.get(key)
+        plan.append((key, digest, None if cached is not None and cached[0] == digest else section))
+    build.removed = len(previous.keys() - {key for key, _, _ in plan})
+
+    header = HEADER.encode("utf-8")
+    # Nothing to do when every section is reused at its current position.
+    expected_offset = len(header)
+    unchanged = bool(previous) and len(previous) == len(plan)
+    for key, _, data in plan:
+        cached = previous.get(key)
+        if not unchanged or data is not None or cached is None or cached[1] != expected_offset:
+            unchanged = False
+            break
+        expected_offset += cached[2]
+    if unchanged:
+        build.reused = len(plan)
+        build.unchanged = True
+        return build, None
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # A uniquely named staging file, so concurrent builds never write through the same one. It is
+    # created like any new file (mode 0o666 less the umask), as the plain write it replaces was.
+    staging_path = output_path.parent / f".{output_path.name}.{uuid.uuid4().hex}.tmp"
+    new_fd = os.open(staging_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o666)
+    sections: List[List[Any]] = []
+    try:
+        pending: List[bytes] = [header]
+        pending_size = len(header)
+        copy_start = copy_length = 0
+
+        def _flush_writes() -> None:
+            nonlocal pending, pending_size
+            if pending:
+                _write_all(new_fd, b"".join(pending))
+                build.bytes_written += pending_size
+                pending, pending_size = [], 0
+
+        def _flush_copy() -> None:
+            nonlocal copy_length
+            if copy_length:
+                _copy_range(old_fd, new_fd, copy_start, copy_length)
+                build.bytes_copied += copy_length
+                copy_length = 0
+
+        offset = len(header)
+        for key, digest, data in plan:
+            if data is None:
+                _, old_offset, length = previous[key]
+                if copy_length and copy_start + copy_length == old_offset:
+                    copy_length += length
+                else:
+                    _flush_writes()
+                    _flush_copy()
+                    copy_start, copy_length = old_offset, length
+                build.reused += 1
+            else:
+                _flush_copy()
+                pending.append(data)
+                pending_size += len(data)
+                length = len(data)
+                build.rendered += 1
+                if pending_size >= _COPY_CHUNK:
+                    _flush_writes()
+            sections.append([key, digest, offset, length])
+            offset += length
+        _flush_writes()
+        _flush_copy()
+        os.fsync(new_fd)
+        stat = os.fstat(new_fd)
+    except BaseException:
+        os.close(new_fd)
+        _discard(staging_path)
+        raise
+    os.close(new_fd)
+    return build, (staging_path, stat, sections)
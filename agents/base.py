@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import contextvars
+import threading
 import time
 from dataclasses import dataclass, field
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Sequence
 
 from .config import AgentConfig
 from .ai_delegate import AIDelegate
+from .metrics import METRICS, Metrics
+from .process import Deadline, ProcessResult, run_streaming
+
+# Time granted to an operation after cancellation to return its own partial report.
+_CANCEL_GRACE_SECONDS = 2.0
+# Deadline of the innermost ``run_with_deadline`` operation. A context variable
+# rather than an instance field, so concurrent calls on one agent keep their own.
+_ACTIVE_DEADLINE: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("agent_deadline", default=None)
 
 
 def _now() -> float:
@@ -21,6 +31,7 @@ class BaseAgent:
     config: AgentConfig
     clock: Callable[[], float] = field(default=_now)
     ai_delegate: Optional[AIDelegate] = None
+    metrics: Metrics = field(default=METRICS, repr=False, compare=False)
 
     def describe(self) -> str:
         """Return a human-readable summary of the agent persona."""
@@ -42,12 +53,64 @@ class BaseAgent:
         core agent behaviors.
         """
 
-        if self.ai_delegate is None:
-            return report
-        return self.ai_delegate.enhance(report=report, context=context)
+        metrics = self.metrics
+        if not metrics.enabled:
+            if self.ai_delegate is None:
+                return report
+            return self.ai_delegate.enhance(report=report, context=context)
+
+        agent = self.config.name
+        metrics.observe("report_chars", len(report), agent=agent)
+        with metrics.span("agent.deliver", "deliver_seconds", agent=agent):
+            if self.ai_delegate is None:
+                return report
+            with metrics.span("ai_delegate.enhance", "ai_delegate_seconds", agent=agent):
+                return self.ai_delegate.enhance(report=report, context=context)
+
+    def observe(self, metric: str, value: float) -> None:
+        """Record a per-agent measurement such as an input size or finding count."""
+
+        if self.metrics.enabled:
+            self.metrics.observe(metric, value, agent=self.config.name)
+
+    def active_deadline(self) -> Deadline:
+        """Return the deadline of the enclosing :meth:`run_with_deadline` operation.
+
+        Outside of one, a fresh deadline for the agent's configured time limit
+        is returned.
+        """
+
+        deadline = _ACTIVE_DEADLINE.get()
+        if deadline is None:
+            deadline = Deadline.after(self.config.time_limit_minutes * 60, clock=self.clock)
+        return deadline
+
+    def budget_minutes(self) -> float:
+        """Return the time budget, in minutes, that truncation messages should quote."""
+
+        deadline = _ACTIVE_DEADLINE.get()
+        return deadline.budget / 60 if deadline is not None else self.config.time_limit_minutes
+
+    def run_command(self, command: Sequence[str], deadline: Optional[Deadline] = None) -> ProcessResult:
+        """Run a subprocess under the active deadline with bounded, streamed output.
+
+        Inside :meth:`run_with_deadline` the command shares the operation's
+        budget and is killed (with its whole process group) when it expires.
+        Outside of it, the agent's configured time limit applies. Pool threads
+        started by an operation do not inherit its deadline; pass it in as
+        ``deadline``.
+        """
+
+        return run_streaming(command, deadline or self.active_deadline(), metrics=self.metrics)
 
     def run_with_deadline(self, minutes: Optional[int], operation: Callable[[], str]) -> str:
-        """Run an operation while enforcing the configured time budget.
+        """Run an operation while preemptively enforcing the configured time budget.
+
+        The operation runs on a worker thread. When the budget expires, every
+        subprocess started through :meth:`run_command` is killed and the
+        operation gets a short grace period to return its own partial report.
+        If it does not, a truncation notice with the output captured so far is
+        returned instead.
 
         Args:
             minutes: Override for the time limit in minutes. If None, uses the
@@ -56,19 +119,46 @@ class BaseAgent:
                 returns a textual report.
 
         Returns:
-            The operation's string result.
-
-        Raises:
-            TimeoutError: If the operation exceeds the allotted time.
+            The operation's string result, or a partial report marked as
+            truncated when the budget was exhausted.
         """
 
         deadline_minutes = minutes if minutes is not None else self.config.time_limit_minutes
-        time_limit_seconds = deadline_minutes * 60
+        deadline = Deadline.after(deadline_minutes * 60, clock=self.clock)
+        outcome: List[str] = []
+        errors: List[BaseException] = []
+
+        def _worker() -> None:
+            _ACTIVE_DEADLINE.set(deadline)
+            try:
+                outcome.append(operation())
+            except BaseException as exc:  # re-raised on the caller's thread
+                errors.append(exc)
+
         start = self.clock()
-        result = operation()
-        duration = self.clock() - start
-        if duration > time_limit_seconds:
-            raise TimeoutError(
-                f"Agent '{self.config.name}' exceeded the {deadline_minutes}-minute budget (took {duration:.1f}s)."
+        with self.metrics.span("agent.operation", "operation_seconds", agent=self.config.name) as span:
+            # Run in a copy of the caller's context so spans opened by the operation nest under this one.
+            worker = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(_worker,),
+                name=f"{self.config.name} operation",
+                daemon=True,
             )
-        return result
+            worker.start()
+            worker.join(deadline.remaining())
+            if worker.is_alive():
+                deadline.cancel()
+                worker.join(_CANCEL_GRACE_SECONDS)
+            span.set(status="error" if errors else "ok" if outcome else "truncated")
+
+        if errors:
+            raise errors[0]
+        if outcome:
+            return outcome[0]
+        duration = self.clock() - start
+        partial = deadline.partial_output()
+        return (
+            f"Agent '{self.config.name}' exceeded the {deadline.budget / 60:g}-minute budget "
+            f"(stopped after {duration:.1f}s); report truncated.\n"
+            f"Partial output:\n{partial}"
+        )
@@ -0,0 +1,16 @@
+"""Long-lived agent daemon with a thin JSON-RPC client.
+
+Each hook or editor invocation otherwise re-imports the package and rebuilds
+agents, caches and indexes. The daemon (:class:`~agents.daemon.server.AgentDaemon`)
+keeps them resident behind a Unix domain socket. Requests and responses are
+newline-delimited JSON-RPC 2.0 objects.
+
+Run ``python -m agents.daemon serve`` to start it, and
+``python -m agents.daemon call lint_tester.run '{"paths": ["agents"]}'`` to
+query it. The client side imports no agent code, so a call costs little more
+than interpreter startup.
+"""
+
+from .client import DaemonClient, DaemonError, default_socket_path
+
+__all__ = ["DaemonClient", "DaemonError", "default_socket_path"]
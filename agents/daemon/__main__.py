@@ -0,0 +1,56 @@
+"""Command-line entry point: ``python -m agents.daemon {serve,call,ping,stop}``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .client import DaemonClient, DaemonError, default_socket_path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m agents.daemon", description="Agent daemon and client.")
+    parser.add_argument("--socket", type=Path, default=None, help=f"Socket path (default: {default_socket_path()}).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="Run the daemon in the foreground.")
+    call = commands.add_parser("call", help="Call a method and print its result.")
+    call.add_argument("method", help="e.g. lint_tester.run or daemon.methods")
+    call.add_argument("params", nargs="?", default="{}", help="JSON object of keyword arguments.")
+    commands.add_parser("ping", help="Check that the daemon is up.")
+    commands.add_parser("stop", help="Ask the daemon to shut down.")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        # Only the server needs asyncio and the agents themselves.
+        from .server import AgentDaemon
+
+        AgentDaemon(args.socket).run()
+        return 0
+    if args.command == "call":
+        try:
+            params = json.loads(args.params)
+        except ValueError as exc:
+            parser.error(f"params is not valid JSON: {exc}")
+        if not isinstance(params, dict):
+            parser.error("params must be a JSON object of keyword arguments.")
+        method = args.method
+    else:
+        method, params = {"ping": ("daemon.ping", {}), "stop": ("daemon.shutdown", {})}[args.command]
+    try:
+        with DaemonClient(args.socket) as client:
+            result = client.call(method, **params)
+    except DaemonError as exc:
+        print(f"error {exc.code}: {exc}", file=sys.stderr)
+        return 1
+    except OSError as exc:
+        print(f"Cannot reach the daemon: {exc}", file=sys.stderr)
+        return 2
+    print(result if isinstance(result, str) else json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Blocking JSON-RPC client and wire-protocol constants for the agent daemon.
+
+This module only needs the standard library's ``socket`` and ``json``, so
+short-lived callers (hooks, editors, the CLI) connect without importing any
+agent code.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+AGENT_ERROR = -32000
+
+
+def default_socket_path() -> Path:
+    """``$XDG_RUNTIME_DIR/my-coding-agents.sock``, or a socket in a per-user directory under the temp directory.
+
+    The fallback directory is created with mode ``0700`` and checked by both
+    the daemon and the client (see :func:`check_private_dir`), so other users
+    of a shared temp directory can neither reach nor impersonate the daemon.
+    """
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "my-coding-agents.sock"
+    return fallback_socket_dir() / "daemon.sock"
+
+
+def fallback_socket_dir() -> Path:
+    return Path(tempfile.gettempdir()) / f"my-coding-agents-{os.getuid()}"
+
+
+def check_private_dir(directory: str | Path, create: bool = False) -> None:
+    """Ensure ``directory`` is a real directory owned by the current user and closed to everyone else.
+
+    Args:
+        directory: The directory holding the socket.
+        create: Create it (mode ``0700``) when missing.
+
+    Raises:
+        PermissionError: When the directory is a symlink, belongs to another
+            user, or grants group or other permissions.
+    """
+
+    directory = Path(directory)
+    if create:
+        try:
+            directory.mkdir(mode=0o700)
+        except FileExistsError:
+            pass
+    try:
+        info = os.lstat(directory)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory owned by the current user with mode 0700.")
+
+
+class DaemonError(Exception):
+    """A JSON-RPC error returned by the daemon."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class DaemonClient:
+    """Blocking JSON-RPC client keeping one connection open across calls.
+
+    Args:
+        socket_path: Daemon socket; defaults to :func:`default_socket_path`.
+        timeout: Seconds to wait for a response; None waits indefinitely.
+    """
+
+    def __init__(self, socket_path: str | Path | None = None, timeout: Optional[float] = None):
+        self.socket_path = Path(socket_path) if socket_path is not None else default_socket_path()
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader: Any = None
+        self._next_id = 0
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Invoke ``method`` and return its result, raising :class:`DaemonError` on failure."""
+
+        if self._socket is None:
+            if self.socket_path.parent == fallback_socket_dir():
+                check_private_dir(self.socket_path.parent)
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.settimeout(self.timeout)
+                connection.connect(str(self.socket_path))
+            except OSError:
+                connection.close()
+                raise
+            self._socket, self._reader = connection, connection.makefile("rb")
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        self._socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("The daemon closed the connection.")
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
@@ -0,0 +1,271 @@
+"""Long-lived agent daemon serving JSON-RPC 2.0 over a Unix domain socket.
+
+:class:`AgentDaemon` keeps agents, with their caches and indexes, resident
+between requests. Methods are named ``<agent key>.<method>`` (e.g.
+``lint_tester.run``) with keyword ``params``; only the methods in
+:data:`EXPOSED_METHODS` can be called. Requests for different agents run
+concurrently. Requests for the same agent queue behind a per-agent lock,
+because agents keep per-run state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import json
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from .client import (
+    AGENT_ERROR,
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    DaemonError,
+    check_private_dir,
+    default_socket_path,
+    fallback_socket_dir,
+)
+
+# agent key -> (module, class) created on first use.
+AGENT_FACTORIES: Mapping[str, Tuple[str, str]] = {
+    "lint_tester": ("agents.lint_tester", "LintTester"),
+    "socii_guardian": ("agents.socii_guardian", "SOCIIGuardian"),
+    "dependency_steward": ("agents.dependency_steward", "DependencySteward"),
+    "hallucination_sentinel": ("agents.hallucination_sentinel", "HallucinationSentinel"),
+    "api_docsmith": ("agents.api_docsmith", "APIDocsmith"),
+    "tdd_enforcer": ("agents.tdd_enforcer", "TDDEnforcer"),
+}
+
+EXPOSED_METHODS: Mapping[str, Tuple[str, ...]] = {
+    "lint_tester": ("run",),
+    "socii_guardian": ("review_ports", "review_infra", "audit_inventory", "review_controls"),
+    "dependency_steward": ("detect_drift", "track_manifest", "track_changes", "reconcile", "flag_insecure"),
+    "hallucination_sentinel": ("verify_claims", "gate_response"),
+    "api_docsmith": ("generate_markdown", "generate_from_openapi", "build_site", "summarize_changes"),
+    "tdd_enforcer": ("review",),
+}
+
+_MAX_REQUEST_BYTES = 64 << 20
+_SHUTDOWN_GRACE_SECONDS = 5.0
+
+
+def _service_ports(params: Dict[str, Any]) -> Dict[str, Any]:
+    from ..infra_scan import ServicePort
+
+    return {**params, "services": [ServicePort(**service) for service in params.get("services", [])]}
+
+
+def _dependency_specs(params: Dict[str, Any]) -> Dict[str, Any]:
+    from ..lockfiles import DependencySpec
+
+    return {**params, "specs": [DependencySpec(**spec) for spec in params.get("specs", [])]}
+
+
+# Turn JSON params into the objects some methods expect.
+_PARAM_ADAPTERS: Mapping[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "socii_guardian.review_ports": _service_ports,
+    "dependency_steward.flag_insecure": _dependency_specs,
+}
+
+
+class AgentDaemon:
+    """Serve agent methods over a Unix domain socket.
+
+    Args:
+        socket_path: Where to listen; defaults to :func:`default_socket_path`.
+        agents: Pre-built agents by key (e.g. a ``LintTester`` with a
+            ``LintCache``); other agents are created on first use.
+        max_workers: Threads running agent calls; different agents run in
+            parallel, calls to one agent run one at a time.
+    """
+
+    def __init__(
+        self,
+        socket_path: str | Path | None = None,
+        agents: Optional[Mapping[str, Any]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.socket_path = Path(socket_path) if socket_path is not None else default_socket_path()
+        self._agents: Dict[str, Any] = dict(agents or {})
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(AGENT_FACTORIES), thread_name_prefix="agent-daemon"
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamReader] = {}
+
+    def agent(self, key: str) -> Any:
+        """Return the resident agent for ``key``, creating it on first use."""
+
+        agent = self._agents.get(key)
+        if agent is None:
+            module_name, class_name = AGENT_FACTORIES[key]
+            agent = self._agents[key] = getattr(importlib.import_module(module_name), class_name)()
+        return agent
+
+    async def serve(self) -> None:
+        """Listen until a ``daemon.shutdown`` request or cancellation."""
+
+        self._claim_socket()
+        self._stopping = asyncio.Event()
+        # Create the socket as 0600 rather than chmod-ing it after bind, when another user could already connect.
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=str(self.socket_path), limit=_MAX_REQUEST_BYTES
+            )
+        finally:
+            os.umask(previous_umask)
+        try:
+            async with self._server:
+                await self._stopping.wait()
+                # Stop reading new requests; each connection closes once its in-flight requests are answered.
+                for reader in self._connections.values():
+                    reader.feed_eof()
+                if self._connections:
+                    await asyncio.wait(list(self._connections), timeout=_SHUTDOWN_GRACE_SECONDS)
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def run(self) -> None:
+        """Blocking wrapper around :meth:`serve`."""
+
+        asyncio.run(self.serve())
+
+    def _claim_socket(self) -> None:
+        """Remove a stale socket file, refusing to start when another daemon answers on it."""
+
+        directory = self.socket_path.parent
+        if directory == fallback_socket_dir():
+            check_private_dir(directory, create=True)
+        if not self.socket_path.exists():
+            directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}.")
+        finally:
+            probe.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections[task] = reader
+        pending: set[asyncio.Task] = set()
+        write_lock = asyncio.Lock()
+
+        async def _respond(payload: Any) -> None:
+            response = await self.dispatch(payload)
+            if response is not None:
+                async with write_lock:
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    async with write_lock:
+                        await _send_error(writer, None, INVALID_REQUEST, "Request too large.")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    async with write_lock:
+                        await _send_error(writer, None, PARSE_ERROR, "Parse error.")
+                    continue
+                # Pipelined requests on one connection run concurrently and answer as they finish.
+                request = asyncio.create_task(_respond(payload))
+                pending.add(request)
+                request.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def dispatch(self, request: Any) -> Optional[Dict[str, Any]]:
+        """Execute one JSON-RPC request object; returns None for notifications."""
+
+        if not isinstance(request, dict):
+            return _error(None, INVALID_REQUEST, "Invalid request.")
+        request_id = request.get("id")
+        params = request.get("params", {})
+        if request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+            response = _error(request_id, INVALID_REQUEST, "Invalid request.")
+        elif not isinstance(params, dict):
+            response = _error(request_id, INVALID_PARAMS, "params must be an object of keyword arguments.")
+        else:
+            try:
+                response = {"jsonrpc": "2.0", "id": request_id, "result": await self._call(request["method"], params)}
+            except DaemonError as exc:
+                response = _error(request_id, exc.code, str(exc))
+            except Exception as exc:  # reported to the client rather than killing the daemon
+                response = _error(request_id, AGENT_ERROR, f"{type(exc).__name__}: {exc}")
+        return response if "id" in request else None
+
+    async def _call(self, method: str, params: Dict[str, Any]) -> Any:
+        if method.startswith("daemon."):
+            return self._builtin(method, params)
+        key, _, name = method.partition(".")
+        if name not in EXPOSED_METHODS.get(key, ()):
+            raise DaemonError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        adapter = _PARAM_ADAPTERS.get(method)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            bound = getattr(await loop.run_in_executor(self._executor, self.agent, key), name)
+            try:
+                if adapter is not None:
+                    params = adapter(params)
+                inspect.signature(bound).bind(**params)
+            except (TypeError, ValueError) as exc:
+                raise DaemonError(INVALID_PARAMS, f"Invalid params: {exc}") from exc
+            return await loop.run_in_executor(self._executor, partial(bound, **params))
+
+    def _builtin(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "daemon.ping":
+            return {"pid": os.getpid(), "agents": sorted(self._agents)}
+        if method == "daemon.methods":
+            return sorted(f"{key}.{name}" for key, names in EXPOSED_METHODS.items() for name in names)
+        if method == "daemon.metrics":
+            from ..metrics import METRICS
+
+            return METRICS.render_prometheus()
+        if method == "daemon.shutdown":
+            if self._stopping is not None:
+                asyncio.get_running_loop().call_soon(self._stopping.set)
+            return "Shutting down."
+        raise DaemonError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+async def _send_error(writer: asyncio.StreamWriter, request_id: Any, code: int, message: str) -> None:
+    writer.write(json.dumps(_error(request_id, code, message)).encode("utf-8") + b"\n")
+    await writer.drain()
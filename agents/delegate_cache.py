@@ -0,0 +1,212 @@
+"""Memoizing AI delegate that avoids repeated model calls for identical reports.
+
+Agents often deliver the same report with the same context many times (for
+example "No version drift detected across manifests."). :class:`CachingAIDelegate`
+keeps recent enhancements in an in-memory LRU and, optionally, in a SQLite
+store shared across processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, ContextManager, List, Optional, Sequence, Tuple, Union
+
+from .ai_delegate import AIDelegate, EnhanceRequest
+from .storage import connect, transaction
+
+
+def generator_identity(generator: Callable[..., Any]) -> str:
+    """Return a stable name for a module-level generator function.
+
+    Lambdas, nested functions, partials, bound methods, and callable instances
+    share a name across differently configured objects, so two of them could
+    read each other's cache entries. They are refused with a ValueError;
+    callers pass an explicit ``generator_id`` instead.
+    """
+
+    qualname = getattr(generator, "__qualname__", "")
+    if not inspect.isfunction(generator) or "<" in qualname:
+        raise ValueError(
+            f"Cannot derive a stable cache identity for {generator!r}; "
+            "pass generator_id to CachingAIDelegate for anything but a module-level function."
+        )
+    return f"{generator.__module__}.{qualname}"
+
+
+async def _fill_later(produced: Awaitable[List[str]], fill: Callable[[List[str]], List[str]]) -> List[str]:
+    return fill(await produced)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a caching delegate."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class CachingAIDelegate(AIDelegate):
+    """AI delegate that memoizes enhancements.
+
+    Entries are keyed by a hash of the report, the context, and the generator's
+    identity. Attach it per agent to opt in, e.g.
+    ``agent.ai_delegate = CachingAIDelegate(generator=my_llm_call)``. The
+    identity is derived from module-level functions only (see
+    :func:`generator_identity`); any other generator needs ``generator_id``.
+
+    Attributes:
+        max_entries: Size of the in-memory LRU.
+        ttl_seconds: Optional lifetime of an entry in memory and on disk.
+        store_path: Optional SQLite file shared by threads and processes.
+        max_store_entries: Upper bound on entries kept in the on-disk store.
+        generator_id: Identity used in cache keys; required unless ``generator``
+            (and ``batch_generator``, when set) are module-level functions.
+    """
+
+    max_entries: int = 1024
+    ttl_seconds: Optional[float] = None
+    store_path: Optional[str | Path] = None
+    max_store_entries: int = 100_000
+    generator_id: Optional[str] = None
+    clock: Callable[[], float] = time.time
+    _memory: "OrderedDict[str, Tuple[float, str]]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _stats: CacheStats = field(default_factory=CacheStats, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        if self.generator_id is None:
+            self.generator_id = generator_identity(self.generator)
+            if self.batch_generator is not None:
+                self.generator_id += "+" + generator_identity(self.batch_generator)
+        if self.store_path is not None:
+            self.store_path = Path(self.store_path)
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS enhancements ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS enhancements_age ON enhancements (created_at)")
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def cache_key(self, report: str, context: Optional[List[str]] = None) -> str:
+        """Return the stable cache key for a report and context."""
+
+        material = json.dumps([report, list(context or []), self.generator_id], separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _generate(self, requests: Sequence[EnhanceRequest]) -> Union[List[str], Awaitable[List[str]]]:
+        """Answer requests from the cache and generate only the misses.
+
+        ``enhance``, ``enhance_many`` (including batches), and
+        ``enhance_async`` all produce results here, so every path is memoized.
+        """
+
+        keys = [self.cache_key(report, context) for report, context in requests]
+        results: List[Optional[str]] = [self._get(key) for key in keys]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+        if not missing:
+            return results  # type: ignore[return-value]
+
+        def _fill(produced: List[str]) -> List[str]:
+            if len(produced) != len(missing):
+                raise ValueError("batch_generator returned a different number of results than requests.")
+            for index, value in zip(missing, produced):
+                self._put(keys[index], value)
+                results[index] = value
+            return results  # type: ignore[return-value]
+
+        produced = super()._generate([requests[i] for i in missing])
+        if inspect.isawaitable(produced):
+            return _fill_later(produced, _fill)
+        return _fill(produced)
+
+    def clear(self) -> None:
+        """Drop every entry from memory and the on-disk store."""
+
+        with self._lock:
+            self._memory.clear()
+        if self.store_path is not None:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM enhancements")
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and self.clock() - created_at > self.ttl_seconds
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry[1]
+                del self._memory[key]
+                self._stats.expirations += 1
+
+        if self.store_path is not None:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, created_at FROM enhancements WHERE key = ?", (key,)).fetchone()
+            if row is not None and not self._expired(row[1]):
+                self._remember(key, row[1], row[0])
+                with self._lock:
+                    self._stats.hits += 1
+                return row[0]
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def _put(self, key: str, value: str) -> None:
+        created_at = self.clock()
+        self._remember(key, created_at, value)
+        if self.store_path is None:
+            return
+        with self._connect() as conn, transaction(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO enhancements (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, created_at),
+            )
+            if self.ttl_seconds is not None:
+                conn.execute("DELETE FROM enhancements WHERE created_at < ?", (created_at - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM enhancements WHERE key IN (SELECT key FROM enhancements "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_store_entries,),
+            )
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        with self._lock:
+            self._memory[key] = (created_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect(self.store_path, 30.0)
@@ -2,55 +2,165 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Mapping
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Optional
 
+from .advisories import AdvisoryIndex
 from .base import BaseAgent
 from .config import AGENTS
-
-
-@dataclass
-class DependencySpec:
-    name: str
-    version: str
-    source: str
+from .drift_tracker import DriftDelta, DriftTracker
+from .findings import ERROR, WARNING, Finding
+from .lockfiles import DependencySpec, ecosystem, iter_specs
 
 
 class DependencySteward(BaseAgent):
     """Validate that dependency manifests remain consistent and secure."""
 
-    def __init__(self):
+    def __init__(self, drift_tracker: DriftTracker | None = None):
         super().__init__(config=AGENTS["dependency_steward"])
+        self.drift_tracker: DriftTracker = drift_tracker if drift_tracker is not None else DriftTracker()
 
     def detect_drift(self, manifests: Iterable[Mapping[str, str]]) -> str:
         """Find version drift across multiple manifests."""
 
+        return self.report_drift(self.consolidate(manifests))
+
+    def iter_drift(self, manifests: Iterable[Mapping[str, str]]) -> Iterator[Finding]:
+        """Yield one finding per package pinned to more than one version."""
+
+        return self._drift_findings(self.consolidate(manifests))
+
+    @staticmethod
+    def consolidate(manifests: Iterable[Mapping[str, str]]) -> dict[str, set[str]]:
+        """Collect the versions each package is pinned to across ``manifests``."""
+
         consolidated: dict[str, set[str]] = {}
         for manifest in manifests:
             for package, version in manifest.items():
                 consolidated.setdefault(package, set()).add(version)
+        return consolidated
+
+    def track_manifest(self, manifest_id: str, manifest: Optional[Mapping[str, str]]) -> str:
+        """Ingest one manifest into the drift tracker and report only the drift it changed.
+
+        Args:
+            manifest_id: Stable identifier, e.g. the service or manifest path.
+            manifest: The manifest's current ``package -> version`` pins, or
+                None when the manifest was deleted.
+        """
+
+        if manifest is None:
+            delta = self.drift_tracker.remove(manifest_id)
+        else:
+            delta = self.drift_tracker.upsert(manifest_id, manifest)
+        return self._report_drift_delta(delta)
+
+    def track_changes(self, manifest_id: str, changes: Mapping[str, Optional[str]]) -> str:
+        """Apply a pin delta (``package -> version``, None to unpin) and report drift transitions."""
+
+        return self._report_drift_delta(self.drift_tracker.apply(manifest_id, changes))
+
+    def _report_drift_delta(self, delta: DriftDelta) -> str:
+        if not delta:
+            report = "No drift changes detected."
+        else:
+            sections: List[str] = []
+            if delta.introduced:
+                lines = [f"{pkg}: {', '.join(versions)}" for pkg, versions in sorted(delta.introduced.items())]
+                sections.append("Version drift introduced:\n- " + "\n- ".join(lines))
+            if delta.changed:
+                lines = [f"{pkg}: {', '.join(versions)}" for pkg, versions in sorted(delta.changed.items())]
+                sections.append("Version drift changed:\n- " + "\n- ".join(lines))
+            if delta.resolved:
+                lines = [
+                    f"{pkg}: now {', '.join(versions)}" if versions else f"{pkg}: no longer pinned"
+                    for pkg, versions in sorted(delta.resolved.items())
+                ]
+                sections.append("Version drift resolved:\n- " + "\n- ".join(lines))
+            report = "\n\n".join(sections)
+        return self.deliver(report, context=["dependencies", "compatibility"])
 
-        drift = {pkg: versions for pkg, versions in consolidated.items() if len(versions) > 1}
-        if not drift:
+    def iter_specs(self, paths: Iterable[str | Path]) -> Iterator[DependencySpec]:
+        """Lazily stream ``DependencySpec`` records from lockfiles and requirement files."""
+
+        return iter_specs(paths)
+
+    def reconcile(self, paths: Iterable[str | Path]) -> str:
+        """Detect version drift across lockfiles without loading them whole.
+
+        Packages are compared per ecosystem, so an npm and a PyPI package that
+        share a name are never merged. A package drifts when the manifests
+        lock it to different sets of versions; several versions inside one
+        lockfile (nested npm installs, marker-split Poetry entries) are not
+        drift by themselves.
+
+        Args:
+            paths: Manifests such as ``requirements.txt``, ``poetry.lock``,
+                ``Pipfile.lock`` or ``package-lock.json``. Each is parsed as a
+                stream, so memory grows with the number of distinct
+                package/version pairs rather than the file sizes.
+        """
+
+        locked: dict[tuple[str, str], dict[str, set[str]]] = {}
+        for spec in iter_specs(paths):
+            key = (ecosystem(spec.source), spec.name)
+            locked.setdefault(key, {}).setdefault(spec.source, set()).add(spec.version)
+        ecosystems = Counter(name for _, name in locked)
+        consolidated: dict[str, set[str]] = {}
+        for (package_ecosystem, name), per_manifest in locked.items():
+            if len({frozenset(versions) for versions in per_manifest.values()}) > 1:
+                label = f"{name} ({package_ecosystem})" if ecosystems[name] > 1 else name
+                consolidated[label] = set().union(*per_manifest.values())
+        return self.report_drift(consolidated)
+
+    def _drift_findings(self, consolidated: Mapping[str, set[str]]) -> Iterator[Finding]:
+        for pkg, versions in sorted(consolidated.items()):
+            if len(versions) > 1:
+                yield Finding(self.config.name, "version-drift", f"{pkg}: {', '.join(sorted(versions))}", WARNING)
+
+    def report_drift(self, consolidated: Mapping[str, set[str]]) -> str:
+        """Report the packages in a :meth:`consolidate` result pinned to more than one version."""
+
+        lines = [finding.message for finding in self._drift_findings(consolidated)]
+        if not lines:
             report = "No version drift detected across manifests."
         else:
-            lines = [f"{pkg}: {', '.join(sorted(versions))}" for pkg, versions in sorted(drift.items())]
             report = "Version drift detected:\n- " + "\n- ".join(lines)
         return self.deliver(report, context=["dependencies", "compatibility"])
 
-    def flag_insecure(self, advisories: Mapping[str, List[str]], specs: Iterable[DependencySpec]) -> str:
-        """Highlight dependencies with known issues."""
+    def flag_insecure(
+        self, advisories: Mapping[str, List[str]] | AdvisoryIndex, specs: Iterable[DependencySpec]
+    ) -> str:
+        """Highlight dependencies with known issues.
 
-        findings: List[str] = []
-        for spec in specs:
-            vulnerable_versions = advisories.get(spec.name, [])
-            if spec.version in vulnerable_versions:
-                findings.append(
-                    f"{spec.name} {spec.version} from {spec.source} is flagged by advisories; consider updating."
-                )
+        Args:
+            advisories: A prebuilt :class:`AdvisoryIndex`, or a mapping of
+                package -> vulnerable versions. Mapping entries may be exact
+                versions or specifiers such as ``>=1.2,<1.4.7``.
+            specs: Dependencies to check.
+        """
+
+        return self.report_insecure(finding.message for finding in self.iter_insecure(advisories, specs))
+
+    def report_insecure(self, messages: Iterable[str]) -> str:
+        """Report advisory finding messages, such as those of :meth:`iter_insecure`."""
 
+        findings = list(messages)
         if not findings:
             report = "All dependencies passed advisory checks."
         else:
             report = "Insecure dependencies found:\n- " + "\n- ".join(findings)
         return self.deliver(report, context=["dependencies", "security"])
+
+    def iter_insecure(
+        self, advisories: Mapping[str, List[str]] | AdvisoryIndex, specs: Iterable[DependencySpec]
+    ) -> Iterator[Finding]:
+        """Yield a finding for each dependency flagged by advisories, as ``specs`` stream in."""
+
+        index = advisories if isinstance(advisories, AdvisoryIndex) else AdvisoryIndex.from_mapping(advisories)
+        agent = self.config.name
+        for spec in specs:
+            if index.is_vulnerable(spec.name, spec.version):
+                message = f"{spec.name} {spec.version} from {spec.source} is flagged by advisories; consider updating."
+                yield Finding(agent, "vulnerable-dependency", message, ERROR, path=spec.source)
@@ -0,0 +1,255 @@
+"""Multi-page API docs build with a sharded, prebuilt search index.
+
+:func:`build_site` partitions endpoints by (version, tag) and renders one
+Markdown page per partition in a process pool. Alongside the pages it writes
+a JSON inverted search index split into shards by term prefix, plus document
+blocks, so a browser only downloads the few small files a query needs.
+
+Every artifact is named after its content hash and listed in ``manifest.json``
+for cache-busting. Pages whose content did not change are not rewritten, and
+artifacts that disappear from the manifest are deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+from .api_reference import render_endpoint
+from .storage import atomic_write_bytes
+
+DEFAULT_VERSION = "latest"
+DEFAULT_TAG = "default"
+MANIFEST_NAME = "manifest.json"
+_MANIFEST_VERSION = 1
+_DOC_BLOCK_SIZE = 1000
+_PREFIX_LENGTH = 2
+_TOKEN = re.compile(r"[a-z0-9]+")
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+_SLUG_STRIP = re.compile(r"[^\w\s-]")
+
+# (version, tag)
+PartitionKey = Tuple[str, str]
+
+
+def _safe(segment: str) -> str:
+    return _UNSAFE.sub("-", segment).strip("-.") or "_"
+
+
+def _slug(heading: str, occurrences: Dict[str, int]) -> str:
+    """Approximate the GitHub-style anchor for a Markdown heading.
+
+    ``occurrences`` tracks the anchors already used on the page; a repeated
+    heading gets a ``-1``, ``-2``, ... suffix like GitHub gives it.
+    """
+
+    slug = original = re.sub(r"\s", "-", _SLUG_STRIP.sub("", heading.strip().lower()))
+    while slug in occurrences:
+        occurrences[original] += 1
+        slug = f"{original}-{occurrences[original]}"
+    occurrences[slug] = 0
+    return slug
+
+
+def _title(version: str, tag: str) -> str:
+    return f"{tag} API ({version})"
+
+
+def _tags(endpoint: Mapping[str, Any]) -> List[str]:
+    tags = endpoint.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return [tag.strip() for tag in tags if tag.strip()] or [DEFAULT_TAG]
+
+
+def partition(endpoints: Iterable[Mapping[str, Any]]) -> Dict[PartitionKey, List[Mapping[str, Any]]]:
+    """Group endpoints by ``(version, tag)``; an endpoint with several tags lands in each."""
+
+    partitions: Dict[PartitionKey, List[Mapping[str, Any]]] = {}
+    for endpoint in endpoints:
+        version = str(endpoint.get("version") or DEFAULT_VERSION)
+        for tag in _tags(endpoint):
+            partitions.setdefault((version, tag), []).append(endpoint)
+    return partitions
+
+
+def _write_artifact(output_dir: Path, stem: str, suffix: str, data: bytes) -> Tuple[str, bool]:
+    """Write ``data`` under a content-hashed name; returns ``(relative path, written)``."""
+
+    digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    relative = f"{stem}.{digest}{suffix}"
+    target = output_dir / relative
+    if target.exists():
+        return relative, False
+    atomic_write_bytes(target, data)
+    return relative, True
+
+
+def _render_page(
+    output_dir: str, version: str, tag: str, endpoints: Sequence[Mapping[str, Any]]
+) -> Tuple[PartitionKey, str, bool]:
+    """Render and write one partition page (runs in a worker process)."""
+
+    parts = [f"# {_title(version, tag)}\n"]
+    parts.extend(render_endpoint(endpoint) for endpoint in endpoints)
+    data = "".join(parts).encode("utf-8")
+    relative, written = _write_artifact(Path(output_dir), f"{_safe(version)}/{_safe(tag)}", ".md", data)
+    return (version, tag), relative, written
+
+
+@dataclass
+class SiteBuild:
+    """What a :func:`build_site` call produced."""
+
+    output_dir: Path
+    pages: int = 0
+    pages_written: int = 0
+    endpoints: int = 0
+    search_files: int = 0
+    removed: int = 0
+
+
+def _search_index(
+    pages: Sequence[PartitionKey], partitions: Mapping[PartitionKey, Sequence[Mapping[str, Any]]]
+) -> Tuple[List[list], Dict[str, Dict[str, List[int]]]]:
+    """Return the document table and the prefix-sharded inverted index."""
+
+    documents: List[list] = []
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for page_id, key in enumerate(pages):
+        anchors: Dict[str, int] = {}
+        _slug(_title(*key), anchors)
+        for endpoint in partitions[key]:
+            doc_id = len(documents)
+            name = str(endpoint.get("name", "Unnamed Endpoint"))
+            method = str(endpoint.get("method", "GET"))
+            path = str(endpoint.get("path", "/"))
+            documents.append([name, method, path, page_id, _slug(name, anchors)])
+            text = f"{name} {method} {path} {endpoint.get('description', '')}".lower()
+            for token in set(_TOKEN.findall(text)):
+                postings = shards.setdefault(token[:_PREFIX_LENGTH], {}).setdefault(token, [])
+                postings.append(doc_id)
+    return documents, shards
+
+
+def _dump(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def build_site(
+    endpoints: Iterable[Mapping[str, Any]],
+    output_dir: str | Path,
+    workers: int | None = None,
+) -> SiteBuild:
+    """Build per-(version, tag) pages, a sharded search index, and a manifest.
+
+    Args:
+        endpoints: Endpoint mappings with ``name``, ``method``, ``path``,
+            ``description``, and optional ``tags`` (list or comma-separated)
+            and ``version``.
+        output_dir: Directory receiving the artifacts and ``manifest.json``.
+        workers: Rendering processes; defaults to the machine's core count.
+    """
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    partitions = partition(endpoints)
+    pages: List[PartitionKey] = sorted(partitions)
+    build = SiteBuild(output_dir=output_dir, pages=len(pages))
+    build.endpoints = len({id(endpoint) for group in partitions.values() for endpoint in group})
+
+    page_paths: Dict[PartitionKey, str] = {}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pages) or 1))
+    jobs = [(str(output_dir), version, tag, partitions[(version, tag)]) for version, tag in pages]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_page, *job) for job in jobs]
+            # Build the search index while the pages render.
+            documents, shards = _search_index(pages, partitions)
+            results = [future.result() for future in futures]
+    else:
+        results = [_render_page(*job) for job in jobs]
+        documents, shards = _search_index(pages, partitions)
+    for key, relative, written in results:
+        page_paths[key] = relative
+        build.pages_written += written
+
+    artifacts: Set[str] = set(page_paths.values())
+    doc_blocks: List[str] = []
+    for start in range(0, len(documents), _DOC_BLOCK_SIZE):
+        relative, _ = _write_artifact(output_dir, f"search/docs-{start // _DOC_BLOCK_SIZE}", ".json",
+                                      _dump(documents[start : start + _DOC_BLOCK_SIZE]))
+        doc_blocks.append(relative)
+    shard_paths: Dict[str, str] = {}
+    for prefix, postings in sorted(shards.items()):
+        relative, _ = _write_artifact(output_dir, f"search/terms-{_safe(prefix)}", ".json", _dump(postings))
+        shard_paths[prefix] = relative
+    artifacts.update(doc_blocks, shard_paths.values())
+    build.search_files = len(doc_blocks) + len(shard_paths)
+
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "pages": [
+            {
+                "version": version,
+                "tag": tag,
+                "path": page_paths[(version, tag)],
+                "endpoints": len(partitions[(version, tag)]),
+            }
+            for version, tag in pages
+        ],
+        "search": {
+            "prefix_length": _PREFIX_LENGTH,
+            "block_size": _DOC_BLOCK_SIZE,
+            "document_fields": ["name", "method", "path", "page", "anchor"],
+            "doc_blocks": doc_blocks,
+            "shards": shard_paths,
+        },
+    }
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = _previous_artifacts(output_dir, manifest_path)
+    atomic_write_bytes(manifest_path, _dump(manifest))
+
+    for relative in previous - artifacts:
+        try:
+            (output_dir / relative).unlink()
+            build.removed += 1
+        except FileNotFoundError:
+            pass
+    return build
+
+
+def _previous_artifacts(output_dir: Path, manifest_path: Path) -> Set[str]:
+    """Return the artifacts the previous manifest lists, keeping only files inside ``output_dir``.
+
+    The manifest is read back from disk, so a hand-edited or corrupted entry
+    (``../../x``, an absolute path) must never lead to deleting outside the site.
+    """
+
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return set()
+    if manifest.get("version") != _MANIFEST_VERSION:
+        return set()
+    search = manifest.get("search", {})
+    listed = {
+        *(page["path"] for page in manifest.get("pages", [])),
+        *search.get("doc_blocks", []),
+        *search.get("shards", {}).values(),
+    }
+    root = output_dir.resolve()
+    inside: Set[str] = set()
+    for relative in listed:
+        if not isinstance(relative, str):
+            continue
+        target = (root / relative).resolve()
+        if target.is_relative_to(root) and target != root and target != manifest_path.resolve():
+            inside.add(relative)
+    return inside
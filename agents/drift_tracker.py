@@ -0,0 +1,146 @@
+"""Stateful, incremental version-drift tracking for the Dependency Steward.
+
+:class:`DriftTracker` ingests manifests by ID and keeps per-package version
+reference counts, so adding, updating, or removing a manifest only touches
+the packages in the delta and reports just the drift that appeared, changed,
+or disappeared.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+
+@dataclass
+class DriftDelta:
+    """Drift transitions caused by one update, keyed by package name."""
+
+    introduced: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    changed: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    resolved: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.introduced or self.changed or self.resolved)
+
+
+class DriftTracker:
+    """Track version drift across many manifests with per-delta updates.
+
+    Package names, versions, and manifest IDs are interned so thousands of
+    manifests referencing the same packages share one copy of each string.
+    """
+
+    __slots__ = ("_manifests", "_counts", "_drifting")
+
+    def __init__(self) -> None:
+        self._manifests: Dict[str, Dict[str, str]] = {}
+        # package -> {version: number of manifests pinning it}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._drifting: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._manifests)
+
+    def __contains__(self, manifest_id: object) -> bool:
+        return manifest_id in self._manifests
+
+    def drifting(self) -> Dict[str, Tuple[str, ...]]:
+        """Return every package currently pinned to more than one version."""
+
+        return {package: tuple(sorted(self._counts[package])) for package in sorted(self._drifting)}
+
+    def upsert(self, manifest_id: str, manifest: Mapping[str, str]) -> DriftDelta:
+        """Add or replace a manifest; only packages whose pin changed are touched."""
+
+        return self.apply(manifest_id, self._changes(manifest_id, manifest))
+
+    def remove(self, manifest_id: str) -> DriftDelta:
+        """Forget a manifest entirely."""
+
+        current = self._manifests.get(manifest_id)
+        if current is None:
+            return DriftDelta()
+        delta = self.apply(manifest_id, {package: None for package in current})
+        self._manifests.pop(manifest_id, None)
+        return delta
+
+    def apply(self, manifest_id: str, changes: Mapping[str, Optional[str]]) -> DriftDelta:
+        """Apply a delta to one manifest: ``{package: new_version}``, None removes the pin.
+
+        Runs in time proportional to ``len(changes)``.
+        """
+
+        touched: Dict[str, Optional[Tuple[str, ...]]] = {}
+        self._apply(manifest_id, changes, touched)
+        return self._settle(touched)
+
+    def load(self, manifests: Iterable[Tuple[str, Mapping[str, str]]]) -> DriftDelta:
+        """Bulk-ingest ``(manifest_id, manifest)`` pairs and report their combined effect."""
+
+        touched: Dict[str, Optional[Tuple[str, ...]]] = {}
+        for manifest_id, manifest in manifests:
+            self._apply(manifest_id, self._changes(manifest_id, manifest), touched)
+        return self._settle(touched)
+
+    def _changes(self, manifest_id: str, manifest: Mapping[str, str]) -> Dict[str, Optional[str]]:
+        current = self._manifests.get(manifest_id, {})
+        changes: Dict[str, Optional[str]] = {
+            package: version for package, version in manifest.items() if current.get(package) != version
+        }
+        changes.update({package: None for package in current if package not in manifest})
+        return changes
+
+    def _apply(
+        self,
+        manifest_id: str,
+        changes: Mapping[str, Optional[str]],
+        touched: Dict[str, Optional[Tuple[str, ...]]],
+    ) -> None:
+        """Update pins and counts, remembering each touched package's prior drift state."""
+
+        pins = self._manifests.setdefault(sys.intern(manifest_id), {})
+        for package, version in changes.items():
+            package = sys.intern(package)
+            if package not in touched:
+                touched[package] = tuple(sorted(self._counts[package])) if package in self._drifting else None
+            previous = pins.get(package)
+            if previous == version:
+                continue
+            if previous is not None:
+                self._release(package, previous)
+                del pins[package]
+            if version is not None:
+                version = sys.intern(version)
+                pins[package] = version
+                versions = self._counts.setdefault(package, {})
+                versions[version] = versions.get(version, 0) + 1
+
+    def _settle(self, touched: Mapping[str, Optional[Tuple[str, ...]]]) -> DriftDelta:
+        """Compare touched packages against their prior state and update the drift set."""
+
+        delta = DriftDelta()
+        for package, before in touched.items():
+            versions = self._counts.get(package, {})
+            after = tuple(sorted(versions)) if len(versions) > 1 else None
+            if after is not None:
+                self._drifting.add(package)
+                if before is None:
+                    delta.introduced[package] = after
+                elif before != after:
+                    delta.changed[package] = after
+            elif before is not None:
+                self._drifting.discard(package)
+                delta.resolved[package] = tuple(versions)
+        return delta
+
+    def _release(self, package: str, version: str) -> None:
+        versions = self._counts[package]
+        remaining = versions[version] - 1
+        if remaining:
+            versions[version] = remaining
+        else:
+            del versions[version]
+            if not versions:
+                del self._counts[package]
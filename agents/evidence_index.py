@@ -0,0 +1,352 @@
+"""Evidence retrieval index for the Hallucination Sentinel.
+
+:class:`EvidenceIndex` keeps an in-memory inverted index over evidence
+snippets and ranks them for a claim with BM25. Query words missing from the
+vocabulary are matched to similar indexed words through a character n-gram
+index, so small spelling or inflection differences still find support.
+
+Snippets can be persisted in SQLite together with their term counts, so
+reopening the index does not re-tokenize the corpus and adds/removes are
+written incrementally. Tokenized claims and repeated queries are cached.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .storage import connect, prune_dirs, transaction
+
+_WORD = re.compile(r"[^\W_]+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+_FUZZY_MIN_SIMILARITY = 0.6
+_FUZZY_MAX_EXPANSIONS = 3
+
+# (doc_id, text, source, term counts)
+SnippetRecord = Tuple[str, str, Optional[str], Dict[str, int]]
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+@lru_cache(maxsize=1 << 14)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Return the distinct index terms of a query, in first-seen order (cached)."""
+
+    return tuple(dict.fromkeys(_terms(text)))
+
+
+def char_ngrams(term: str, size: int = 3) -> Set[str]:
+    """Return the character n-grams of a term, padded with boundary markers."""
+
+    padded = f"^{term}$"
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+@dataclass
+class EvidenceMatch:
+    """A ranked evidence snippet.
+
+    ``score`` is the BM25 score normalized by the claim's total term weight,
+    so 1.0 roughly means every claim term was found in a snippet of average
+    length.
+    """
+
+    doc_id: str
+    score: float
+    text: str
+    source: Optional[str] = None
+
+
+class EvidenceIndex:
+    """BM25 inverted index over evidence snippets with optional persistence.
+
+    Args:
+        path: Optional SQLite file persisting snippets; existing snippets are
+            loaded on open and every add/remove is written through.
+        ngram_size: Character n-gram size for fuzzy term matching (0 disables it).
+        k1: BM25 term-frequency saturation.
+        b: BM25 length normalization.
+        query_cache_size: Number of recent query results kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ngram_size: int = 3,
+        k1: float = 1.2,
+        b: float = 0.75,
+        query_cache_size: int = 4096,
+        busy_timeout: float = 30.0,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.ngram_size = ngram_size
+        self.k1 = k1
+        self.b = b
+        self.busy_timeout = busy_timeout
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._snippets: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._by_source: Dict[str, Set[str]] = {}
+        # indexed file -> (mtime_ns, size), maintained by sync_directory
+        self._sources: Dict[str, Tuple[int, int]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self._query_cache: "OrderedDict[tuple, List[EvidenceMatch]]" = OrderedDict()
+        self._query_cache_size = query_cache_size
+        self._expansions: Dict[str, List[Tuple[str, float]]] = {}
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS snippets ("
+                    "doc_id TEXT PRIMARY KEY, text TEXT NOT NULL, source TEXT, terms TEXT NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS snippets_source ON snippets (source)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+                    "size INTEGER NOT NULL)"
+                )
+                rows = conn.execute("SELECT doc_id, text, source, terms FROM snippets").fetchall()
+                self._sources = {p: (m, s) for p, m, s in conn.execute("SELECT path, mtime_ns, size FROM sources")}
+            for doc_id, text, source, terms in rows:
+                self._insert(doc_id, text, source, json.loads(terms))
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._lengths
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect(self.path, self.busy_timeout)
+
+    def add(self, doc_id: str, text: str, source: Optional[str] = None) -> None:
+        """Index (or replace) one snippet."""
+
+        self.add_many([(doc_id, text, source)])
+
+    def add_many(self, snippets: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        """Index (or replace) ``(doc_id, text, source)`` snippets in one write; returns the count."""
+
+        records: List[SnippetRecord] = [
+            (doc_id, text, source, dict(Counter(_terms(text)))) for doc_id, text, source in snippets
+        ]
+        with self._lock:
+            for doc_id, text, source, terms in records:
+                self._discard(doc_id)
+                self._insert(doc_id, text, source, terms)
+            self._invalidate()
+        if self.path is not None and records:
+            rows = [
+                (doc_id, text, source, json.dumps(terms, separators=(",", ":")))
+                for doc_id, text, source, terms in records
+            ]
+            self._write("INSERT OR REPLACE INTO snippets (doc_id, text, source, terms) VALUES (?, ?, ?, ?)", rows)
+        return len(records)
+
+    def remove(self, doc_ids: Iterable[str] | str) -> int:
+        """Drop snippets by ID; returns how many were indexed."""
+
+        ids = [doc_ids] if isinstance(doc_ids, str) else list(doc_ids)
+        with self._lock:
+            removed = sum(self._discard(doc_id) for doc_id in ids)
+            self._invalidate()
+        if self.path is not None and ids:
+            self._write("DELETE FROM snippets WHERE doc_id = ?", [(doc_id,) for doc_id in ids])
+        return removed
+
+    def sync_directory(self, root: str | Path, suffixes: Sequence[str] = (".md", ".rst", ".txt")) -> Tuple[int, int]:
+        """Index a document tree, one snippet per paragraph.
+
+        Only files that are new or whose size or modification time changed are
+        re-read; snippets from files deleted under ``root`` are removed, while
+        files indexed from other roots are left alone. Sources are recorded as
+        ``root`` joined with the file's relative path (so syncing ``docs/``
+        indexes ``docs/guide.md``), and snippet IDs are
+        ``<source>#<paragraph number>``.
+
+        Returns:
+            ``(files indexed, files removed)``.
+        """
+
+        root = Path(root)
+        known = {source: stat for source, stat in self._sources.items() if Path(source).is_relative_to(root)}
+        seen: Dict[str, Tuple[int, int]] = {}
+        changed: List[str] = []
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = prune_dirs(dirnames)
+            for name in filenames:
+                if not name.endswith(tuple(suffixes)):
+                    continue
+                full = os.path.join(directory, name)
+                source = (root / os.path.relpath(full, root)).as_posix()
+                stat = os.stat(full)
+                seen[source] = (stat.st_mtime_ns, stat.st_size)
+                if known.get(source) != seen[source]:
+                    changed.append(source)
+
+        deleted = [source for source in known if source not in seen]
+        self.remove([doc_id for source in [*changed, *deleted] for doc_id in self._by_source.get(source, ())])
+        self.add_many(self._paragraphs(changed))
+        for source in deleted:
+            del self._sources[source]
+        self._sources.update(seen)
+        if self.path is not None:
+            self._write("DELETE FROM sources WHERE path = ?", [(source,) for source in deleted])
+            self._write(
+                "INSERT OR REPLACE INTO sources (path, mtime_ns, size) VALUES (?, ?, ?)",
+                [(source, *seen[source]) for source in changed],
+            )
+        return len(changed), len(deleted)
+
+    def search(self, claim: str, top_k: int = 5, threshold: float = 0.0) -> List[EvidenceMatch]:
+        """Return up to ``top_k`` snippets scoring at least ``threshold`` for a claim, best first."""
+
+        key = (claim, top_k, threshold)
+        with self._lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return list(cached)
+            matches = self._search(claim, top_k, threshold)
+            self._query_cache[key] = matches
+            while len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        return list(matches)
+
+    def _search(self, claim: str, top_k: int, threshold: float) -> List[EvidenceMatch]:
+        count = len(self._lengths)
+        terms = tokenize(claim)
+        if not count or not terms or top_k < 1:
+            return []
+        average_length = self._total_length / count
+        k1, b = self.k1, self.b
+        lengths = self._lengths
+
+        def _idf(df: int) -> float:
+            return math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+        scores: Dict[str, float] = {}
+        total_weight = 0.0
+        for term in terms:
+            postings = self._postings.get(term)
+            expansions = [(term, 1.0)] if postings is not None else self._expand(term)
+            total_weight += _idf(len(postings) if postings is not None else 0)
+            for matched, similarity in expansions:
+                matched_postings = self._postings[matched]
+                weight = similarity * _idf(len(matched_postings)) * (k1 + 1)
+                for doc_id, tf in matched_postings.items():
+                    norm = k1 * (1 - b + b * lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+        matches: List[EvidenceMatch] = []
+        for doc_id, raw in best:
+            score = min(1.0, raw / total_weight)
+            if score < threshold:
+                break
+            text, source = self._snippets[doc_id]
+            matches.append(EvidenceMatch(doc_id=doc_id, score=round(score, 4), text=text, source=source))
+        return matches
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Map an out-of-vocabulary term to similar indexed terms via shared n-grams."""
+
+        if not self.ngram_size:
+            return []
+        cached = self._expansions.get(term)
+        if cached is not None:
+            return cached
+        grams = char_ngrams(term, self.ngram_size)
+        overlap: Counter = Counter()
+        for gram in grams:
+            overlap.update(self._grams.get(gram, ()))
+        candidates: List[Tuple[str, float]] = []
+        for candidate, shared in overlap.items():
+            similarity = 2 * shared / (len(grams) + len(char_ngrams(candidate, self.ngram_size)))
+            if similarity >= _FUZZY_MIN_SIMILARITY:
+                candidates.append((candidate, similarity))
+        expansions = heapq.nlargest(_FUZZY_MAX_EXPANSIONS, candidates, key=itemgetter(1))
+        self._expansions[term] = expansions
+        return expansions
+
+    def _insert(self, doc_id: str, text: str, source: Optional[str], terms: Dict[str, int]) -> None:
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if self.ngram_size:
+                    for gram in char_ngrams(term, self.ngram_size):
+                        self._grams.setdefault(gram, set()).add(term)
+            postings[doc_id] = tf
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+        self._snippets[doc_id] = (text, source)
+        if source is not None:
+            self._by_source.setdefault(source, set()).add(doc_id)
+
+    def _discard(self, doc_id: str) -> bool:
+        if doc_id not in self._lengths:
+            return False
+        text, source = self._snippets.pop(doc_id)
+        if source is not None:
+            siblings = self._by_source.get(source)
+            if siblings is not None:
+                siblings.discard(doc_id)
+                if not siblings:
+                    del self._by_source[source]
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in set(_terms(text)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                if self.ngram_size:
+                    for gram in char_ngrams(term, self.ngram_size):
+                        related = self._grams.get(gram)
+                        if related is not None:
+                            related.discard(term)
+                            if not related:
+                                del self._grams[gram]
+        return True
+
+    def _invalidate(self) -> None:
+        self._query_cache.clear()
+        self._expansions.clear()
+
+    @staticmethod
+    def _paragraphs(files: Iterable[str]) -> Iterator[Tuple[str, str, Optional[str]]]:
+        for source in files:
+            text = Path(source).read_text(encoding="utf-8", errors="replace")
+            paragraphs = filter(None, (part.strip() for part in _PARAGRAPH_BREAK.split(text)))
+            for number, paragraph in enumerate(paragraphs, start=1):
+                yield f"{source}#{number}", paragraph, source
+
+    def _write(self, statement: str, rows: List[tuple]) -> None:
+        if not rows:
+            return
+        with self._connect() as conn, transaction(conn):
+            conn.executemany(statement, rows)
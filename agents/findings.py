@@ -0,0 +1,155 @@
+"""Structured findings with streaming JSONL and SARIF serializers.
+
+Agents expose ``iter_*`` generators that yield :class:`Finding` records as
+they are discovered. The serializers here write each record as soon as it
+arrives, so a large lint run or advisory audit is never held in memory as a
+report string. Human-readable text is rendered only on request, through
+:meth:`Finding.render` or :func:`render_text`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, IO, Iterable, Iterator, Optional
+
+ERROR = "error"
+WARNING = "warning"
+NOTE = "note"
+SEVERITIES = (ERROR, WARNING, NOTE)
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+
+class Finding:
+    """One issue reported by an agent.
+
+    Attributes:
+        agent: Name of the reporting agent (its ``config.name``).
+        rule: Stable identifier of the check, e.g. ``"F401"`` or ``"insecure-port"``.
+        message: Human-readable description.
+        severity: ``"error"``, ``"warning"``, or ``"note"`` (SARIF levels).
+        path: File or manifest the finding points at, if any.
+        line: 1-based line number, if known.
+        column: 1-based column number, if known.
+    """
+
+    __slots__ = ("agent", "rule", "message", "severity", "path", "line", "column")
+
+    def __init__(
+        self,
+        agent: str,
+        rule: str,
+        message: str,
+        severity: str = WARNING,
+        path: Optional[str] = None,
+        line: Optional[int] = None,
+        column: Optional[int] = None,
+    ):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity {severity!r}; expected one of {', '.join(SEVERITIES)}.")
+        self.agent = agent
+        self.rule = rule
+        self.message = message
+        self.severity = severity
+        self.path = path
+        self.line = line
+        self.column = column
+
+    def __repr__(self) -> str:
+        location = f" at {self.location()}" if self.path else ""
+        return f"Finding({self.agent!r}, {self.rule!r}, {self.severity}{location}: {self.message!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def location(self) -> str:
+        """``path[:line[:column]]``, or an empty string when the finding has no path."""
+
+        if not self.path:
+            return ""
+        parts = [self.path, *(str(value) for value in (self.line, self.column) if value is not None)]
+        return ":".join(parts)
+
+    def render(self) -> str:
+        location = self.location()
+        return f"{location}: {self.message}" if location else self.message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain mapping with unset location fields omitted."""
+
+        return {name: value for name in self.__slots__ if (value := getattr(self, name)) is not None}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "Finding":
+        return cls(**{name: payload[name] for name in cls.__slots__ if name in payload})
+
+
+def render_text(findings: Iterable[Finding], title: str, empty: str) -> str:
+    """Render ``title`` followed by one bullet per finding, or ``empty`` when there are none."""
+
+    lines = [finding.render() for finding in findings]
+    if not lines:
+        return empty
+    return f"{title}\n- " + "\n- ".join(lines)
+
+
+def iter_jsonl(findings: Iterable[Finding]) -> Iterator[str]:
+    """Yield one JSON line (with trailing newline) per finding."""
+
+    for finding in findings:
+        yield json.dumps(finding.to_dict(), separators=(",", ":")) + "\n"
+
+
+def write_jsonl(findings: Iterable[Finding], stream: IO[str]) -> int:
+    """Write findings as JSON Lines while they are produced; returns the count."""
+
+    count = 0
+    for line in iter_jsonl(findings):
+        stream.write(line)
+        count += 1
+    return count
+
+
+def _sarif_result(finding: Finding) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "ruleId": finding.rule,
+        "level": finding.severity,
+        "message": {"text": finding.message},
+        "properties": {"agent": finding.agent},
+    }
+    if finding.path:
+        location: Dict[str, Any] = {"artifactLocation": {"uri": finding.path}}
+        if finding.line is not None:
+            region = {"startLine": finding.line}
+            if finding.column is not None:
+                region["startColumn"] = finding.column
+            location["region"] = region
+        result["locations"] = [{"physicalLocation": location}]
+    return result
+
+
+def write_sarif(
+    findings: Iterable[Finding],
+    stream: IO[str],
+    tool_name: str = "My_Coding_Agents",
+    tool_version: Optional[str] = None,
+) -> int:
+    """Write a SARIF 2.1.0 log with a single run, streaming one result at a time; returns the count."""
+
+    driver: Dict[str, Any] = {"name": tool_name}
+    if tool_version:
+        driver["version"] = tool_version
+    header = {"$schema": SARIF_SCHEMA, "version": SARIF_VERSION}
+    run_head = json.dumps({"tool": {"driver": driver}}, separators=(",", ":"))[:-1]
+    stream.write(json.dumps(header, separators=(",", ":"))[:-1] + ',"runs":[' + run_head + ',"results":[')
+    count = 0
+    for finding in findings:
+        if count:
+            stream.write(",")
+        stream.write("\n" + json.dumps(_sarif_result(finding), separators=(",", ":")))
+        count += 1
+    stream.write("\n]}]}\n")
+    return count
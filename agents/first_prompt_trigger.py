@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Callable, List, Sequence
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Optional, Sequence
 
 PromptHandler = Callable[[str], str]
 
@@ -14,13 +16,20 @@ class FirstPromptTrigger:
     return string reports (for example, the output of an agent's run method).
     When invoked, the trigger executes each callback the first time and caches
     that it has fired so subsequent prompts do not re-run the callbacks.
+
+    Besides the blocking ``__call__``, the trigger offers a concurrent mode:
+    ``submit`` starts every callback on a thread pool and returns futures
+    immediately, while ``stream`` yields each report as soon as its callback
+    finishes. All entry points share the same exactly-once guarantee.
     """
 
-    def __init__(self, callbacks: Sequence[PromptHandler]):
+    def __init__(self, callbacks: Sequence[PromptHandler], max_workers: Optional[int] = None):
         if not callbacks:
             raise ValueError("Provide at least one callback to trigger.")
         self._callbacks: List[PromptHandler] = list(callbacks)
+        self._max_workers: int = max_workers or len(self._callbacks)
         self._fired: bool = False
+        self._lock = threading.Lock()
 
     @property
     def fired(self) -> bool:
@@ -28,10 +37,54 @@ class FirstPromptTrigger:
 
         return self._fired
 
+    def _claim(self) -> bool:
+        """Atomically mark the trigger as fired; return False if it already was."""
+
+        with self._lock:
+            if self._fired:
+                return False
+            self._fired = True
+            return True
+
     def __call__(self, prompt: str) -> List[str]:
         """Execute callbacks on the first prompt and return their reports."""
 
-        if self._fired:
+        if not self._claim():
             return []
-        self._fired = True
         return [callback(prompt) for callback in self._callbacks]
+
+    def submit(self, prompt: str) -> List[Future[str]]:
+        """Start callbacks in the background and return one future per callback.
+
+        Futures are returned in callback order. A callback that raises only
+        fails its own future; the remaining callbacks keep running. Subsequent
+        prompts receive an empty list.
+        """
+
+        if not self._claim():
+            return []
+        executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="first-prompt")
+        try:
+            return [executor.submit(callback, prompt) for callback in self._callbacks]
+        finally:
+            # Let running callbacks finish without blocking the caller.
+            executor.shutdown(wait=False)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield each callback's report as soon as it completes.
+
+        Reports arrive in completion order. A failing callback yields a short
+        failure report instead of interrupting the stream.
+        """
+
+        # Submit eagerly so callbacks start before the caller begins iterating.
+        return self._drain(self.submit(prompt))
+
+    @staticmethod
+    def _drain(futures: List[Future[str]]) -> Iterator[str]:
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                yield f"Callback failed: {error!r}"
+            else:
+                yield future.result()
@@ -2,34 +2,58 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List, Mapping
+from typing import Iterable, Iterator, List, Mapping, Optional
 
 from .base import BaseAgent
 from .config import AGENTS
+from .evidence_index import EvidenceIndex
+from .findings import ERROR, Finding
+from .streaming_gate import StreamingGate
 
 
 class HallucinationSentinel(BaseAgent):
     """Guardrail AI outputs with verification and citation checks."""
 
-    def __init__(self):
+    def __init__(self, evidence_index: EvidenceIndex | None = None):
         super().__init__(config=AGENTS["hallucination_sentinel"])
+        self.evidence_index: Optional[EvidenceIndex] = evidence_index
 
-    def verify_claims(self, claims: Iterable[str], evidence: Mapping[str, List[str]]) -> str:
+    def verify_claims(
+        self,
+        claims: Iterable[str],
+        evidence: Optional[Mapping[str, List[str]]] = None,
+        index: EvidenceIndex | None = None,
+        threshold: float = 0.5,
+        top_k: int = 3,
+    ) -> str:
         """Require evidence for each claim.
 
+        Claims without explicit evidence are looked up in the evidence index
+        (``index`` or the sentinel's own), and count as supported when at
+        least one snippet scores at or above ``threshold``.
+
         Args:
             claims: Claims to validate.
             evidence: Mapping of claim -> supporting evidence snippets.
+            index: Evidence index to search; defaults to ``self.evidence_index``.
+            threshold: Minimum normalized score (0-1) for a supporting snippet.
+            top_k: Maximum snippets retrieved per claim.
         """
 
+        evidence = evidence or {}
+        index = index if index is not None else self.evidence_index
         missing: List[str] = []
         summary_lines: List[str] = []
         for claim in claims:
-            support = evidence.get(claim, [])
-            if not support:
+            support = self.claim_support(claim, evidence, index, threshold, top_k)
+            if support is None:
                 missing.append(claim)
-                continue
-            summary_lines.append(f"{claim}: supported by {len(support)} citation(s)")
+            else:
+                summary_lines.append(support)
+        return self.report_claims(summary_lines, missing)
+
+    def report_claims(self, summary_lines: List[str], missing: List[str]) -> str:
+        """Report supported claims (as described by :meth:`claim_support`) and claims lacking evidence."""
 
         report_sections: List[str] = []
         if summary_lines:
@@ -40,6 +64,44 @@ class HallucinationSentinel(BaseAgent):
         report = "\n\n".join(report_sections) if report_sections else "No claims provided for verification."
         return self.deliver(report, context=["hallucination", "verification"])
 
+    def iter_unsupported(
+        self,
+        claims: Iterable[str],
+        evidence: Optional[Mapping[str, List[str]]] = None,
+        index: EvidenceIndex | None = None,
+        threshold: float = 0.5,
+        top_k: int = 3,
+    ) -> Iterator[Finding]:
+        """Yield a finding for each claim lacking evidence, checking claims as they stream in.
+
+        Arguments match :meth:`verify_claims`.
+        """
+
+        evidence = evidence or {}
+        index = index if index is not None else self.evidence_index
+        for claim in claims:
+            if self.claim_support(claim, evidence, index, threshold, top_k) is None:
+                yield Finding(self.config.name, "unsupported-claim", claim, ERROR)
+
+    @staticmethod
+    def claim_support(
+        claim: str,
+        evidence: Mapping[str, List[str]],
+        index: Optional[EvidenceIndex],
+        threshold: float,
+        top_k: int,
+    ) -> Optional[str]:
+        """Describe the support for ``claim``, or return None when there is none."""
+
+        support = evidence.get(claim, [])
+        if support:
+            return f"{claim}: supported by {len(support)} citation(s)"
+        matches = index.search(claim, top_k=top_k, threshold=threshold) if index is not None else []
+        if not matches:
+            return None
+        best = matches[0]
+        return f"{claim}: supported by {len(matches)} indexed snippet(s) (best: {best.doc_id}, score {best.score:.2f})"
+
     def gate_response(self, response: str, contains_evidence: bool) -> str:
         """Fail closed when a response lacks citations or tests."""
 
@@ -50,3 +112,25 @@ class HallucinationSentinel(BaseAgent):
         else:
             report = "Response approved for delivery."
         return self.deliver(report, context=["hallucination", "gating"])
+
+    def gate_stream(self, chunks: Iterable[str], max_unsupported_chars: int = 4000) -> str:
+        """Gate a streamed response incrementally, deciding as early as possible.
+
+        Citation and test-reference markers are detected as chunks arrive. The
+        stream is approved at the first marker and blocked once
+        ``max_unsupported_chars`` have arrived without one; either way the
+        source is closed (when it supports ``close()``) so generation stops.
+        Use :class:`StreamingGate` directly to relay the text while gating it.
+        """
+
+        gate = StreamingGate(max_unsupported_chars=max_unsupported_chars)
+        source = iter(chunks)
+        try:
+            for chunk in source:
+                if gate.feed(chunk).settled:
+                    break
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+        return self.deliver(gate.close().reason, context=["hallucination", "gating"])
@@ -0,0 +1,302 @@
+"""Test impact analysis for the TDD Enforcer.
+
+An :class:`ImportGraph` records which modules every Python file imports. It is
+cached as JSON and refreshed incrementally, so only files whose size or
+modification time changed are parsed again. :class:`TestImpactAnalyzer` walks
+the reversed graph from the changed modules to the test files that can reach
+them, optionally widened with per-test coverage maps from earlier runs.
+"""
+
+from __future__ import annotations
+
+import ast
+import fnmatch
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .storage import load_json_cache, prune_dirs, save_json_cache
+
+_CACHE_VERSION = 2
+
+FULL_SUITE_TRIGGERS: Tuple[str, ...] = (
+    "conftest.py",
+    "pytest.ini",
+    "pyproject.toml",
+    "setup.cfg",
+    "setup.py",
+    "tox.ini",
+    "noxfile.py",
+    "requirements*.txt",
+)
+"""File name patterns whose changes can affect any test, forcing a full run."""
+
+
+def _is_test_file(path: PurePath) -> bool:
+    return path.suffix == ".py" and ("test" in path.name.lower() or "tests" in path.parts)
+
+
+def _plugin_names(node: ast.Assign) -> List[str]:
+    """Return the modules named by a ``pytest_plugins = ...`` assignment."""
+
+    if not any(isinstance(target, ast.Name) and target.id == "pytest_plugins" for target in node.targets):
+        return []
+    values = node.value.elts if isinstance(node.value, (ast.List, ast.Tuple)) else [node.value]
+    return [value.value for value in values if isinstance(value, ast.Constant) and isinstance(value.value, str)]
+
+
+def _parse_imports(source: str, module: str, is_package: bool) -> List[str]:
+    """Return the absolute module names a source file imports, including its ``pytest_plugins``."""
+
+    names: List[str] = []
+    package = module if is_package else module.rpartition(".")[0]
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                anchor = parts[: len(parts) - node.level + 1] if node.level > 1 else parts
+                base = ".".join([*anchor, base] if base else anchor)
+            if base:
+                names.append(base)
+            names.extend(f"{base}.{alias.name}" if base else alias.name for alias in node.names if alias.name != "*")
+        elif isinstance(node, ast.Assign):
+            names.extend(_plugin_names(node))
+    return names
+
+
+class ImportGraph:
+    """Module import graph for a repository, cached between runs.
+
+    Args:
+        root: Repository root.
+        cache_path: Optional JSON file persisting parsed imports.
+        source_roots: Directories (relative to ``root``) that act as import
+            roots, e.g. ``""`` for flat layouts and ``"src"`` for src layouts.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        cache_path: str | Path | None = None,
+        source_roots: Sequence[str] = ("", "src"),
+    ):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.source_roots: Tuple[str, ...] = tuple(source_roots)
+        # relative path -> (mtime_ns, size, imported names or None when unparsable)
+        self._files: Dict[str, Tuple[int, int, Optional[List[str]]]] = {}
+        self._importers: Dict[str, Set[str]] = {}
+        self._modules: Dict[str, str] = {}
+        self._loaded = False
+
+    def module_name(self, rel_path: str) -> Optional[str]:
+        """Map a repository-relative ``.py`` path to its dotted module name."""
+
+        path = PurePath(rel_path)
+        if path.suffix != ".py":
+            return None
+        for source_root in sorted(self.source_roots, key=len, reverse=True):
+            try:
+                relative = path.relative_to(source_root) if source_root else path
+            except ValueError:
+                continue
+            parts = list(relative.with_suffix("").parts)
+            if parts and parts[-1] == "__init__":
+                parts.pop()
+            return ".".join(parts) or None
+        return None
+
+    def __contains__(self, rel_path: object) -> bool:
+        """Whether a repository-relative path is an indexed ``.py`` file."""
+
+        return rel_path in self._files
+
+    def unparsable(self, rel_paths: Iterable[str]) -> List[str]:
+        """Return the given paths that are indexed but failed to parse."""
+
+        return [p for p in rel_paths if p in self._files and self._files[p][2] is None]
+
+    def importers_of(self, module: str) -> Set[str]:
+        """Return files that import ``module`` directly."""
+
+        return self._importers.get(module, set())
+
+    def refresh(self) -> None:
+        """Parse new or modified files and drop deleted ones."""
+
+        if not self._loaded:
+            self._load_cache()
+        previous = self._files
+        current: Dict[str, Tuple[int, int, Optional[List[str]]]] = {}
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = prune_dirs(dirnames)
+            for name in filenames:
+                if not name.endswith(".py"):
+                    continue
+                full = os.path.join(directory, name)
+                rel = Path(os.path.relpath(full, self.root)).as_posix()
+                stat = os.stat(full)
+                cached = previous.get(rel)
+                if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    current[rel] = cached
+                    continue
+                current[rel] = (stat.st_mtime_ns, stat.st_size, self._read_imports(full, rel))
+
+        changed = current != previous
+        self._files = current
+        self._rebuild()
+        self._loaded = True
+        if changed:
+            self._save_cache()
+
+    def _read_imports(self, full_path: str, rel: str) -> Optional[List[str]]:
+        module = self.module_name(rel) or ""
+        try:
+            source = Path(full_path).read_text(encoding="utf-8", errors="replace")
+            return sorted(set(_parse_imports(source, module, rel.endswith("__init__.py"))))
+        except (SyntaxError, ValueError):
+            return None
+
+    def _resolve(self, name: str) -> Optional[str]:
+        """Resolve an imported name to the closest indexed module."""
+
+        while name:
+            if name in self._modules:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def _rebuild(self) -> None:
+        self._modules = {}
+        for rel in self._files:
+            module = self.module_name(rel)
+            if module:
+                self._modules[module] = rel
+        importers: Dict[str, Set[str]] = {}
+        for rel, (_, _, imported) in self._files.items():
+            for name in imported or ():
+                # Keep the raw name too, so importers of deleted modules are still found.
+                importers.setdefault(name, set()).add(rel)
+                resolved = self._resolve(name)
+                if resolved is not None and resolved != name:
+                    importers.setdefault(resolved, set()).add(rel)
+        self._importers = importers
+
+    def _load_cache(self) -> None:
+        payload = load_json_cache(self.cache_path, _CACHE_VERSION, self.root)
+        if payload is None:
+            return
+        self._files = {rel: (mtime, size, imports) for rel, (mtime, size, imports) in payload["files"].items()}
+
+    def _save_cache(self) -> None:
+        save_json_cache(self.cache_path, _CACHE_VERSION, {"files": self._files}, self.root)
+
+
+@dataclass
+class TestSelection:
+    """Outcome of impact analysis.
+
+    ``tests`` is None when the full suite must run; ``reason`` explains why.
+    """
+
+    __test__ = False  # keep pytest from collecting this class
+
+    tests: Optional[List[str]]
+    reason: str
+
+
+class TestImpactAnalyzer:
+    """Select the test files that can reach a change set.
+
+    Args:
+        graph: Import graph for the repository.
+        coverage_map: Optional mapping of test file -> source files it executed
+            in an earlier run, e.g. exported from ``coverage.py`` contexts.
+        full_suite_triggers: File name patterns that force a full run.
+    """
+
+    __test__ = False  # keep pytest from collecting this class
+
+    def __init__(
+        self,
+        graph: ImportGraph,
+        coverage_map: Mapping[str, Iterable[str]] | None = None,
+        full_suite_triggers: Sequence[str] = FULL_SUITE_TRIGGERS,
+    ):
+        self.graph = graph
+        self.full_suite_triggers: Tuple[str, ...] = tuple(full_suite_triggers)
+        self._covering: Dict[str, Set[str]] = {}
+        for test_file, sources in (coverage_map or {}).items():
+            for source in sources:
+                self._covering.setdefault(PurePath(source).as_posix(), set()).add(PurePath(test_file).as_posix())
+
+    @classmethod
+    def load_coverage_map(cls, path: str | Path) -> Dict[str, List[str]]:
+        """Load a JSON ``{test_file: [source_file, ...]}`` coverage map."""
+
+        return json.loads(Path(path).read_text())
+
+    def select(self, changed_files: Iterable[str | Path]) -> TestSelection:
+        """Return the affected test files, or request a full run when unsafe to narrow.
+
+        Narrowing is only safe when every changed file is a Python file the
+        import graph or the coverage map knows about. Anything else (data and
+        config files, deleted or unindexed modules) may be read by any test,
+        so the full suite is requested. So is a change that reaches a
+        ``conftest.py`` (directly, or through a module it lists in
+        ``pytest_plugins``): tests use its fixtures without importing it.
+        """
+
+        changed = [self._relative(p) for p in changed_files]
+        for rel in changed:
+            name = PurePath(rel).name
+            if any(fnmatch.fnmatch(name, pattern) for pattern in self.full_suite_triggers):
+                return TestSelection(tests=None, reason=f"{rel} affects test configuration")
+
+        try:
+            self.graph.refresh()
+        except OSError as exc:
+            return TestSelection(tests=None, reason=f"import graph could not be refreshed ({exc})")
+        broken = self.graph.unparsable(changed)
+        if broken:
+            return TestSelection(tests=None, reason=f"import graph is stale for unparsable {broken[0]}")
+        for rel in changed:
+            if PurePath(rel).suffix != ".py":
+                return TestSelection(tests=None, reason=f"{rel} is not a Python module")
+            if rel not in self.graph and rel not in self._covering:
+                return TestSelection(tests=None, reason=f"{rel} is not in the import graph or coverage map")
+
+        selected: Set[str] = set()
+        seen: Set[str] = set()
+        queue = deque(changed)
+        while queue:
+            rel = queue.popleft()
+            if rel in seen:
+                continue
+            seen.add(rel)
+            name = PurePath(rel).name
+            if any(fnmatch.fnmatch(name, pattern) for pattern in self.full_suite_triggers):
+                return TestSelection(tests=None, reason=f"{rel} configures tests and depends on a changed module")
+            if _is_test_file(PurePath(rel)) and (self.graph.root / rel).exists():
+                selected.add(rel)
+            selected.update(self._covering.get(rel, ()))
+            module = self.graph.module_name(rel)
+            if module:
+                queue.extend(self.graph.importers_of(module) - seen)
+        tests = sorted((self.graph.root / rel).as_posix() for rel in selected)
+        return TestSelection(tests=tests, reason="selected by impact analysis")
+
+    def _relative(self, path: str | Path) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.graph.root.resolve())
+            except ValueError:
+                pass
+        return path.as_posix()
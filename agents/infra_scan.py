@@ -0,0 +1,466 @@
+"""Infrastructure-config scanning front end for the SOC II Guardian.
+
+:class:`InfraScanner` walks a directory tree and extracts exposed ports from
+docker-compose files, Kubernetes manifests, Helm values, and nginx configs.
+Files are parsed in a process pool and the resulting :class:`ServicePort`
+records are yielded as each batch completes. A JSON cache keyed by content
+hash (with an mtime/size fast path) lets rescans skip unchanged files.
+
+The parsers are deliberately lightweight (no YAML dependency): they follow
+indentation to build key paths, which covers the block-style YAML these tools
+emit, and fall back to ignoring constructs they do not understand.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .storage import load_json_cache, prune_dirs, save_json_cache
+
+_CACHE_VERSION = 1
+_BATCH_SIZE = 64
+
+TLS_PORTS = frozenset({443, 465, 636, 853, 993, 995, 5671, 6443, 8443, 9443})
+"""Ports assumed to carry TLS when a config gives no other hint."""
+
+_TLS_HINT = re.compile(r"https|tls|ssl|grpcs|wss", re.IGNORECASE)
+_BLOCK_SCALAR = re.compile(r"^[|>][-+0-9]*$")
+_COMPOSE_PORT = re.compile(r"^(?:(?:\[[^\]]*\]|[^:\[\]]*):)??(?:(\d+)(?:-(\d+))?:)?(\d+)(?:-(\d+))?(?:/\w+)?$")
+_NGINX_TOKEN = re.compile(r"#[^\n]*|([{};])|\"([^\"]*)\"|'([^']*)'|([^\s{};\"']+)")
+
+# (service name, port, tls_required)
+PortRecord = Tuple[str, int, bool]
+YamlKey = Union[str, int]
+
+
+@dataclass
+class ServicePort:
+    name: str
+    port: int
+    tls_required: bool = True
+    environment: Optional[str] = None
+
+
+def _infer_tls(port: int, *hints: str) -> bool:
+    return port in TLS_PORTS or any(_TLS_HINT.search(hint) for hint in hints if hint)
+
+
+def _as_port(value: object) -> Optional[int]:
+    text = str(value).strip()
+    if text.isdigit():
+        port = int(text)
+        if 0 < port < 65536:
+            return port
+    return None
+
+
+def _strip_scalar(value: str) -> str:
+    value = value.strip()
+    if value[:1] in ('"', "'"):
+        end = value.find(value[0], 1)
+        return value[1:end] if end != -1 else value[1:]
+    hash_at = value.find(" #")
+    if hash_at != -1:
+        value = value[:hash_at].rstrip()
+    return value
+
+
+def _split_mapping(content: str) -> Tuple[str, bool, str]:
+    """Split ``key: value`` content; the flag is False for plain scalars."""
+
+    if content[:1] in ('"', "'"):
+        end = content.find(content[0], 1)
+        if end != -1 and content[end + 1 : end + 2] == ":" and content[end + 2 : end + 3] in ("", " "):
+            return content[1:end], True, content[end + 2 :]
+        return "", False, content
+    if content.startswith(("{", "[")):
+        return "", False, content
+    if ": " in content:
+        key, _, value = content.partition(": ")
+        return key.strip(), True, value
+    if content.endswith(":"):
+        return content[:-1].strip(), True, ""
+    return "", False, content
+
+
+def iter_yaml_documents(text: str) -> Iterator[List[Tuple[Tuple[YamlKey, ...], str]]]:
+    """Yield each YAML document as a list of ``(key_path, scalar)`` pairs.
+
+    List items contribute their index to the key path. Flow sequences of
+    scalars (``[80, 443]``) are expanded; other flow collections, anchors,
+    and block scalars are skipped.
+    """
+
+    # Stack entries: [indent, key, next list index for items under this entry]
+    stack: List[list] = []
+    scalars: List[Tuple[Tuple[YamlKey, ...], str]] = []
+    block_indent: Optional[int] = None
+
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(raw) - len(raw.lstrip(" "))
+        if block_indent is not None:
+            if indent > block_indent:
+                continue
+            block_indent = None
+        if indent == 0 and (stripped.startswith("---") or stripped == "..."):
+            if scalars:
+                yield scalars
+            stack, scalars = [], []
+            continue
+
+        content = stripped
+        while content.startswith("- ") or content == "-":
+            while stack and (stack[-1][0] > indent or (stack[-1][0] == indent and isinstance(stack[-1][1], int))):
+                stack.pop()
+            parent = stack[-1] if stack else None
+            if parent is None:
+                stack.append([-1, "", 0])
+                parent = stack[-1]
+            index = parent[2]
+            parent[2] += 1
+            stack.append([indent, index, 0])
+            offset = len(content) - len(content[1:].lstrip(" "))
+            content = content[offset:]
+            indent += offset
+            if not content:
+                break
+        if not content:
+            continue
+
+        key, is_mapping, value = _split_mapping(content)
+        if is_mapping:
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            path = tuple(entry[1] for entry in stack if entry[0] >= 0) + (key,)
+            value = value.strip()
+            if not value or value.startswith(("&", "!")) and " " not in value:
+                stack.append([indent, key, 0])
+            elif _BLOCK_SCALAR.match(value):
+                block_indent = indent
+            elif value.startswith("["):
+                items = [_strip_scalar(item) for item in value.strip("[]").split(",")]
+                scalars.extend((path + (i,), item) for i, item in enumerate(items) if item)
+            elif not value.startswith("{"):
+                scalars.append((path, _strip_scalar(value)))
+        elif stack and isinstance(stack[-1][1], int):
+            path = tuple(entry[1] for entry in stack if entry[0] >= 0)
+            scalars.append((path, _strip_scalar(content)))
+    if scalars:
+        yield scalars
+
+
+def parse_compose(text: str) -> List[PortRecord]:
+    """Extract published (or exposed) ports from a docker-compose file."""
+
+    records: List[PortRecord] = []
+    long_syntax: Dict[Tuple[YamlKey, ...], Dict[str, str]] = {}
+    for document in iter_yaml_documents(text):
+        for path, value in document:
+            if len(path) < 4 or path[0] != "services" or path[2] not in ("ports", "expose"):
+                continue
+            service = str(path[1])
+            if len(path) == 4:
+                match = _COMPOSE_PORT.match(value)
+                if not match:
+                    continue
+                host_low, host_high, target_low, target_high = match.groups()
+                low = int(host_low or target_low)
+                high = int((host_high or host_low) if host_low else (target_high or target_low))
+                records.extend((service, port, _infer_tls(port, service)) for port in range(low, min(high, 65535) + 1))
+            elif len(path) == 5:
+                long_syntax.setdefault(path[:4], {})[str(path[4])] = value
+    for path, fields in long_syntax.items():
+        port = _as_port(fields.get("published", fields.get("target", "")))
+        if port is not None:
+            records.append((str(path[1]), port, _infer_tls(port, str(path[1]), fields.get("name", ""))))
+    return records
+
+
+_K8S_PORT_KEYS = ("port", "containerPort", "nodePort", "hostPort")
+
+
+def parse_kubernetes(text: str) -> List[PortRecord]:
+    """Extract ports from Kubernetes manifests (including rendered Helm templates)."""
+
+    records: List[PortRecord] = []
+    for document in iter_yaml_documents(text):
+        top = {path[0]: value for path, value in document if len(path) == 1}
+        if "kind" not in top:
+            continue
+        name = next((value for path, value in document if path == ("metadata", "name")), "")
+        workload = f"{top['kind']}/{name}" if name else str(top["kind"])
+        entries: Dict[Tuple[YamlKey, ...], Dict[str, str]] = {}
+        for path, value in document:
+            if len(path) >= 3 and path[-3] == "ports" and isinstance(path[-2], int):
+                entries.setdefault(path[:-1], {})[str(path[-1])] = value
+        for fields in entries.values():
+            port_name = fields.get("name", "")
+            label = f"{workload}:{port_name}" if port_name else workload
+            for key in _K8S_PORT_KEYS:
+                port = _as_port(fields.get(key, ""))
+                if port is not None:
+                    records.append((label, port, _infer_tls(port, port_name, fields.get("appProtocol", ""))))
+    return records
+
+
+def parse_helm_values(text: str) -> List[PortRecord]:
+    """Extract ``*port`` settings from a Helm ``values.yaml``.
+
+    A port counts as TLS-protected when its key path mentions TLS/HTTPS or a
+    sibling ``tls`` / ``tls.enabled`` setting is true.
+    """
+
+    records: List[PortRecord] = []
+    for document in iter_yaml_documents(text):
+        values = dict(document)
+        for path, value in document:
+            key = path[-1]
+            if not isinstance(key, str) or not key.lower().endswith("port") or key == "targetPort":
+                continue
+            port = _as_port(value)
+            if port is None:
+                continue
+            parent = path[:-1]
+            label = ".".join(str(part) for part in parent) or key
+            tls_flag = values.get(parent + ("tls",), values.get(parent + ("tls", "enabled"), ""))
+            tls = tls_flag.lower() in ("true", "yes", "on") or _infer_tls(port, *(str(part) for part in path))
+            records.append((label, port, tls))
+    return records
+
+
+def parse_nginx(text: str) -> List[PortRecord]:
+    """Extract ``listen`` ports from nginx ``server`` blocks."""
+
+    records: List[PortRecord] = []
+    blocks: List[str] = []
+    statement: List[str] = []
+    # Per open server block: (server_name, [(port, tls)])
+    servers: List[Tuple[List[str], List[Tuple[int, bool]]]] = []
+    for match in _NGINX_TOKEN.finditer(text):
+        punct, double, single, word = match.groups()
+        if punct is None and double is None and single is None and word is None:
+            continue  # comment
+        if punct == "{":
+            blocks.append(statement[0] if statement else "")
+            if blocks[-1] == "server":
+                servers.append(([], []))
+            statement = []
+        elif punct == "}":
+            if blocks and blocks.pop() == "server" and servers:
+                names, listens = servers.pop()
+                label = names[0] if names and names[0] != "_" else "nginx"
+                records.extend((label, port, tls) for port, tls in listens)
+            statement = []
+        elif punct == ";":
+            if statement and servers and blocks and blocks[-1] == "server":
+                directive, args = statement[0], statement[1:]
+                if directive == "server_name":
+                    servers[-1][0].extend(args)
+                elif directive == "listen" and args:
+                    address = args[0]
+                    if not address.startswith("unix:"):
+                        port_text = address.rsplit(":", 1)[-1] if not address.isdigit() else address
+                        port = _as_port(port_text) if port_text.isdigit() else 80
+                        if port is not None:
+                            servers[-1][1].append((port, "ssl" in args or "quic" in args))
+            statement = []
+        else:
+            statement.append(word if word is not None else (double if double is not None else single))
+    return records
+
+
+Parser = Callable[[str], List[PortRecord]]
+
+
+def parser_for(rel_path: str) -> Optional[Parser]:
+    """Return the parser for a repository-relative path, or None to skip it."""
+
+    path = PurePath(rel_path)
+    name = path.name.lower()
+    if name.endswith((".yml", ".yaml")):
+        if name.startswith(("docker-compose", "compose")):
+            return parse_compose
+        if name.startswith("values") or name.endswith((".values.yaml", ".values.yml")):
+            return parse_helm_values
+        return parse_kubernetes
+    if name.endswith(".conf") and (name == "nginx.conf" or "nginx" in path.parts or "conf.d" in path.parts):
+        return parse_nginx
+    if any(part in ("sites-enabled", "sites-available") for part in path.parts):
+        return parse_nginx
+    return None
+
+
+# (rel path, full path, previously cached digest or None)
+_Job = Tuple[str, str, Optional[str]]
+# (rel path, mtime_ns, size, digest, records or None when unchanged, error or None)
+_Outcome = Tuple[str, int, int, str, Optional[List[PortRecord]], Optional[str]]
+
+
+def _scan_batch(jobs: Sequence[_Job]) -> List[_Outcome]:
+    """Read, hash, and parse a batch of files (runs in a worker process)."""
+
+    outcomes: List[_Outcome] = []
+    for rel, full, known_digest in jobs:
+        try:
+            stat = os.stat(full)
+            with open(full, "rb") as handle:
+                data = handle.read()
+        except OSError as exc:
+            outcomes.append((rel, 0, 0, "", [], f"{rel}: {exc.strerror or exc}"))
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == known_digest:
+            outcomes.append((rel, stat.st_mtime_ns, stat.st_size, digest, None, None))
+            continue
+        parser = parser_for(rel)
+        try:
+            records = parser(data.decode("utf-8", errors="replace")) if parser else []
+            outcomes.append((rel, stat.st_mtime_ns, stat.st_size, digest, records, None))
+        except Exception as exc:  # a malformed file must not abort the scan
+            outcomes.append((rel, stat.st_mtime_ns, stat.st_size, digest, [], f"{rel}: could not parse ({exc})"))
+    return outcomes
+
+
+class InfraScanner:
+    """Scan a directory tree for service ports declared in infrastructure configs.
+
+    Args:
+        root: Directory to scan.
+        cache_path: Optional JSON file remembering each file's content hash and
+            extracted ports, so unchanged files are skipped on rescans.
+        workers: Parser processes; defaults to the machine's core count.
+            Small change sets are parsed in-process.
+    """
+
+    def __init__(self, root: str | Path = ".", cache_path: str | Path | None = None, workers: int | None = None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.workers: int = max(1, workers or os.cpu_count() or 1)
+        self.errors: List[str] = []
+        self.parsed_files = 0
+        self.total_files = 0
+        self.reviewed_files = 0
+        # rel path -> (mtime_ns, size, digest, records)
+        self._files: Dict[str, Tuple[int, int, str, List[PortRecord]]] = {}
+        self._loaded = False
+
+    @property
+    def unreviewed_files(self) -> int:
+        """Files of the last scan whose ports were not all yielded (the scan was closed early)."""
+
+        return self.total_files - self.reviewed_files
+
+    def scan(self) -> Iterator[ServicePort]:
+        """Yield ports from every supported file, streaming results as batches finish.
+
+        Cached results are yielded first. The cache is saved once the iterator
+        is exhausted. Closing the iterator early cancels outstanding parser
+        batches without waiting for running ones, and leaves
+        :attr:`unreviewed_files` counting the files not fully reported.
+        """
+
+        if not self._loaded:
+            self._load_cache()
+            self._loaded = True
+        candidates = list(self._candidates())
+        self.errors = []
+        self.parsed_files = 0
+        self.total_files = len(candidates)
+        self.reviewed_files = 0
+        previous = self._files
+        current: Dict[str, Tuple[int, int, str, List[PortRecord]]] = {}
+        jobs: List[_Job] = []
+
+        for rel, full in candidates:
+            try:
+                stat = os.stat(full)
+            except OSError as exc:
+                self.errors.append(f"{rel}: {exc.strerror or exc}")
+                self.reviewed_files += 1
+                continue
+            cached = previous.get(rel)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                current[rel] = cached
+                yield from self._ports(rel, cached[3])
+                self.reviewed_files += 1
+            else:
+                jobs.append((rel, full, cached[2] if cached is not None else None))
+
+        outcomes = self._run(jobs)
+        try:
+            for outcome in outcomes:
+                rel, mtime_ns, size, digest, records, error = outcome
+                if error is not None:
+                    self.errors.append(error)
+                    self.reviewed_files += 1
+                    continue
+                if records is None:
+                    records = previous[rel][3]
+                else:
+                    self.parsed_files += 1
+                current[rel] = (mtime_ns, size, digest, records)
+                yield from self._ports(rel, records)
+                self.reviewed_files += 1
+        finally:
+            outcomes.close()
+
+        changed = current != previous
+        self._files = current
+        if changed:
+            self._save_cache()
+
+    def _ports(self, rel: str, records: Sequence[PortRecord]) -> Iterator[ServicePort]:
+        for name, port, tls_required in records:
+            yield ServicePort(name=f"{name} ({rel})", port=port, tls_required=tls_required)
+
+    def _candidates(self) -> Iterator[Tuple[str, str]]:
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = prune_dirs(dirnames)
+            for name in sorted(filenames):
+                full = os.path.join(directory, name)
+                rel = Path(os.path.relpath(full, self.root)).as_posix()
+                if parser_for(rel) is not None:
+                    yield rel, full
+
+    def _run(self, jobs: List[_Job]) -> Iterator[_Outcome]:
+        """Process jobs in batches, in a process pool when there is enough work."""
+
+        batches = [jobs[i : i + _BATCH_SIZE] for i in range(0, len(jobs), _BATCH_SIZE)]
+        if self.workers == 1 or len(batches) < 2:
+            for batch in batches:
+                yield from _scan_batch(batch)
+            return
+
+        pool = ProcessPoolExecutor(max_workers=min(self.workers, len(batches)))
+        finished = False
+        try:
+            pending: Set[Future] = {pool.submit(_scan_batch, batch) for batch in batches}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            finished = True
+        finally:
+            # When the caller stops early, drop queued batches and do not block on running ones.
+            pool.shutdown(wait=finished, cancel_futures=True)
+
+    def _load_cache(self) -> None:
+        payload = load_json_cache(self.cache_path, _CACHE_VERSION, self.root)
+        if payload is None:
+            return
+        self._files = {
+            rel: (mtime, size, digest, [tuple(record) for record in records])  # type: ignore[misc]
+            for rel, (mtime, size, digest, records) in payload["files"].items()
+        }
+
+    def _save_cache(self) -> None:
+        save_json_cache(self.cache_path, _CACHE_VERSION, {"files": self._files}, self.root)
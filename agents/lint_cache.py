@@ -0,0 +1,187 @@
+"""Persistent, content-addressed cache for lint findings.
+
+The cache lets :class:`~agents.lint_tester.LintTester` skip files whose content,
+lint command, tool version, and lint configuration match a previous run. Entries live in a small
+SQLite database so several CI workers can share one cache file safely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .storage import connect, transaction
+
+_CHUNK_SIZE = 1 << 16
+
+LINT_CONFIG_FILES: Sequence[str] = (
+    "pyproject.toml",
+    "ruff.toml",
+    ".ruff.toml",
+    ".flake8",
+    "setup.cfg",
+    "tox.ini",
+    ".pylintrc",
+    "pylintrc",
+    "mypy.ini",
+    ".mypy.ini",
+)
+"""Configuration files lint tools read; editing any of them invalidates cached findings."""
+
+
+def hash_file(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_configs(directory: str | Path, memo: Optional[Dict[str, str]] = None) -> str:
+    """Return a digest of the lint configuration files in ``directory`` and all of its ancestors.
+
+    Lint tools discover their settings by walking up from each file, so the
+    digest covers every configuration file they could pick up. Pass the same
+    ``memo`` across calls to hash each directory only once.
+    """
+
+    memo = {} if memo is None else memo
+    pending: List[str] = []
+    current = os.path.abspath(directory)
+    while current not in memo:
+        pending.append(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    digest = memo.get(current, "")
+    for folder in reversed(pending):
+        material = hashlib.sha256(digest.encode("utf-8"))
+        for name in LINT_CONFIG_FILES:
+            try:
+                material.update(f"\0{name}\0{hash_file(os.path.join(folder, name))}".encode("utf-8"))
+            except OSError:
+                continue
+        digest = memo[folder] = material.hexdigest()
+    return digest
+
+
+@dataclass
+class CachedLint:
+    """Lint outcome recorded for a single file."""
+
+    returncode: int
+    findings: str
+
+
+class LintCache:
+    """SQLite-backed lint cache with least-recently-used eviction.
+
+    Args:
+        path: Location of the cache database; parent directories are created.
+        max_entries: Upper bound on stored entries. The least recently used
+            entries are evicted once a write pushes the cache past the bound.
+        busy_timeout: Seconds to wait for a lock held by another worker.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000, busy_timeout: float = 30.0):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.busy_timeout = busy_timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lint_results ("
+                "key TEXT PRIMARY KEY, returncode INTEGER NOT NULL, "
+                "findings TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS lint_results_lru ON lint_results (last_used)")
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect(self.path, self.busy_timeout)
+
+    @staticmethod
+    def make_key(
+        path: str, content_hash: str, command: Sequence[str], tool_version: str, config_hash: str = ""
+    ) -> str:
+        """Build a cache key from a file's identity and the lint configuration.
+
+        ``config_hash`` is the :func:`hash_configs` digest for the file's directory.
+        """
+
+        material = "\0".join([path, content_hash, *command, tool_version, config_hash])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_run_key(file_keys: Iterable[str]) -> str:
+        """Build the key under which the notes of a run over exactly these files are stored.
+
+        Notes are the output lines no file owns, such as ``Found 3 errors.``
+        summaries; replaying them keeps warm reports identical to cold ones.
+        """
+
+        material = "\0".join(["run", *sorted(file_keys)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, keys: Iterable[str]) -> Dict[str, CachedLint]:
+        """Return cached results for the keys that are present and mark them as used."""
+
+        wanted = list(keys)
+        hits: Dict[str, CachedLint] = {}
+        if not wanted:
+            return hits
+        with self._connect() as conn:
+            # Stay well below SQLite's bound-parameter limit.
+            for start in range(0, len(wanted), 500):
+                batch = wanted[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, returncode, findings FROM lint_results WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, returncode, findings in rows:
+                    hits[key] = CachedLint(returncode=returncode, findings=findings)
+            if hits:
+                now = time.time()
+                with transaction(conn):
+                    conn.executemany(
+                        "UPDATE lint_results SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in hits],
+                    )
+        return hits
+
+    def store(self, entries: Mapping[str, CachedLint]) -> None:
+        """Persist results and evict the least recently used entries beyond the bound."""
+
+        if not entries:
+            return
+        now = time.time()
+        with self._connect() as conn, transaction(conn):
+            conn.executemany(
+                "INSERT OR REPLACE INTO lint_results (key, returncode, findings, last_used) VALUES (?, ?, ?, ?)",
+                [(key, entry.returncode, entry.findings, now) for key, entry in entries.items()],
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM lint_results").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM lint_results WHERE key IN "
+                    "(SELECT key FROM lint_results ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM lint_results")
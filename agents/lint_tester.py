@@ -2,26 +2,187 @@
 
 from __future__ import annotations
 
+import heapq
+import os
+import re
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Deque, Dict, Generator, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 from .base import BaseAgent
 from .config import AGENTS
+from .findings import ERROR, WARNING, Finding
+from .lint_cache import CachedLint, LintCache, hash_configs, hash_file
+from .process import Deadline, ProcessResult, iter_lines
+from .storage import prune_dirs
+
+# Matches ``path:line:col`` locations as printed by ruff, flake8, pylint and friends.
+_LOCATION = re.compile(r"(\S+?):\d+:\d+")
+# A finding line: ``path:line:col: [CODE[:]] message``.
+_FINDING = re.compile(r"^(\S+?):(\d+):(\d+):\s*(?:([A-Z]+[0-9]+):?\s+)?(.*)$")
+# Lines that continue a finding: indented text, code frames (``12 | code``, ``^^^``) and ``help:``/``note:`` hints.
+_CONTINUATION = re.compile(r"^(?:\s|\d+\s*\||[|=^]|(?:help|note):)")
+# Per-file overhead (in bytes) used when balancing shards, so many tiny files still spread out.
+_FILE_WEIGHT = 4096
+# Non-finding output lines quoted when a streamed lint batch fails without findings.
+_FAILURE_TAIL_LINES = 5
+
+
+def _arg_budget() -> int:
+    """Return a conservative byte budget for one command line."""
+
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        arg_max = 32_767
+    # Leave half of ARG_MAX for the environment block and the command itself.
+    return max(arg_max // 2, 4096)
+
+
+def _normalize(path: str) -> str:
+    """Normalize a path the way lint tools typically print it (relative to the CWD)."""
+
+    if os.path.isabs(path):
+        try:
+            path = os.path.relpath(path)
+        except ValueError:
+            pass
+    return os.path.normpath(path)
+
+
+def _attribute_output(output: str, files: Sequence[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Split lint output into per-file blocks.
+
+    A block starts at a line that begins with a known file location and runs
+    until the next such line, a blank line, or a line that does not continue
+    the finding (see ``_CONTINUATION``). Blocks that do not start with a
+    location are attributed to the first known location they mention (for
+    example ``--> path:1:2`` pointers). Everything else is returned as
+    unattributed lines, such as ``Found 3 errors.`` summaries.
+    """
+
+    known = {_normalize(f): f for f in files}
+    per_file: Dict[str, List[str]] = {}
+    unattributed: List[str] = []
+    block: List[str] = []
+    owner: Optional[str] = None
+
+    def _flush() -> None:
+        nonlocal block, owner
+        if block:
+            if owner is None:
+                unattributed.extend(line for line in block if line.strip())
+            else:
+                per_file.setdefault(owner, []).extend(block)
+        block, owner = [], None
+
+    for line in output.splitlines():
+        if not line.strip():
+            if owner is not None:
+                block.append(line)
+            _flush()
+            continue
+        match = _LOCATION.match(line)
+        if match and _normalize(match.group(1)) in known:
+            _flush()
+            owner = known[_normalize(match.group(1))]
+        elif owner is not None and not _CONTINUATION.match(line):
+            _flush()
+        if owner is None:
+            for candidate in _LOCATION.finditer(line):
+                owner = known.get(_normalize(candidate.group(1)))
+                if owner is not None:
+                    break
+        block.append(line)
+    _flush()
+    return per_file, unattributed
+
+
+def _force_exclude(command: Sequence[str]) -> Sequence[str]:
+    """Make ruff honour its ``exclude`` settings for files named on the command line.
+
+    Expanded and sharded runs pass every file explicitly, and ruff lints
+    explicitly named files even when its configuration excludes them.
+    """
+
+    if command and Path(command[0]).name.startswith("ruff") and "--force-exclude" not in command:
+        return (*command, "--force-exclude")
+    return command
+
+
+def _count_findings(text: str) -> int:
+    """Count findings in attributed output: lines that start with, or point to (``--> path:1:2``), a location."""
+
+    return sum(1 for line in text.splitlines() if _LOCATION.match(line.lstrip(" ->")))
+
+
+@dataclass
+class _MergedLint:
+    """Lint outcomes gathered from one or more batches."""
+
+    results: Dict[str, CachedLint] = field(default_factory=dict)
+    returncode: int = 0
+    notes: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    timed_out: bool = False
+
+
+@dataclass
+class LintPlan:
+    """The files of one lint run and the batches still to be linted (see :meth:`LintTester.plan`).
+
+    Attributes:
+        files: Every lintable file, in report order.
+        batches: Balanced, command-line-sized batches of the files the cache did not answer.
+        keys: Cache key per readable file (empty without a cache).
+        hits: Cached results found for those keys.
+    """
+
+    files: List[str]
+    batches: List[List[str]]
+    keys: Dict[str, str] = field(default_factory=dict)
+    hits: Dict[str, CachedLint] = field(default_factory=dict)
 
 
 class LintTester(BaseAgent):
     """Run linting and static analysis within a strict time budget."""
 
     DEFAULT_COMMAND: Sequence[str] = ("ruff", "check")
+    # The file types ``ruff check`` lints by default.
+    LINT_SUFFIXES: Sequence[str] = (".py", ".pyi", ".ipynb")
 
-    def __init__(self, command: Sequence[str] | None = None):
+    def __init__(
+        self,
+        command: Sequence[str] | None = None,
+        cache: LintCache | None = None,
+        workers: int | None = None,
+    ):
         super().__init__(config=AGENTS["lint_tester"])
-        self.command: Sequence[str] = command or self.DEFAULT_COMMAND
+        self.command: Sequence[str] = _force_exclude(command or self.DEFAULT_COMMAND)
+        self.cache: Optional[LintCache] = cache
+        self.workers: int = max(1, min(workers or 1, os.cpu_count() or 1))
+        self._tool_version: Optional[str] = None
 
     def run(self, paths: Iterable[str | Path]) -> str:
         """Execute linting against the provided paths.
 
+        When a :class:`LintCache` is configured, directories are expanded to
+        lintable files, only changed or unseen files are sent to the lint
+        command, and findings for the rest are replayed from the cache. Files
+        are keyed by content, command, tool version, and the lint
+        configuration files that apply to them. The report lists findings per
+        file in path order followed by the lines no file owns (summaries,
+        warnings); a fully warm run replays those from the previous run over
+        the same files, so warm and cold runs produce the same text.
+
+        With ``workers`` above one, files are split into shards balanced by
+        count and size and linted by concurrent subprocesses (capped to the
+        machine's core count). Command lines are always kept under the
+        platform's ``ARG_MAX`` limit by chunking large shards.
+
         Args:
             paths: Files or directories to lint.
 
@@ -32,19 +193,289 @@ class LintTester(BaseAgent):
         path_args: List[str] = [str(Path(p)) for p in paths]
         if not path_args:
             raise ValueError("No paths provided for linting.")
+        self.observe("input_paths", len(path_args))
 
         def _operation() -> str:
-            completed = subprocess.run(
-                [*self.command, *path_args],
-                check=False,
-                capture_output=True,
-                text=True,
-                timeout=self.config.time_limit_minutes * 60,
-            )
-            output = completed.stdout + completed.stderr
-            if completed.returncode != 0:
-                return f"Linting completed with issues (exit {completed.returncode}):\n{output}"
-            return f"Linting succeeded:\n{output}"
+            if self.cache is None and self.workers == 1 and self._fits(path_args):
+                result = self.lint_batch(path_args)
+                return self._format(result.returncode, result.output, timed_out=result.timed_out)
+            plan = self.plan(path_args)
+            return self._finish(plan, self._lint_batches(plan.batches))
 
         report = self.run_with_deadline(minutes=None, operation=_operation)
         return self.deliver(report, context=["lint", "static analysis"])
+
+    def iter_findings(self, paths: Iterable[str | Path]) -> Iterator[Finding]:
+        """Lint ``paths`` and yield each finding as the lint command prints it.
+
+        Unlike :meth:`run`, output is never collected into a report: batches
+        run one after another and their output is parsed line by line, so
+        memory stays flat however many findings there are. Lines that are not
+        ``path:line:col:`` findings (code frames, summaries) are skipped.
+
+        Failures are findings too: a batch that exits non-zero without
+        reporting any finding (a crash or bad configuration) yields a
+        ``lint-failed`` error carrying the tail of its output, and hitting the
+        deadline yields a ``lint-truncated`` error and stops.
+        """
+
+        path_args: List[str] = [str(Path(p)) for p in paths]
+        if not path_args:
+            raise ValueError("No paths provided for linting.")
+        deadline = self.active_deadline()
+        batches = [path_args] if self._fits(path_args) else self._plan_batches(self._expand(path_args))
+        for index, batch in enumerate(batches):
+            tail: Deque[str] = deque(maxlen=_FAILURE_TAIL_LINES)
+            returncode, found = yield from self._batch_findings(batch, deadline, tail)
+            if deadline.expired():
+                unfinished = sum(len(rest) for rest in batches[index:])
+                message = (
+                    f"Linting truncated at the {self.budget_minutes():g}-minute deadline; "
+                    f"{unfinished} of {sum(map(len, batches))} path(s) were not fully linted."
+                )
+                yield Finding(self.config.name, "lint-truncated", message, ERROR)
+                return
+            if returncode != 0 and not found:
+                detail = " | ".join(tail) or "no output"
+                message = f"Lint command exited with status {returncode} without reporting findings: {detail}"
+                yield Finding(self.config.name, "lint-failed", message, ERROR)
+
+    def _batch_findings(
+        self, batch: Sequence[str], deadline: Deadline, tail: Deque[str]
+    ) -> Generator[Finding, None, Tuple[int, int]]:
+        """Yield one batch's findings; returns ``(exit status, findings yielded)``.
+
+        Non-finding output lines are kept in ``tail`` to explain a failed run.
+        """
+
+        lines = iter_lines([*self.command, *batch], deadline)
+        found = 0
+        try:
+            while True:
+                try:
+                    line = next(lines)
+                except StopIteration as stop:
+                    return stop.value, found
+                match = _FINDING.match(line)
+                if match is None:
+                    if line.strip():
+                        tail.append(line.strip())
+                    continue
+                path, row, column, rule, message = match.groups()
+                found += 1
+                yield Finding(self.config.name, rule or "lint", message, WARNING, path, int(row), int(column))
+        finally:
+            lines.close()
+
+    def _format(self, returncode: int, output: str, timed_out: bool = False) -> str:
+        if timed_out:
+            return (
+                f"Linting truncated at the {self.budget_minutes():g}-minute deadline; "
+                f"partial output:\n{output}"
+            )
+        if returncode != 0:
+            return f"Linting completed with issues (exit {returncode}):\n{output}"
+        return f"Linting succeeded:\n{output}"
+
+    def plan(self, paths: Iterable[str | Path], shards: Optional[int] = None) -> LintPlan:
+        """Expand ``paths`` and split the files the cache cannot answer into batches.
+
+        Together with :meth:`lint_batch` and :meth:`report` this lets callers
+        such as :mod:`agents.work_queue` run the batches elsewhere and still
+        produce the report :meth:`run` would.
+
+        Args:
+            paths: Files or directories to lint.
+            shards: Number of balanced shards (defaults to ``workers``); shards
+                are further chunked to respect the command-line limit.
+        """
+
+        path_args: List[str] = [str(Path(p)) for p in paths]
+        if not path_args:
+            raise ValueError("No paths provided for linting.")
+        files = self._expand(path_args)
+        plan = LintPlan(files=files, batches=[])
+        pending = files
+        if self.cache is not None:
+            plan.keys, plan.hits = self._cache_lookup(self.cache, files)
+            pending = [f for f in files if plan.keys.get(f) not in plan.hits]
+        plan.batches = self._plan_batches(pending, shards) if pending else []
+        return plan
+
+    def report(self, plan: LintPlan, outcomes: Sequence[ProcessResult]) -> str:
+        """Merge the outcomes of ``plan.batches`` (in order) with its cache hits and deliver the report."""
+
+        return self.deliver(self._finish(plan, outcomes), context=["lint", "static analysis"])
+
+    def _finish(self, plan: LintPlan, outcomes: Sequence[ProcessResult]) -> str:
+        merged = self._merge(plan.batches, outcomes)
+        if self.cache is not None:
+            merged = self._cache_merge(self.cache, plan.files, plan.keys, plan.hits, merged)
+        return self._render(plan.files, merged)
+
+    def lint_batch(self, path_args: Sequence[str], deadline: Optional[Deadline] = None) -> ProcessResult:
+        """Run the lint command once under ``deadline`` (the active deadline by default)."""
+
+        return self.run_command([*self.command, *path_args], deadline)
+
+    def tool_version(self) -> str:
+        """Return the lint tool's version string, resolved once per agent."""
+
+        if self._tool_version is None:
+            try:
+                completed = subprocess.run(
+                    [self.command[0], "--version"], check=False, capture_output=True, text=True, timeout=60
+                )
+                self._tool_version = (completed.stdout or completed.stderr).strip() or "unknown"
+            except (OSError, subprocess.SubprocessError):
+                self._tool_version = "unknown"
+        return self._tool_version
+
+    def _expand(self, path_args: Sequence[str]) -> List[str]:
+        """Expand directories into the lintable files they contain."""
+
+        files: set[str] = set()
+        for arg in path_args:
+            if not os.path.isdir(arg):
+                files.add(arg)
+                continue
+            for root, dirnames, filenames in os.walk(arg):
+                dirnames[:] = prune_dirs(dirnames)
+                files.update(
+                    os.path.join(root, name) for name in filenames if name.endswith(tuple(self.LINT_SUFFIXES))
+                )
+        return sorted(files, key=_normalize)
+
+    def _fits(self, path_args: Sequence[str]) -> bool:
+        return sum(len(arg.encode()) + 9 for arg in [*self.command, *path_args]) <= _arg_budget()
+
+    def _plan_batches(self, files: Sequence[str], shards: Optional[int] = None) -> List[List[str]]:
+        """Split files into balanced shards (``workers`` by default), chunked to respect the command-line limit."""
+
+        shard_count = max(1, min(shards or self.workers, len(files)))
+        planned: List[List[str]] = [[] for _ in range(shard_count)]
+        heap = [(0, index) for index in range(shard_count)]
+        weights = {f: (os.path.getsize(f) if os.path.isfile(f) else 0) + _FILE_WEIGHT for f in files}
+        # Longest-processing-time-first: place the heaviest files on the lightest shard.
+        for path in sorted(files, key=lambda f: (-weights[f], _normalize(f))):
+            load, index = heapq.heappop(heap)
+            planned[index].append(path)
+            heapq.heappush(heap, (load + weights[path], index))
+
+        budget = _arg_budget() - sum(len(arg.encode()) + 9 for arg in self.command)
+        batches: List[List[str]] = []
+        for shard in planned:
+            batch: List[str] = []
+            used = 0
+            for path in sorted(shard, key=_normalize):
+                cost = len(path.encode()) + 9  # terminating NUL plus the argv pointer
+                if batch and used + cost > budget:
+                    batches.append(batch)
+                    batch, used = [], 0
+                batch.append(path)
+                used += cost
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def _lint_batches(self, batches: Sequence[Sequence[str]]) -> List[ProcessResult]:
+        """Lint batches concurrently (up to ``workers`` at a time) under the active deadline."""
+
+        if not batches:
+            return []
+        deadline = self.active_deadline()
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+            return list(pool.map(lambda batch: self.lint_batch(batch, deadline), batches))
+
+    @staticmethod
+    def _merge(batches: Sequence[Sequence[str]], outcomes: Iterable[ProcessResult]) -> _MergedLint:
+        """Attribute each batch's output to its files and combine the outcomes.
+
+        Files from batches that failed without any attributable findings (for
+        example, a crashed tool) or that were cut off by the deadline get no
+        per-file result; their output is kept in ``errors`` instead. Lines no
+        file owns are kept in ``notes``, once each across batches, so a tool
+        warning printed by every shard appears once, as in an unsharded run.
+        """
+
+        merged = _MergedLint()
+        for batch, outcome in zip(batches, outcomes):
+            merged.returncode = max(merged.returncode, outcome.returncode)
+            per_file, unattributed = _attribute_output(outcome.output, batch)
+            if outcome.timed_out:
+                merged.timed_out = True
+                merged.errors.extend(line for path in batch for line in per_file.get(path, []))
+                merged.errors.extend(unattributed)
+                continue
+            if outcome.returncode != 0 and not per_file:
+                merged.errors.extend(unattributed)
+                continue
+            seen = set(merged.notes)
+            merged.notes.extend(line for line in unattributed if line not in seen)
+            for path in batch:
+                findings = per_file.get(path)
+                merged.results[path] = CachedLint(
+                    returncode=outcome.returncode if findings else 0, findings="\n".join(findings or [])
+                )
+        return merged
+
+    def _render(self, files: Sequence[str], merged: _MergedLint) -> str:
+        """Render merged results deterministically in file order."""
+
+        results = merged.results
+        sections = [results[f].findings for f in files if f in results and results[f].findings]
+        self.observe("input_files", len(files))
+        self.observe("findings", sum(_count_findings(section) for section in sections))
+        sections.extend(merged.notes)
+        sections.extend(merged.errors)
+        output = "\n".join(sections) + "\n" if sections else ""
+        return self._format(merged.returncode, output, timed_out=merged.timed_out)
+
+    def _cache_lookup(self, cache: LintCache, files: Sequence[str]) -> Tuple[Dict[str, str], Dict[str, CachedLint]]:
+        """Return each file's cache key and the cached results found for them.
+
+        Files that cannot be read (deleted since they were listed) get no key,
+        so they are always sent to the lint command. The run's notes are
+        looked up too when every file has a key.
+        """
+
+        version = self.tool_version()
+        configs: Dict[str, str] = {}
+        keys: Dict[str, str] = {}
+        for path in files:
+            try:
+                content_hash = hash_file(path)
+            except OSError:
+                continue
+            config_hash = hash_configs(os.path.dirname(os.path.abspath(path)), configs)
+            keys[path] = cache.make_key(_normalize(path), content_hash, self.command, version, config_hash)
+        wanted = list(keys.values())
+        if len(keys) == len(files):
+            wanted.append(cache.make_run_key(wanted))
+        return keys, cache.lookup(wanted)
+
+    @staticmethod
+    def _cache_merge(
+        cache: LintCache,
+        files: Sequence[str],
+        keys: Mapping[str, str],
+        hits: Mapping[str, CachedLint],
+        merged: _MergedLint,
+    ) -> _MergedLint:
+        """Store fresh results and fold the cache hits back in.
+
+        A fully warm run replays the notes stored by the last run over the
+        same files; any other complete run stores its notes for the next one.
+        """
+
+        fresh = {keys[f]: entry for f, entry in merged.results.items() if f in keys}
+        run_key = cache.make_run_key(keys[f] for f in files) if all(f in keys for f in files) else None
+        if run_key is not None and all(keys[f] in hits for f in files):
+            if run_key in hits:
+                merged.notes = hits[run_key].findings.splitlines()
+        elif run_key is not None and not merged.timed_out and not merged.errors:
+            fresh[run_key] = CachedLint(returncode=0, findings="\n".join(merged.notes))
+        cache.store(fresh)
+        merged.results.update({f: hits[keys[f]] for f in files if keys.get(f) in hits})
+        merged.returncode = max([merged.returncode, *(entry.returncode for entry in merged.results.values())])
+        return merged
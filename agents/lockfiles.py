@@ -0,0 +1,201 @@
+"""Streaming parsers that turn dependency manifests into ``DependencySpec`` records.
+
+Every parser is a generator: text formats are read line by line and JSON
+lockfiles are memory-mapped and tokenized in place, so peak memory stays
+bounded no matter how large the lockfile is.
+
+Supported formats:
+
+- ``requirements*.txt`` / ``*.in`` (pinned ``==`` requirements only)
+- ``poetry.lock``
+- ``Pipfile.lock``
+- ``package-lock.json`` / ``npm-shrinkwrap.json``
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+JSONScalar = Union[str, int, float, bool, None]
+
+
+@dataclass
+class DependencySpec:
+    name: str
+    version: str
+    source: str
+
+
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;#,]+)")
+_TOML_STRING = re.compile(r'^\s*(name|version)\s*=\s*"([^"]*)"')
+_JSON_TOKEN = re.compile(rb'([{}\[\],:])|"([^"\\]*(?:\\.[^"\\]*)*)"|(-?[0-9][^\s{}\[\],:]*|true|false|null)')
+_LITERALS: Dict[bytes, JSONScalar] = {b"true": True, b"false": False, b"null": None}
+
+
+@lru_cache(maxsize=1 << 16)
+def canonical_name(name: str) -> str:
+    """Normalize a package name (PEP 503) so manifests compare consistently."""
+
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def iter_requirements(path: str | Path) -> Iterator[DependencySpec]:
+    """Yield pinned requirements from a pip requirements file."""
+
+    source = str(path)
+    with open(path, encoding="utf-8") as handle:
+        pending = ""
+        for raw in handle:
+            line = pending + raw.rstrip("\n")
+            if line.endswith("\\"):
+                pending = line[:-1]
+                continue
+            pending = ""
+            match = _REQUIREMENT.match(line)
+            if match:
+                yield DependencySpec(name=canonical_name(match.group(1)), version=match.group(2), source=source)
+
+
+def iter_poetry_lock(path: str | Path) -> Iterator[DependencySpec]:
+    """Yield locked packages from a ``poetry.lock`` file."""
+
+    source = str(path)
+    name = version = None
+    in_package = False
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            stripped = line.strip()
+            if stripped.startswith("["):
+                if in_package and name and version:
+                    yield DependencySpec(name=canonical_name(name), version=version, source=source)
+                in_package = stripped == "[[package]]"
+                name = version = None
+                continue
+            if in_package:
+                match = _TOML_STRING.match(line)
+                if match:
+                    if match.group(1) == "name":
+                        name = match.group(2)
+                    else:
+                        version = match.group(2)
+        if in_package and name and version:
+            yield DependencySpec(name=canonical_name(name), version=version, source=source)
+
+
+def iter_json_scalars(path: str | Path) -> Iterator[Tuple[Tuple[Union[str, int], ...], JSONScalar]]:
+    """Yield ``(key_path, value)`` for every scalar in a JSON document.
+
+    The file is memory-mapped and tokenized in place; only the current key path
+    is held in memory.
+    """
+
+    with open(path, "rb") as handle:
+        try:
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with data:
+            # Parallel stacks: the key (or array index) at each depth, and
+            # whether that container is an object.
+            keys: List[Union[str, int, None]] = []
+            is_object: List[bool] = []
+            expecting_key = False
+            for match in _JSON_TOKEN.finditer(data):
+                punct, string, literal = match.groups()
+                if punct:
+                    if punct == b"{" or punct == b"[":
+                        if is_object and not is_object[-1]:
+                            keys[-1] += 1
+                        opened_object = punct == b"{"
+                        keys.append(None if opened_object else -1)
+                        is_object.append(opened_object)
+                        expecting_key = opened_object
+                    elif punct == b"}" or punct == b"]":
+                        keys.pop()
+                        is_object.pop()
+                        expecting_key = False
+                    elif punct == b",":
+                        expecting_key = bool(is_object) and is_object[-1]
+                    continue
+                value: JSONScalar
+                if literal:
+                    value = _LITERALS[literal] if literal in _LITERALS else json.loads(literal)
+                else:
+                    value = string.decode("utf-8") if b"\\" not in string else json.loads(b'"' + string + b'"')
+                    if expecting_key:
+                        keys[-1] = value
+                        expecting_key = False
+                        continue
+                if is_object and not is_object[-1]:
+                    keys[-1] += 1
+                yield tuple(keys), value
+
+
+def iter_pipfile_lock(path: str | Path) -> Iterator[DependencySpec]:
+    """Yield locked packages from a ``Pipfile.lock`` file."""
+
+    source = str(path)
+    for key_path, value in iter_json_scalars(path):
+        if len(key_path) == 3 and key_path[0] in ("default", "develop") and key_path[2] == "version":
+            if isinstance(value, str):
+                yield DependencySpec(name=canonical_name(str(key_path[1])), version=value.lstrip("="), source=source)
+
+
+def iter_package_lock(path: str | Path) -> Iterator[DependencySpec]:
+    """Yield installed packages from an npm ``package-lock.json`` (v1-v3)."""
+
+    source = str(path)
+    for key_path, value in iter_json_scalars(path):
+        if not key_path or key_path[-1] != "version" or not isinstance(value, str):
+            continue
+        if len(key_path) == 3 and key_path[0] == "packages":
+            location = str(key_path[1])
+            if not location:
+                continue  # the root project itself
+            name = location.rpartition("node_modules/")[2]
+            yield DependencySpec(name=name, version=value, source=source)
+        elif len(key_path) >= 3 and key_path[0] == "dependencies" and len(key_path) % 2 == 1:
+            if all(part == "dependencies" for part in key_path[0:-1:2]):
+                yield DependencySpec(name=str(key_path[-2]), version=value, source=source)
+
+
+_PARSERS: Dict[str, Callable[[Path], Iterator[DependencySpec]]] = {
+    "poetry.lock": iter_poetry_lock,
+    "Pipfile.lock": iter_pipfile_lock,
+    "package-lock.json": iter_package_lock,
+    "npm-shrinkwrap.json": iter_package_lock,
+}
+
+
+_NPM_LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json")
+
+
+def ecosystem(path: str | Path) -> str:
+    """Return the package ecosystem (``"npm"`` or ``"pypi"``) a manifest's names belong to."""
+
+    return "npm" if Path(path).name in _NPM_LOCKFILES else "pypi"
+
+
+def iter_lockfile(path: str | Path) -> Iterator[DependencySpec]:
+    """Dispatch to the streaming parser matching the file name."""
+
+    path = Path(path)
+    parser = _PARSERS.get(path.name)
+    if parser is None and (path.name.startswith("requirements") or path.suffix in (".txt", ".in")):
+        parser = iter_requirements
+    if parser is None:
+        raise ValueError(f"Unsupported manifest format: {path}")
+    return parser(path)
+
+
+def iter_specs(paths: Iterable[str | Path]) -> Iterator[DependencySpec]:
+    """Lazily chain the specs from several manifests."""
+
+    for path in paths:
+        yield from iter_lockfile(path)
@@ -0,0 +1,257 @@
+"""Low-overhead histograms and trace spans for the agent suite.
+
+Instrumentation is off by default. While :attr:`Metrics.enabled` is False,
+:meth:`Metrics.observe` returns immediately and :meth:`Metrics.span` hands back
+a shared no-op context manager, so the hooks built into :class:`BaseAgent` and
+:func:`~agents.process.run_streaming` cost one attribute check.
+
+Once enabled (``METRICS.enable()``), observations land in fixed-bucket
+histograms keyed by metric name and labels. Finished spans are kept in a
+bounded ring. Histograms export as a Prometheus text file and spans as JSON.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .storage import atomic_write_text
+
+# Seconds, from 1ms up to the longest agent time budgets.
+LATENCY_BUCKETS: Sequence[float] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0,
+)
+# Counts of files, findings, characters, ...
+SIZE_BUCKETS: Sequence[float] = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000, 100000, 1000000)
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    __slots__ = ("buckets", "counts", "count", "total")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # One slot per bucket plus the implicit +Inf bucket.
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self) -> List[int]:
+        return list(itertools.accumulate(self.counts))
+
+
+@dataclass
+class Span:
+    """One finished, timed operation.
+
+    Attributes:
+        name: Operation name, e.g. ``"agent.operation"``.
+        start: Wall-clock start time (seconds since the epoch).
+        duration: Elapsed monotonic seconds.
+        span_id: Identifier unique within the process.
+        parent_id: The enclosing span, if any.
+        attributes: Labels and extra details recorded with the span.
+    """
+
+    name: str
+    start: float
+    duration: float
+    span_id: int
+    parent_id: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class _NullSpan:
+    """Shared no-op stand-in returned by :meth:`Metrics.span` while disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set(self, **attributes: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("agent_span", default=None)
+
+
+class _ActiveSpan:
+    __slots__ = ("_metrics", "_name", "_metric", "_labels", "_attributes", "_span_id", "_parent", "_token",
+                 "_wall", "_started")
+
+    def __init__(self, metrics: "Metrics", name: str, metric: Optional[str], labels: Dict[str, str]):
+        self._metrics = metrics
+        self._name = name
+        self._metric = metric
+        self._labels = labels
+        self._attributes: Dict[str, Any] = {}
+
+    def set(self, **attributes: Any) -> None:
+        """Attach extra attributes (e.g. an outcome) before the span closes."""
+
+        self._attributes.update(attributes)
+
+    def __enter__(self) -> "_ActiveSpan":
+        self._span_id = next(self._metrics._span_ids)
+        self._parent = _current_span.get()
+        self._token = _current_span.set(self._span_id)
+        self._wall = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self._attributes.setdefault("error", exc_type.__name__)
+        metrics = self._metrics
+        if self._metric is not None:
+            metrics.observe(self._metric, duration, **self._labels)
+        attributes = {**self._labels, **self._attributes}
+        metrics._record(Span(self._name, self._wall, duration, self._span_id, self._parent, attributes))
+
+
+class Metrics:
+    """Registry of histograms and recent spans.
+
+    Args:
+        enabled: Start collecting immediately.
+        max_spans: Finished spans kept for export; older ones are dropped.
+        prefix: Prepended to every exported metric name.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 10000, prefix: str = "agents_"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._histograms: Dict[Tuple[str, _Labels], Histogram] = {}
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._span_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop every recorded observation and span."""
+
+        with self._lock:
+            self._histograms.clear()
+            self._spans.clear()
+
+    def observe(self, metric: str, value: float, buckets: Optional[Sequence[float]] = None, **labels: Any) -> None:
+        """Record ``value`` in the histogram for ``metric`` and ``labels``.
+
+        Metrics ending in ``_seconds`` default to :data:`LATENCY_BUCKETS`,
+        everything else to :data:`SIZE_BUCKETS`.
+        """
+
+        if not self.enabled:
+            return
+        key = (metric, tuple(sorted((name, str(value)) for name, value in labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                if buckets is None:
+                    buckets = LATENCY_BUCKETS if metric.endswith("_seconds") else SIZE_BUCKETS
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def span(self, name: str, metric: Optional[str] = None, **labels: Any) -> Any:
+        """Time a block as a trace span, also observing ``metric`` when given.
+
+        Spans opened inside another span (in the same thread or a copied
+        :mod:`contextvars` context) record it as their parent.
+        """
+
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, metric, {key: str(value) for key, value in labels.items()})
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def histograms(self) -> Dict[Tuple[str, _Labels], Histogram]:
+        with self._lock:
+            return dict(self._histograms)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def render_prometheus(self) -> str:
+        """Render every histogram in the Prometheus text exposition format."""
+
+        by_metric: Dict[str, List[Tuple[_Labels, Histogram]]] = {}
+        with self._lock:
+            for (metric, labels), histogram in sorted(self._histograms.items()):
+                by_metric.setdefault(metric, []).append((labels, histogram))
+            lines: List[str] = []
+            for metric, series in by_metric.items():
+                name = self.prefix + metric
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in series:
+                    cumulative = histogram.cumulative()
+                    for bound, count in zip((*histogram.buckets, "+Inf"), cumulative):
+                        le = bound if isinstance(bound, str) else _format_number(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(histogram.total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: str | Path) -> Path:
+        """Atomically write :meth:`render_prometheus` (for node_exporter's textfile collector)."""
+
+        return _write_atomic(Path(path), self.render_prometheus())
+
+    def write_trace(self, path: str | Path) -> Path:
+        """Atomically write the recorded spans as a JSON array."""
+
+        payload = [asdict(span) for span in self.spans()]
+        return _write_atomic(Path(path), json.dumps(payload, separators=(",", ":")))
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _format_labels(labels: _Labels, *extra: Tuple[str, str]) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _write_atomic(path: Path, text: str) -> Path:
+    atomic_write_text(path, text)
+    return path
+
+
+METRICS = Metrics()
+"""Process-wide registry used by the built-in agent hooks."""
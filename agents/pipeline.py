@@ -0,0 +1,439 @@
+"""DAG-scheduled agent pipeline with fail-fast gates and tree-hash result caching.
+
+A :class:`Pipeline` runs :class:`Stage` objects, one per agent in the
+``AGENTS`` registry, as a dependency graph. Stages whose dependencies have
+passed run concurrently, each within its agent's ``time_limit_minutes``. When
+a blocking stage fails, every stage downstream of it is cancelled before it
+starts, while independent branches keep running.
+
+Each stage lists the repository paths it reads. Before scheduling, the
+working tree (including uncommitted and untracked files) is snapshotted into a
+git tree object, once per run, so every input path has a content hash. A
+stage whose inputs hash the same as on a previous passing run is answered from
+the cache without running. An incremental CI run therefore only pays for the
+stages whose subtrees changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .config import AGENTS
+from .storage import load_json_cache, save_json_cache
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+
+# Mirrors the README workflow: lint, dependency, SOC II and sentinel checks are
+# independent gates; docs publish only after lint and the sentinel pass; the
+# TDD gate (which may run the test suite) waits for lint.
+DEFAULT_NEEDS: Mapping[str, Tuple[str, ...]] = {
+    "lint_tester": (),
+    "dependency_steward": (),
+    "socii_guardian": (),
+    "hallucination_sentinel": (),
+    "api_docsmith": ("lint_tester", "hallucination_sentinel"),
+    "tdd_enforcer": ("lint_tester",),
+}
+
+# Report fragments that mean an agent's gate failed.
+FAILURE_MARKERS: Mapping[str, Tuple[str, ...]] = {
+    "lint_tester": ("Linting completed with issues", "Linting truncated"),
+    "socii_guardian": (
+        "Security review findings:", "SOC II control gaps detected:", "Scan truncated", "Port policy findings across",
+    ),
+    "dependency_steward": (
+        "Version drift detected:", "Version drift introduced:", "Version drift changed:",
+        "Insecure dependencies found:",
+    ),
+    "hallucination_sentinel": ("Claims lacking evidence:", "Response blocked"),
+    "api_docsmith": (),
+    "tdd_enforcer": ("Add or update tests at likely locations:", "Fast-feedback tests failed",
+                     "Fast-feedback tests truncated"),
+}
+# Written by ``BaseAgent.run_with_deadline`` when an agent's own budget expires.
+_BUDGET_EXCEEDED = "-minute budget (stopped after"
+_CACHE_VERSION = 1
+_MISSING = "missing"
+# How often to check for queued stages starting, so their budgets are enforced from their actual start.
+_START_POLL_SECONDS = 0.05
+
+
+def report_passed(key: str, report: str) -> bool:
+    """Default gate: the report contains none of the agent's failure markers."""
+
+    if _BUDGET_EXCEEDED in report:
+        return False
+    return not any(marker in report for marker in FAILURE_MARKERS.get(key, ()))
+
+
+@dataclass
+class Stage:
+    """One agent run within a pipeline.
+
+    Attributes:
+        key: Stage name, normally an ``AGENTS`` key (which supplies the budget).
+        run: Produces the stage's report, e.g. ``lambda: LintTester().run(["src"])``.
+        needs: Stages that must pass before this one starts.
+        inputs: Repository paths the stage reads. Results are cached by their
+            git tree hashes; with no inputs the stage always runs.
+        blocking: Whether a failure cancels the stages downstream.
+        passed: Gate predicate over the report; defaults to :func:`report_passed`.
+        time_limit_minutes: Budget override; defaults to the agent's config.
+        salt: Extra cache-key material, e.g. a tool version or option string.
+    """
+
+    key: str
+    run: Callable[[], str]
+    needs: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = ()
+    blocking: bool = True
+    passed: Optional[Callable[[str], bool]] = None
+    time_limit_minutes: Optional[float] = None
+    salt: str = ""
+
+    def budget_seconds(self) -> float:
+        minutes = self.time_limit_minutes
+        if minutes is None:
+            config = AGENTS.get(self.key)
+            if config is None:
+                raise ValueError(f"Stage {self.key!r} is not in AGENTS; set time_limit_minutes explicitly.")
+            minutes = config.time_limit_minutes
+        return minutes * 60
+
+    def gate(self, report: str) -> bool:
+        return self.passed(report) if self.passed is not None else report_passed(self.key, report)
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage.
+
+    Attributes:
+        key: Stage name.
+        status: ``passed``, ``failed``, ``error``, ``timed_out``, or ``cancelled``.
+        report: The stage's report, error text, or cancellation reason.
+        seconds: Wall time spent running (0 for cached or cancelled stages).
+        cached: True when the result was replayed from the tree-hash cache.
+    """
+
+    key: str
+    status: str
+    report: str
+    seconds: float = 0.0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == PASSED
+
+
+@dataclass
+class PipelineResult:
+    """Results in topological order, plus the total wall time."""
+
+    results: Dict[str, StageResult] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return all(result.ok for result in self.results.values())
+
+    def render(self) -> str:
+        lines = [f"Pipeline {'passed' if self.passed else 'failed'} in {self.seconds:.1f}s:"]
+        for result in self.results.values():
+            if result.status == CANCELLED:
+                lines.append(f"- {result.key}: {result.status}")
+                continue
+            detail = "cached" if result.cached else f"{result.seconds:.1f}s"
+            lines.append(f"- {result.key}: {result.status} ({detail})")
+        for result in self.results.values():
+            if not result.ok:
+                lines.append(f"\n[{result.key}] {result.report}")
+        return "\n".join(lines)
+
+
+class GitTreeHasher:
+    """Content hashes for repository paths, taken from one working-tree snapshot.
+
+    The snapshot stages the working tree (tracked, modified, and untracked
+    but not ignored files) into a throwaway copy of the index and writes it as
+    a tree object, leaving the real index and ``HEAD`` untouched.
+    """
+
+    def __init__(self, repo: str | Path = "."):
+        self.repo = Path(repo)
+        self._tree: Optional[str] = None
+        self._prefix: Optional[str] = None
+        self._hashes: Dict[str, str] = {}
+
+    def _git(self, *args: str, env: Optional[Dict[str, str]] = None, stdin: Optional[str] = None) -> str:
+        completed = subprocess.run(
+            ["git", *args], cwd=self.repo, env=env, input=stdin, capture_output=True, text=True, check=True
+        )
+        return completed.stdout
+
+    def snapshot(self) -> str:
+        """Return the tree id of the current working tree."""
+
+        if self._tree is None:
+            git_dir = Path(self._git("rev-parse", "--absolute-git-dir").strip())
+            with tempfile.TemporaryDirectory(prefix="pipeline-index-") as scratch:
+                index = Path(scratch) / "index"
+                if (git_dir / "index").exists():
+                    # Starting from the real index lets git reuse its cached stat data.
+                    shutil.copyfile(git_dir / "index", index)
+                env = {**os.environ, "GIT_INDEX_FILE": str(index)}
+                self._git("add", "--all", "--", ".", env=env)
+                self._tree = self._git("write-tree", env=env).strip()
+        return self._tree
+
+    def prefix(self) -> str:
+        """Return ``repo`` relative to the worktree root (``""`` at the root, else ending in ``/``)."""
+
+        if self._prefix is None:
+            self._prefix = self._git("rev-parse", "--show-prefix").strip()
+        return self._prefix
+
+    def hashes(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Map each path (relative to ``repo``) to its blob/tree id in the snapshot (``"missing"`` when absent)."""
+
+        wanted = [_normalize(path) for path in paths]
+        unknown = sorted({path for path in wanted if path not in self._hashes})
+        if unknown:
+            tree = self.snapshot()
+            prefix = self.prefix()
+            # Inputs are relative to ``repo``, while tree paths are relative to the worktree root.
+            # ls-tree would list a directory's contents instead of its own entry once another input
+            # lies below it, so each path is resolved exactly with ``<tree>:<path>``.
+            rooted = [prefix.rstrip("/") if path == "." else prefix + path for path in unknown]
+            names = [f"{tree}:{path}" if path else tree for path in rooted]
+            output = self._git("cat-file", "--batch-check=%(objectname)", stdin="".join(f"{n}\n" for n in names))
+            for path, line in zip(unknown, output.splitlines()):
+                self._hashes[path] = _MISSING if line.endswith(" missing") else line.strip()
+        return {path: self._hashes[path] for path in wanted}
+
+
+def _normalize(path: str) -> str:
+    normalized = os.path.normpath(path).replace(os.sep, "/")
+    return normalized.strip("/") or "."
+
+
+class ResultCache:
+    """JSON store of passing stage results keyed by their input hashes."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        payload = load_json_cache(self.path, _CACHE_VERSION)
+        self._entries: Dict[str, Dict[str, str]] = payload.get("entries", {}) if payload is not None else {}
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(stage)
+        if entry is not None and entry.get("key") == key:
+            return entry["report"]
+        return None
+
+    def put(self, stage: str, key: str, report: str) -> None:
+        with self._lock:
+            self._entries[stage] = {"key": key, "report": report}
+
+    def save(self) -> None:
+        with self._lock:
+            save_json_cache(self.path, _CACHE_VERSION, {"entries": self._entries})
+
+
+class Pipeline:
+    """Run stages as a dependency DAG with concurrency, budgets, and caching.
+
+    Args:
+        stages: The stages to run; ``needs`` must name other stages.
+        cache_path: JSON result cache; None disables caching.
+        repo: Git repository the stage inputs are relative to.
+        max_workers: Concurrent stages; defaults to the number of stages.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        cache_path: str | Path | None = None,
+        repo: str | Path = ".",
+        max_workers: Optional[int] = None,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.key in self.stages:
+                raise ValueError(f"Duplicate stage {stage.key!r}.")
+            self.stages[stage.key] = stage
+        for stage in self.stages.values():
+            unknown = [need for need in stage.needs if need not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.key!r} needs unknown stage(s): {', '.join(unknown)}.")
+        try:
+            self.order: List[str] = list(TopologicalSorter(self._sorter_graph()).static_order())
+        except CycleError as exc:
+            raise ValueError(f"Stage dependencies form a cycle: {' -> '.join(exc.args[1])}.") from exc
+        self.cache: Optional[ResultCache] = ResultCache(cache_path) if cache_path is not None else None
+        self.hasher = GitTreeHasher(repo)
+        self.max_workers = max_workers or max(1, len(self.stages))
+
+    def _sorter_graph(self) -> Dict[str, Tuple[str, ...]]:
+        return {key: stage.needs for key, stage in self.stages.items()}
+
+    def _dependents(self, key: str) -> Set[str]:
+        """Every stage downstream of ``key``."""
+
+        children: Dict[str, List[str]] = {}
+        for stage in self.stages.values():
+            for need in stage.needs:
+                children.setdefault(need, []).append(stage.key)
+        found: Set[str] = set()
+        stack = list(children.get(key, []))
+        while stack:
+            child = stack.pop()
+            if child not in found:
+                found.add(child)
+                stack.extend(children.get(child, []))
+        return found
+
+    def _cache_key(self, stage: Stage) -> Optional[str]:
+        if self.cache is None or not stage.inputs:
+            return None
+        try:
+            hashes = self.hasher.hashes(stage.inputs)
+        except (OSError, subprocess.CalledProcessError):
+            # Not a git repository, or no git binary: run the stage uncached rather than fail the pipeline.
+            return None
+        if all(oid == _MISSING for oid in hashes.values()):
+            # Nothing the stage reads exists (a typo, or paths outside the repo): never replay it.
+            return None
+        digest = hashlib.sha256(f"{stage.key}\0{stage.salt}".encode("utf-8"))
+        for path, oid in sorted(hashes.items()):
+            digest.update(f"\0{path}\0{oid}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def run(self) -> PipelineResult:
+        """Run every stage and return their results in topological order."""
+
+        started = time.monotonic()
+        results: Dict[str, StageResult] = {}
+        sorter = TopologicalSorter(self._sorter_graph())
+        sorter.prepare()
+        # future -> (stage key, cache key)
+        running: Dict[Future, Tuple[str, Optional[str]]] = {}
+        # Stage key -> when a pool thread started it; queued stages are not charged for the wait.
+        started_at: Dict[str, float] = {}
+
+        def _timed(key: str, run: Callable[[], str]) -> str:
+            started_at[key] = time.monotonic()
+            return run()
+
+        def _finish(result: StageResult) -> None:
+            results[result.key] = result
+            stage = self.stages[result.key]
+            if not result.ok and stage.blocking:
+                for key in self._dependents(result.key):
+                    if key not in results:
+                        reason = f"Cancelled: upstream stage {result.key} {result.status}."
+                        results[key] = StageResult(key, CANCELLED, reason)
+            sorter.done(result.key)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline")
+        try:
+            while sorter.is_active():
+                # Cache hits and cancellations finish immediately and may unblock more stages.
+                ready = sorter.get_ready()
+                while ready:
+                    for key in ready:
+                        if key in results:  # cancelled by an upstream failure
+                            sorter.done(key)
+                            continue
+                        stage = self.stages[key]
+                        cache_key = self._cache_key(stage)
+                        cached = self.cache.get(key, cache_key) if cache_key is not None and self.cache else None
+                        if cached is not None:
+                            _finish(StageResult(key, PASSED, cached, cached=True))
+                            continue
+                        future = executor.submit(_timed, key, stage.run)
+                        running[future] = (key, cache_key)
+                    ready = sorter.get_ready()
+                if not running:
+                    continue
+
+                keys = [key for key, _ in running.values()]
+                expiries = [started_at[key] + self.stages[key].budget_seconds() for key in keys if key in started_at]
+                if len(expiries) < len(keys):
+                    # A submitted stage has yet to start: poll until it does, so its budget is enforced.
+                    expiries.append(time.monotonic() + _START_POLL_SECONDS)
+                done, _ = wait(list(running), timeout=max(0.0, min(expiries) - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in list(running):
+                    key, cache_key = running[future]
+                    stage = self.stages[key]
+                    elapsed = now - started_at.get(key, now)
+                    if future in done:
+                        del running[future]
+                        _finish(self._result(stage, future, elapsed, cache_key))
+                    elif elapsed >= stage.budget_seconds():
+                        # The agent keeps its own deadline; the pipeline stops waiting for it.
+                        del running[future]
+                        future.cancel()
+                        minutes = stage.budget_seconds() / 60
+                        _finish(StageResult(key, TIMED_OUT, f"Exceeded the {minutes:g}-minute stage budget.", elapsed))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.cache is not None:
+                self.cache.save()
+
+        ordered = {key: results[key] for key in self.order if key in results}
+        return PipelineResult(results=ordered, seconds=time.monotonic() - started)
+
+    def _result(self, stage: Stage, future: Future, elapsed: float, cache_key: Optional[str]) -> StageResult:
+        try:
+            report = future.result()
+        except Exception as exc:
+            return StageResult(stage.key, ERROR, f"{type(exc).__name__}: {exc}", elapsed)
+        if not stage.gate(report):
+            return StageResult(stage.key, FAILED, report, elapsed)
+        if cache_key is not None and self.cache is not None:
+            self.cache.put(stage.key, cache_key, report)
+        return StageResult(stage.key, PASSED, report, elapsed)
+
+
+def default_stages(
+    runners: Mapping[str, Callable[[], str]],
+    inputs: Optional[Mapping[str, Sequence[str]]] = None,
+    needs: Mapping[str, Tuple[str, ...]] = DEFAULT_NEEDS,
+) -> List[Stage]:
+    """Build stages for the given agents using the default workflow DAG.
+
+    Dependencies on agents without a runner are dropped, so any subset of the
+    suite can be scheduled.
+    """
+
+    inputs = inputs or {}
+    return [
+        Stage(
+            key=key,
+            run=run,
+            needs=tuple(need for need in needs.get(key, ()) if need in runners),
+            inputs=tuple(inputs.get(key, ())),
+        )
+        for key, run in runners.items()
+    ]
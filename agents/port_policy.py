@@ -0,0 +1,439 @@
+"""Compiled port/TLS policy for the SOC II Guardian.
+
+A :class:`PortPolicy` holds denied and allowed port ranges, per-environment
+TLS rules, and per-service exceptions. It is compiled into one 65536-entry
+lookup table per environment, so checking a service port is a single index
+operation. Large column-oriented inventories are audited in bulk (vectorized
+with NumPy when it is installed) and findings are aggregated per port, then
+rendered once at the end.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+try:  # optional: vectorized audits of large inventories
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+PORT_COUNT = 65536
+DEFAULT_DENIED_PORTS: Tuple[int, ...] = (80, 21, 23)
+INSECURE_PORT_MESSAGE = "port {port} is insecure; prefer TLS (443/8443) or tunneled access."
+PLAINTEXT_MESSAGE = "TLS not required; enforce TLS for confidentiality and integrity."
+
+PortRange = Union[int, str, Tuple[int, int]]
+# Column-oriented inventory: "name" and "port" are required; "tls_required"
+# and "environment" are optional.
+Inventory = Mapping[str, Sequence[Any]]
+
+_DENIED = 1
+_TLS_REQUIRED = 2
+_SET_TLS = bytes(value | _TLS_REQUIRED for value in range(256))
+_CLEAR_TLS = bytes(value & ~_TLS_REQUIRED for value in range(256))
+_VECTORIZE_MIN_ROWS = 4096
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
+
+
+def _port_range(spec: PortRange) -> Tuple[int, int]:
+    """Normalize ``80``, ``"8000-8100"`` or ``(8000, 8100)`` to an inclusive range."""
+
+    if isinstance(spec, int):
+        low = high = spec
+    elif isinstance(spec, str):
+        low_text, _, high_text = spec.partition("-")
+        low = int(low_text)
+        high = int(high_text) if high_text else low
+    else:
+        low, high = spec
+    if not 0 <= low <= high < PORT_COUNT:
+        raise ValueError(f"Invalid port range: {spec!r}")
+    return low, high
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY
+    return bool(value)
+
+
+@dataclass
+class PolicyFindings:
+    """Aggregated outcome of auditing an inventory against a :class:`PortPolicy`."""
+
+    checked: int = 0
+    waived: int = 0
+    invalid: int = 0
+    insecure: Dict[int, int] = field(default_factory=dict)
+    plaintext: Dict[int, int] = field(default_factory=dict)
+    examples: Dict[Tuple[str, int], List[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.insecure or self.plaintext or self.invalid)
+
+    def merge(self, other: "PolicyFindings", max_examples: int = 3) -> None:
+        """Fold another chunk's findings into this one."""
+
+        self.checked += other.checked
+        self.waived += other.waived
+        self.invalid += other.invalid
+        for mine, theirs in ((self.insecure, other.insecure), (self.plaintext, other.plaintext)):
+            for port, count in theirs.items():
+                mine[port] = mine.get(port, 0) + count
+        for key, names in other.examples.items():
+            kept = self.examples.setdefault(key, [])
+            kept.extend(names[: max_examples - len(kept)])
+
+    def render(self) -> str:
+        """Render the aggregated findings as a report."""
+
+        if not self:
+            return f"All {self.checked:,} service ports comply with the port policy."
+        lines: List[str] = []
+        for kind, counts in (("insecure", self.insecure), ("plaintext", self.plaintext)):
+            for port, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+                if kind == "insecure":
+                    message = INSECURE_PORT_MESSAGE.format(port=port)
+                else:
+                    message = f"port {port}: {PLAINTEXT_MESSAGE}"
+                noun = "service" if count == 1 else "services"
+                names = self.examples.get((kind, port), [])
+                sample = f", e.g. {', '.join(names)}" if names else ""
+                lines.append(f"{message[0].upper()}{message[1:-1]} ({count:,} {noun}{sample}).")
+        if self.invalid:
+            noun = "record has a port number" if self.invalid == 1 else "records have port numbers"
+            lines.append(f"{self.invalid:,} {noun} outside 0-65535.")
+        if self.waived:
+            noun = "finding was" if self.waived == 1 else "findings were"
+            lines.append(f"{self.waived:,} {noun} waived by policy exceptions.")
+        return f"Port policy findings across {self.checked:,} service ports:\n- " + "\n- ".join(lines)
+
+
+class PortPolicy:
+    """Configurable port and TLS policy compiled to per-environment lookup tables.
+
+    A port is insecure when it falls in a denied range, or when allowed ranges
+    are configured and it falls outside all of them. TLS is required
+    everywhere by default; :meth:`tls` rules override that per environment
+    and port range, with later rules taking precedence.
+
+    Args:
+        denied: Denied ports or ranges (defaults to 80, 21, and 23).
+        allowed: Optional allowlist; ports outside it are treated as insecure.
+        require_tls: Default TLS requirement for every port and environment.
+    """
+
+    def __init__(
+        self,
+        denied: Iterable[PortRange] = DEFAULT_DENIED_PORTS,
+        allowed: Optional[Iterable[PortRange]] = None,
+        require_tls: bool = True,
+    ):
+        self._denied: List[Tuple[int, int]] = [_port_range(spec) for spec in denied]
+        self._allowed: Optional[List[Tuple[int, int]]] = (
+            [_port_range(spec) for spec in allowed] if allowed is not None else None
+        )
+        # environment (None for the default) -> [(low, high, required)]
+        self._tls_rules: Dict[Optional[str], List[Tuple[int, int, bool]]] = {None: [(0, PORT_COUNT - 1, require_tls)]}
+        # service name -> waived ports (None waives every port)
+        self._exceptions: Dict[str, Optional[Set[int]]] = {}
+        self._tables: Optional[Dict[Optional[str], bytearray]] = None
+
+    @classmethod
+    def from_mapping(cls, config: Mapping[str, Any]) -> "PortPolicy":
+        """Build a policy from a plain mapping, e.g. loaded from JSON.
+
+        Example::
+
+            {
+                "denied": [80, 21, 23, "6000-6063"],
+                "allowed": ["1-1023", 8443],
+                "require_tls": true,
+                "tls": {"dev": [{"required": false, "ports": ["8000-8999"]}]},
+                "exceptions": {"legacy-sftp-gateway": [21], "debug-proxy": null}
+            }
+        """
+
+        policy = cls(
+            denied=config.get("denied", DEFAULT_DENIED_PORTS),
+            allowed=config.get("allowed"),
+            require_tls=config.get("require_tls", True),
+        )
+        for environment, rules in config.get("tls", {}).items():
+            for rule in rules if isinstance(rules, list) else [rules]:
+                if isinstance(rule, bool):
+                    rule = {"required": rule}
+                policy.tls(rule.get("required", True), environment=environment, ports=rule.get("ports"))
+        for service, ports in config.get("exceptions", {}).items():
+            policy.exempt(service, ports)
+        return policy
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PortPolicy":
+        """Load a policy from a JSON file (see :meth:`from_mapping`)."""
+
+        return cls.from_mapping(json.loads(Path(path).read_text()))
+
+    def deny(self, *ports: PortRange) -> "PortPolicy":
+        """Add denied ports or ranges; returns self."""
+
+        self._denied.extend(_port_range(spec) for spec in ports)
+        self._tables = None
+        return self
+
+    def allow(self, *ports: PortRange) -> "PortPolicy":
+        """Add allowed ports or ranges, switching the policy to allowlist mode; returns self."""
+
+        self._allowed = [*(self._allowed or []), *(_port_range(spec) for spec in ports)]
+        self._tables = None
+        return self
+
+    def tls(
+        self,
+        required: bool,
+        environment: Optional[str] = None,
+        ports: Optional[Iterable[PortRange]] = None,
+    ) -> "PortPolicy":
+        """Require (or waive) TLS for an environment and optional port ranges; returns self."""
+
+        ranges = [_port_range(spec) for spec in ports] if ports is not None else [(0, PORT_COUNT - 1)]
+        self._tls_rules.setdefault(environment, []).extend((low, high, required) for low, high in ranges)
+        self._tables = None
+        return self
+
+    def exempt(self, service: str, ports: Optional[Iterable[PortRange]] = None) -> "PortPolicy":
+        """Waive findings for a service, on specific ports or (with None) on all of them; returns self."""
+
+        if ports is None:
+            self._exceptions[service] = None
+        else:
+            waived = self._exceptions.setdefault(service, set())
+            if waived is not None:
+                for spec in ports:
+                    low, high = _port_range(spec)
+                    waived.update(range(low, high + 1))
+        return self
+
+    def compile(self) -> "PortPolicy":
+        """Build the per-environment lookup tables; returns self."""
+
+        base = bytearray(PORT_COUNT)
+        if self._allowed is not None:
+            base = bytearray(bytes([_DENIED]) * PORT_COUNT)
+            for low, high in self._allowed:
+                base[low : high + 1] = bytes(high - low + 1)
+        for low, high in self._denied:
+            base[low : high + 1] = bytes([_DENIED]) * (high - low + 1)
+
+        def _apply(table: bytearray, rules: Sequence[Tuple[int, int, bool]]) -> bytearray:
+            for low, high, required in rules:
+                table[low : high + 1] = table[low : high + 1].translate(_SET_TLS if required else _CLEAR_TLS)
+            return table
+
+        default = _apply(bytearray(base), self._tls_rules[None])
+        tables: Dict[Optional[str], bytearray] = {None: default}
+        for environment, rules in self._tls_rules.items():
+            if environment is not None:
+                tables[environment] = _apply(bytearray(default), rules)
+        self._tables = tables
+        return self
+
+    def table(self, environment: Optional[str] = None) -> bytearray:
+        """Return the compiled lookup table for an environment (unknown ones use the default)."""
+
+        tables = self._tables if self._tables is not None else self.compile()._tables
+        assert tables is not None
+        return tables.get(environment) or tables[None]
+
+    def is_waived(self, service: str, port: int) -> bool:
+        """Return whether an exception covers ``service`` on ``port``."""
+
+        if service not in self._exceptions:
+            return False
+        waived = self._exceptions[service]
+        return waived is None or port in waived
+
+    def check(
+        self, service: str, port: int, tls_required: bool = True, environment: Optional[str] = None
+    ) -> Tuple[bool, bool]:
+        """Return ``(insecure_port, missing_tls)`` for one service port."""
+
+        flags = self.table(environment)[port] if 0 <= port < PORT_COUNT else _TLS_REQUIRED
+        insecure = bool(flags & _DENIED)
+        plaintext = bool(flags & _TLS_REQUIRED) and not tls_required
+        if (insecure or plaintext) and self.is_waived(service, port):
+            return False, False
+        return insecure, plaintext
+
+    def audit(
+        self,
+        inventory: Union[Inventory, Iterable[Inventory], str, Path],
+        max_examples: int = 3,
+    ) -> PolicyFindings:
+        """Check a column-oriented inventory in bulk and aggregate the findings.
+
+        Args:
+            inventory: A mapping of equal-length columns (lists or NumPy
+                arrays), an iterable of such chunks, or a CSV/Parquet path
+                (see :func:`iter_inventory`).
+            max_examples: Service names kept per finding for the report.
+        """
+
+        if isinstance(inventory, (str, Path)):
+            chunks: Iterable[Inventory] = iter_inventory(inventory)
+        elif isinstance(inventory, Mapping):
+            chunks = [inventory]
+        else:
+            chunks = inventory
+        findings = PolicyFindings()
+        for chunk in chunks:
+            if np is not None and len(chunk["port"]) >= _VECTORIZE_MIN_ROWS:
+                findings.merge(self._audit_vectorized(chunk, max_examples), max_examples)
+            else:
+                findings.merge(self._audit_rows(chunk, max_examples), max_examples)
+        return findings
+
+    def _audit_rows(self, chunk: Inventory, max_examples: int) -> PolicyFindings:
+        findings = PolicyFindings(checked=len(chunk["port"]))
+        default = self.table()
+        tables = self._tables or {}
+        tls_column = chunk.get("tls_required")
+        env_column = chunk.get("environment")
+        examples = findings.examples
+        for name, port, tls_required, environment in zip(
+            chunk["name"],
+            chunk["port"],
+            tls_column if tls_column is not None else repeat(True),
+            env_column if env_column is not None else repeat(None),
+        ):
+            port = int(port)
+            if not 0 <= port < PORT_COUNT:
+                findings.invalid += 1
+                continue
+            flags = (tables.get(environment) or default)[port] if environment else default[port]
+            if not flags & _DENIED and not (flags & _TLS_REQUIRED and not _truthy(tls_required)):
+                continue
+            if self.is_waived(name, port):
+                findings.waived += 1
+                continue
+            if flags & _DENIED:
+                findings.insecure[port] = findings.insecure.get(port, 0) + 1
+                kept = examples.setdefault(("insecure", port), [])
+                if len(kept) < max_examples:
+                    kept.append(str(name))
+            if flags & _TLS_REQUIRED and not _truthy(tls_required):
+                findings.plaintext[port] = findings.plaintext.get(port, 0) + 1
+                kept = examples.setdefault(("plaintext", port), [])
+                if len(kept) < max_examples:
+                    kept.append(str(name))
+        return findings
+
+    def _audit_vectorized(self, chunk: Inventory, max_examples: int) -> PolicyFindings:
+        names = chunk["name"]
+        ports = np.asarray(chunk["port"], dtype=np.int64)
+        findings = PolicyFindings(checked=int(ports.size))
+        valid = (ports >= 0) & (ports < PORT_COUNT)
+        findings.invalid = int(ports.size - np.count_nonzero(valid))
+        safe_ports = np.where(valid, ports, 0)
+
+        default = self.table()
+        tables = self._tables or {}
+        env_column = chunk.get("environment")
+        if env_column is None:
+            flags = np.frombuffer(default, dtype=np.uint8)[safe_ports]
+        else:
+            keys, codes = np.unique(np.asarray(env_column, dtype=object).astype(str), return_inverse=True)
+            matrix = np.stack([np.frombuffer(tables.get(key) or default, dtype=np.uint8) for key in keys.tolist()])
+            flags = matrix[codes.reshape(-1), safe_ports]
+        flags = np.where(valid, flags, 0)
+
+        insecure = (flags & _DENIED) != 0
+        tls_column = chunk.get("tls_required")
+        if tls_column is None:
+            plaintext = np.zeros(ports.size, dtype=bool)
+        else:
+            tls = np.asarray(tls_column)
+            if tls.dtype != np.bool_:
+                tls = np.fromiter((_truthy(value) for value in tls.tolist()), dtype=bool, count=tls.size)
+            plaintext = ((flags & _TLS_REQUIRED) != 0) & ~tls
+
+        if self._exceptions:
+            flagged = np.flatnonzero(insecure | plaintext)
+            for index in flagged.tolist():
+                if self.is_waived(names[index], int(ports[index])):
+                    insecure[index] = plaintext[index] = False
+                    findings.waived += 1
+
+        for kind, mask, counts in (
+            ("insecure", insecure, findings.insecure),
+            ("plaintext", plaintext, findings.plaintext),
+        ):
+            indices = np.flatnonzero(mask)
+            if not indices.size:
+                continue
+            order = indices[np.argsort(ports[indices], kind="stable")]
+            ordered_ports = ports[order]
+            unique_ports, starts, totals = np.unique(ordered_ports, return_index=True, return_counts=True)
+            for port, start, total in zip(unique_ports.tolist(), starts.tolist(), totals.tolist()):
+                counts[port] = total
+                sample = order[start : start + min(total, max_examples)]
+                findings.examples[(kind, port)] = [str(names[index]) for index in sample.tolist()]
+        return findings
+
+
+def iter_inventory(path: str | Path, chunk_size: int = 100_000) -> Iterator[Dict[str, Sequence[Any]]]:
+    """Stream a CSV or Parquet inventory as column chunks of up to ``chunk_size`` rows.
+
+    Files need ``name`` and ``port`` columns; ``tls_required`` and
+    ``environment`` are optional. Parquet input requires ``pyarrow``.
+    """
+
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Reading Parquet inventories requires the 'pyarrow' package.") from exc
+        parquet = pq.ParquetFile(path)
+        wanted = [c for c in ("name", "port", "tls_required", "environment") if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=wanted):
+            yield {column: batch.column(column).to_pylist() for column in wanted}
+        return
+
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {column.strip(): index for index, column in enumerate(header)}
+        missing = {"name", "port"} - positions.keys()
+        if missing:
+            raise ValueError(f"{path} is missing required inventory columns: {', '.join(sorted(missing))}")
+        optional = [column for column in ("tls_required", "environment") if column in positions]
+
+        def _empty() -> Dict[str, List[Any]]:
+            return {column: [] for column in ("name", "port", *optional)}
+
+        columns = _empty()
+        name_at, port_at = positions["name"], positions["port"]
+        tls_at = positions.get("tls_required")
+        env_at = positions.get("environment")
+        for row in reader:
+            if not row:
+                continue
+            columns["name"].append(row[name_at])
+            columns["port"].append(int(row[port_at]))
+            if tls_at is not None:
+                columns["tls_required"].append(row[tls_at].strip().lower() in _TRUTHY)
+            if env_at is not None:
+                columns["environment"].append(row[env_at] or None)
+            if len(columns["port"]) >= chunk_size:
+                yield columns
+                columns = _empty()
+        if columns["port"]:
+            yield columns
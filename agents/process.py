@@ -0,0 +1,300 @@
+"""Subprocess helpers with preemptive deadlines and bounded output capture.
+
+Agents that shell out (for example the Lint Tester and TDD Enforcer) run their
+tools through :func:`run_streaming`. Output is read incrementally into a
+bounded buffer, and the whole process group is killed as soon as the shared
+:class:`Deadline` expires or is cancelled, so partial output survives a timeout.
+"""
+
+from __future__ import annotations
+
+import codecs
+import io
+import os
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Callable, Deque, Generator, List, Optional, Sequence
+
+from .metrics import METRICS, Metrics
+
+DEFAULT_MAX_OUTPUT_CHARS = 1 << 20
+_POLL_INTERVAL = 0.05
+# Seconds to keep reading after the command exits (or is killed) for output still in its pipes.
+_PIPE_GRACE_SECONDS = 0.5
+
+
+class OutputBuffer:
+    """Thread-safe text buffer that keeps the head and tail of long output.
+
+    Once more than ``max_chars`` have been written, the middle of the stream is
+    dropped and replaced by an omission marker when the value is read.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_OUTPUT_CHARS):
+        self.max_chars = max_chars
+        self._head: List[str] = []
+        self._head_size = 0
+        self._tail: Deque[str] = deque()
+        self._tail_size = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def truncated(self) -> bool:
+        return self._dropped > 0
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            head_room = self.max_chars // 2 - self._head_size
+            if head_room > 0:
+                self._head.append(text[:head_room])
+                self._head_size += min(len(text), head_room)
+                text = text[head_room:]
+            if not text:
+                return
+            self._tail.append(text)
+            self._tail_size += len(text)
+            tail_limit = self.max_chars - self.max_chars // 2
+            while self._tail_size > tail_limit:
+                excess = self._tail_size - tail_limit
+                first = self._tail[0]
+                if len(first) <= excess:
+                    self._tail.popleft()
+                    self._tail_size -= len(first)
+                    self._dropped += len(first)
+                else:
+                    self._tail[0] = first[excess:]
+                    self._tail_size -= excess
+                    self._dropped += excess
+
+    def getvalue(self) -> str:
+        with self._lock:
+            marker = f"\n[... {self._dropped} characters omitted ...]\n" if self._dropped else ""
+            return "".join(self._head) + marker + "".join(self._tail)
+
+
+@dataclass
+class Deadline:
+    """Shared wall-clock budget that subprocesses and workers can observe.
+
+    Cancelling the deadline (or letting it expire) kills every process started
+    through :func:`run_streaming` with this deadline.
+    """
+
+    expires_at: float
+    clock: Callable[[], float] = time.monotonic
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    buffers: List[OutputBuffer] = field(default_factory=list)
+    """Output buffers of the commands still running under this deadline."""
+    budget: float = 0.0
+    """Seconds granted when the deadline was created, for reporting."""
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        return cls(expires_at=clock() + seconds, clock=clock, budget=seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        return self.cancelled.is_set() or self.remaining() <= 0
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def partial_output(self) -> str:
+        """Return whatever output commands under this deadline produced so far."""
+
+        return "".join(buffer.getvalue() for buffer in list(self.buffers))
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a streamed subprocess run."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    truncated: bool = False
+
+    @property
+    def output(self) -> str:
+        return self.stdout + self.stderr
+
+
+def _pump(stream: IO[str], buffer: OutputBuffer, stop: threading.Event) -> None:
+    """Copy a pipe into ``buffer`` until EOF, or until ``stop`` is set (POSIX only).
+
+    A grandchild that left the process group can hold the pipe open long after
+    the command exits. On POSIX the pipe is polled, so the reader can give up
+    on it; elsewhere reads block and an abandoned reader ends with the pipe.
+    """
+
+    try:
+        if os.name != "posix":
+            for chunk in iter(lambda: stream.read(8192), ""):
+                buffer.write(chunk)
+            return
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(getattr(stream, "encoding", None) or "utf-8")(
+                getattr(stream, "errors", None) or "strict"
+            ),
+            translate=True,
+        )
+        fd = stream.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while not stop.is_set():
+                if not selector.select(_POLL_INTERVAL):
+                    continue
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                buffer.write(decoder.decode(data))
+        buffer.write(decoder.decode(b"", final=True))
+    finally:
+        stream.close()
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_streaming(
+    command: Sequence[str],
+    deadline: Deadline,
+    max_output_chars: int = DEFAULT_MAX_OUTPUT_CHARS,
+    metrics: Metrics = METRICS,
+) -> ProcessResult:
+    """Run a command, streaming output until it exits or the deadline hits.
+
+    The command runs in its own process group so that any children it spawns
+    are killed with it. On timeout the result carries the output collected so
+    far and ``timed_out=True``. When ``metrics`` is enabled, spawn and total
+    run time are recorded per executable.
+    """
+
+    if not metrics.enabled:
+        return _run_streaming(command, deadline, max_output_chars)
+    executable = os.path.basename(str(command[0])) if command else ""
+    with metrics.span("subprocess", "subprocess_seconds", command=executable) as span:
+        result = _run_streaming(command, deadline, max_output_chars, metrics, executable)
+        span.set(returncode=result.returncode, timed_out=result.timed_out)
+    return result
+
+
+def _run_streaming(
+    command: Sequence[str],
+    deadline: Deadline,
+    max_output_chars: int,
+    metrics: Optional[Metrics] = None,
+    executable: str = "",
+) -> ProcessResult:
+    stdout_buffer = OutputBuffer(max_output_chars)
+    stderr_buffer = OutputBuffer(max_output_chars)
+    buffers = [stdout_buffer, stderr_buffer]
+    deadline.buffers.extend(buffers)
+    try:
+        spawn_started = time.perf_counter()
+        process = subprocess.Popen(
+            list(command),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=os.name == "posix",
+        )
+        if metrics is not None:
+            metrics.observe("subprocess_spawn_seconds", time.perf_counter() - spawn_started, command=executable)
+        stop = threading.Event()
+        readers = [
+            threading.Thread(target=_pump, args=(process.stdout, stdout_buffer, stop), daemon=True),
+            threading.Thread(target=_pump, args=(process.stderr, stderr_buffer, stop), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        while True:
+            try:
+                returncode = process.wait(timeout=min(_POLL_INTERVAL, max(deadline.remaining(), 0.001)))
+                break
+            except subprocess.TimeoutExpired:
+                if deadline.expired():
+                    timed_out = True
+                    _kill_group(process)
+                    returncode = process.wait()
+                    break
+        # Descendants outside the process group may keep the pipes open; stop
+        # reading at the deadline (plus a grace period) rather than waiting for them.
+        drain_until = time.monotonic() + deadline.remaining() + _PIPE_GRACE_SECONDS
+        for reader in readers:
+            reader.join(max(0.0, drain_until - time.monotonic()))
+        abandoned = any(reader.is_alive() for reader in readers)
+        if abandoned:
+            stop.set()
+            for reader in readers:
+                reader.join(_PIPE_GRACE_SECONDS)
+
+        return ProcessResult(
+            returncode=returncode,
+            stdout=stdout_buffer.getvalue(),
+            stderr=stderr_buffer.getvalue(),
+            timed_out=timed_out or (abandoned and deadline.expired()),
+            truncated=abandoned or stdout_buffer.truncated or stderr_buffer.truncated,
+        )
+    finally:
+        for buffer in buffers:
+            deadline.buffers.remove(buffer)
+
+
+def iter_lines(command: Sequence[str], deadline: Deadline) -> Generator[str, None, int]:
+    """Yield a command's output lines (stdout and stderr merged) as they are produced.
+
+    Nothing is buffered beyond the current line. The process group is killed
+    when the deadline expires or is cancelled, or when the caller stops
+    iterating early; check ``deadline.expired()`` afterwards to tell a timeout
+    from a normal exit. The generator returns the exit status, so
+    ``returncode = yield from iter_lines(...)`` (or ``StopIteration.value``)
+    recovers it.
+    """
+
+    process = subprocess.Popen(
+        list(command),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        start_new_session=os.name == "posix",
+    )
+
+    def _watch() -> None:
+        while process.poll() is None:
+            deadline.cancelled.wait(min(_POLL_INTERVAL, max(deadline.remaining(), 0.001)))
+            if deadline.expired():
+                _kill_group(process)
+                return
+
+    watchdog = threading.Thread(target=_watch, daemon=True)
+    watchdog.start()
+    try:
+        assert process.stdout is not None
+        for line in process.stdout:
+            yield line.rstrip("\n")
+    finally:
+        if process.poll() is None:
+            _kill_group(process)
+        process.stdout.close()
+        process.wait()
+        watchdog.join()
+    return process.returncode
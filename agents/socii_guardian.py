@@ -2,44 +2,106 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Mapping
+from itertools import takewhile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Union
 
 from .base import BaseAgent
 from .config import AGENTS
-
-
-@dataclass
-class ServicePort:
-    name: str
-    port: int
-    tls_required: bool = True
+from .findings import ERROR, Finding
+from .infra_scan import InfraScanner, ServicePort
+from .port_policy import INSECURE_PORT_MESSAGE, PLAINTEXT_MESSAGE, Inventory, PortPolicy
 
 
 class SOCIIGuardian(BaseAgent):
     """Review services for SOC II-aligned security posture."""
 
-    def __init__(self):
+    def __init__(self, policy: PortPolicy | None = None):
         super().__init__(config=AGENTS["socii_guardian"])
+        self.policy: PortPolicy = (policy if policy is not None else PortPolicy()).compile()
 
     def review_ports(self, services: Iterable[ServicePort]) -> str:
         """Check whether services rely on secure, expected ports."""
 
-        findings: List[str] = []
-        for service in services:
-            if service.port in {80, 21, 23}:
+        report = self._port_report(self._port_findings(services))
+        return self.deliver(report, context=["soc2", "network", "cia"])
+
+    def review_infra(
+        self,
+        root: str | Path = ".",
+        cache_path: str | Path | None = None,
+        workers: int | None = None,
+    ) -> str:
+        """Scan infrastructure configs under ``root`` and review the ports they expose.
+
+        docker-compose files, Kubernetes manifests, Helm values, and nginx
+        configs are parsed in a process pool, and ports are reviewed as they
+        are extracted. With ``cache_path``, unchanged files are skipped on
+        rescans. Files that could not be read or parsed are listed as findings,
+        and so is a scan cut short by the deadline: the report never claims
+        that unreviewed files are secure.
+        """
+
+        scanner = InfraScanner(root, cache_path=cache_path, workers=workers)
+
+        def _operation() -> str:
+            deadline = self.active_deadline()
+            scan = scanner.scan()
+            try:
+                findings = self._port_findings(takewhile(lambda _: not deadline.expired(), scan))
+            finally:
+                scan.close()  # cancels outstanding parser batches when the deadline cut the scan short
+            findings.extend(f"{error}; port exposure could not be reviewed." for error in scanner.errors)
+            if scanner.unreviewed_files:
                 findings.append(
-                    f"{service.name}: port {service.port} is insecure; prefer TLS (443/8443) or tunneled access."
+                    f"Scan truncated at the {self.budget_minutes():g}-minute deadline; "
+                    f"{scanner.unreviewed_files} of {scanner.total_files} infrastructure files were not reviewed."
                 )
-            if not service.tls_required:
-                findings.append(f"{service.name}: TLS not required; enforce TLS for confidentiality and integrity.")
+            return self._port_report(findings)
 
-        if not findings:
-            report = "All services are using secure ports with TLS enforced."
-        else:
-            report = "Security review findings:\n- " + "\n- ".join(findings)
+        report = self.run_with_deadline(minutes=None, operation=_operation)
         return self.deliver(report, context=["soc2", "network", "cia"])
 
+    def audit_inventory(
+        self,
+        inventory: Union[Inventory, Iterable[Inventory], str, Path],
+        max_examples: int = 3,
+    ) -> str:
+        """Audit a fleet-wide, column-oriented port inventory against the policy.
+
+        Accepts a mapping of columns (``name``, ``port``, and optionally
+        ``tls_required`` and ``environment``), an iterable of such chunks, or
+        a CSV/Parquet path. Findings are aggregated per port and rendered once.
+        """
+
+        def _operation() -> str:
+            return self.policy.audit(inventory, max_examples=max_examples).render()
+
+        report = self.run_with_deadline(minutes=None, operation=_operation)
+        return self.deliver(report, context=["soc2", "network", "cia"])
+
+    def iter_port_findings(self, services: Iterable[ServicePort]) -> Iterator[Finding]:
+        """Yield a finding per policy violation as services stream in."""
+
+        check = self.policy.check
+        agent = self.config.name
+        for service in services:
+            insecure, plaintext = check(service.name, service.port, service.tls_required, service.environment)
+            if insecure:
+                message = f"{service.name}: {INSECURE_PORT_MESSAGE.format(port=service.port)}"
+                yield Finding(agent, "insecure-port", message, ERROR)
+            if plaintext:
+                yield Finding(agent, "plaintext-transport", f"{service.name}: {PLAINTEXT_MESSAGE}", ERROR)
+
+    def _port_findings(self, services: Iterable[ServicePort]) -> List[str]:
+        return [finding.message for finding in self.iter_port_findings(services)]
+
+    def _port_report(self, findings: List[str]) -> str:
+        self.observe("findings", len(findings))
+        if not findings:
+            return "All services are using secure ports with TLS enforced."
+        return "Security review findings:\n- " + "\n- ".join(findings)
+
     def review_controls(self, controls: Mapping[str, bool]) -> str:
         """Evaluate CIA-aligned control checks."""
 
@@ -0,0 +1,121 @@
+"""Shared persistence helpers for the agents' caches and indexes.
+
+Several agents walk the repository, keep small SQLite stores that many
+workers share, or persist JSON caches next to the checkout. The helpers here
+give them one directory filter, one connection/transaction pattern, and one
+atomic-write path.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+SKIPPED_DIRS = frozenset({".git", ".hg", ".svn", ".venv", "venv", "node_modules", "__pycache__", ".tox", ".nox"})
+"""Directory names never descended into when walking a repository."""
+
+
+def is_skipped_dir(name: str) -> bool:
+    """Whether a repository walk should skip the directory called ``name`` (VCS, virtualenv, hidden)."""
+
+    return name in SKIPPED_DIRS or name.startswith(".")
+
+
+def prune_dirs(dirnames: Iterable[str]) -> List[str]:
+    """Return the directories an ``os.walk`` should descend into, sorted for a deterministic order.
+
+    Assign the result back with ``dirnames[:] = prune_dirs(dirnames)``.
+    """
+
+    return sorted(name for name in dirnames if not is_skipped_dir(name))
+
+
+@contextmanager
+def connect(path: str | Path, busy_timeout: float = 30.0) -> Iterator[sqlite3.Connection]:
+    """Open an autocommit SQLite connection that waits ``busy_timeout`` seconds for locks."""
+
+    conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run the block in a write transaction, taking the write lock up front.
+
+    ``BEGIN IMMEDIATE`` makes concurrent writers queue on ``busy_timeout``
+    instead of failing with a lock upgrade error mid-transaction.
+    """
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` through a uniquely named temporary file and ``os.replace``.
+
+    Readers never see a partial file, and concurrent writers never share a
+    staging file; the last replace wins.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False)
+    try:
+        with handle:
+            handle.write(data)
+        os.replace(handle.name, path)
+    except BaseException:
+        try:
+            os.unlink(handle.name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: str | Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def load_json_cache(path: Optional[Path], version: int, root: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Return a cache payload written by :func:`save_json_cache`.
+
+    None is returned when the file is missing or unreadable, or was written
+    with another format ``version`` or for another ``root``.
+    """
+
+    if path is None:
+        return None
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != version:
+        return None
+    if root is not None and payload.get("root") != str(root.resolve()):
+        return None
+    return payload
+
+
+def save_json_cache(path: Optional[Path], version: int, fields: Mapping[str, Any], root: Optional[Path] = None) -> None:
+    """Atomically persist ``fields`` tagged with the format ``version`` (and ``root``)."""
+
+    if path is None:
+        return
+    payload: Dict[str, Any] = {"version": version}
+    if root is not None:
+        payload["root"] = str(root.resolve())
+    payload.update(fields)
+    atomic_write_text(path, json.dumps(payload, separators=(",", ":")))
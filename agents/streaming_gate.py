@@ -0,0 +1,183 @@
+"""Incremental, fail-closed gating of streamed AI responses.
+
+:class:`StreamingGate` consumes a response chunk by chunk and looks for
+citation and test-reference markers as the text arrives. Each chunk is scanned
+once; only a bounded tail of the previous chunk is carried over so markers
+split across chunk boundaries are still found. The gate settles as soon as it
+can: it approves on the first marker and blocks once too much text has
+streamed without one, so an unsupported answer is cut off mid-generation.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Pattern, Sequence
+
+PENDING = "pending"
+APPROVED = "approved"
+BLOCKED = "blocked"
+
+CITATION_MARKERS: Sequence[str] = (
+    r"\[\d{1,3}(?:\s?[,–-]\s?\d{1,3}){0,5}\]",  # [1], [2, 3], [4-6]
+    r"\[\^[\w-]{1,32}\]",  # Markdown footnotes
+    r"https?://[^\s)\]>]",
+    r"\bdoi:\s?10\.\d{4,9}/",
+    r"\barXiv:\d{4}\.\d{4,5}",
+    r"(?i)\n[ \t]{0,8}(?:sources?|references?|citations?)[ \t]{0,4}:",  # a "Sources:" line
+)
+TEST_MARKERS: Sequence[str] = (
+    r"\btests?/[\w./-]{0,120}\.py\b",
+    r"\btest_\w{1,120}",
+    r"\bpytest\b",
+    r"\bassert\s",
+)
+DEFAULT_MARKERS: Sequence[str] = (*CITATION_MARKERS, *TEST_MARKERS)
+"""Patterns whose presence counts as evidence; each must match at most ``max_marker_chars`` characters."""
+
+
+@dataclass
+class GateDecision:
+    """Outcome of a streaming gate.
+
+    Attributes:
+        state: ``"pending"``, ``"approved"``, or ``"blocked"``.
+        reason: Report line matching :meth:`HallucinationSentinel.gate_response`.
+        position: Characters consumed when the decision was made.
+        marker: The evidence text that approved the response, if any.
+        early: True when the decision came before the stream ended.
+    """
+
+    state: str
+    reason: str
+    position: int = 0
+    marker: Optional[str] = None
+    early: bool = False
+
+    @property
+    def settled(self) -> bool:
+        return self.state != PENDING
+
+
+def _compile(markers: Sequence[str]) -> Pattern[str]:
+    # Inline flags must lead a pattern, so wrap each alternative in a scoped group.
+    parts = []
+    for marker in markers:
+        flags = re.match(r"^\(\?([aiLmsux]+)\)", marker)
+        parts.append(f"(?{flags.group(1)}:{marker[flags.end():]})" if flags else f"(?:{marker})")
+    return re.compile("|".join(parts))
+
+
+class StreamingGate:
+    """Single-pass, fail-closed evidence gate for streamed text.
+
+    Args:
+        markers: Regular expressions that count as evidence (citations or
+            test references).
+        max_unsupported_chars: Block once this many characters have streamed
+            without any evidence marker.
+        max_marker_chars: Upper bound on a marker's length; this many trailing
+            characters of each chunk are carried into the next scan.
+    """
+
+    def __init__(
+        self,
+        markers: Sequence[str] = DEFAULT_MARKERS,
+        max_unsupported_chars: int = 4000,
+        max_marker_chars: int = 128,
+    ):
+        if max_unsupported_chars < 1:
+            raise ValueError("max_unsupported_chars must be at least 1.")
+        self._pattern = _compile(markers)
+        self.max_unsupported_chars = max_unsupported_chars
+        self.max_marker_chars = max_marker_chars
+        self._carry = ""
+        self._consumed = 0
+        self.decision = GateDecision(state=PENDING, reason="Response pending: awaiting evidence or citations.")
+
+    @property
+    def consumed(self) -> int:
+        """Number of characters fed so far."""
+
+        return self._consumed
+
+    def feed(self, chunk: str) -> GateDecision:
+        """Scan one chunk and return the (possibly settled) decision.
+
+        Chunks fed after the gate settled are counted but not scanned.
+        """
+
+        self._consumed += len(chunk)
+        if self.decision.settled or not chunk:
+            return self.decision
+
+        # A leading newline lets line-anchored markers match on the first line.
+        window = (self._carry or ("\n" if self._consumed == len(chunk) else "")) + chunk
+        match = self._pattern.search(window)
+        position = self._consumed - (len(window) - match.end()) if match is not None else None
+        # A marker that completes past the budget arrived too late, however the text was chunked.
+        if position is not None and position <= self.max_unsupported_chars:
+            self.decision = GateDecision(
+                state=APPROVED,
+                reason="Response approved for delivery.",
+                position=position,
+                marker=match.group(0),
+                early=True,
+            )
+            self._carry = ""
+        elif self._consumed >= self.max_unsupported_chars:
+            self.decision = GateDecision(
+                state=BLOCKED,
+                reason=(
+                    f"Response blocked mid-stream after {self._consumed} characters: "
+                    "insufficient evidence or citations detected."
+                ),
+                position=self._consumed,
+                early=True,
+            )
+            self._carry = ""
+        else:
+            self._carry = window[-self.max_marker_chars :]
+        return self.decision
+
+    def close(self) -> GateDecision:
+        """Finish the stream, failing closed when no decision was reached."""
+
+        if not self.decision.settled:
+            if self._consumed == 0:
+                reason = "Response blocked: empty content."
+            else:
+                reason = "Response blocked: insufficient evidence or citations detected."
+            self.decision = GateDecision(state=BLOCKED, reason=reason, position=self._consumed)
+        self._carry = ""
+        return self.decision
+
+    def filter(self, chunks: Iterable[str], hold_back: bool = False) -> Iterator[str]:
+        """Relay chunks until the gate blocks, then stop consuming the source.
+
+        Args:
+            chunks: The streamed response.
+            hold_back: Withhold text until the gate approves, so nothing
+                unsupported is ever emitted (at most ``max_unsupported_chars``
+                are buffered).
+        """
+
+        held: List[str] = []
+        source = iter(chunks)
+        try:
+            for chunk in source:
+                decision = self.feed(chunk)
+                if decision.state == BLOCKED:
+                    return
+                if hold_back and decision.state == PENDING:
+                    held.append(chunk)
+                    continue
+                if held:
+                    yield "".join(held)
+                    held = []
+                yield chunk
+            self.close()
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
-import subprocess
+import os
+import statistics
+import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .base import BaseAgent
 from .config import AGENTS
+from .findings import WARNING, Finding
+from .impact_analysis import TestImpactAnalyzer
+from .process import ProcessResult
+from .storage import prune_dirs
+from .testfile_index import TestFileIndex
+from .timing_db import Shard, TimingDatabase, plan_shards
+
+# Shards slower than this multiple of the median shard are reported as long-tail.
+_LONG_TAIL_FACTOR = 1.5
 
 
 class TDDEnforcer(BaseAgent):
@@ -15,9 +29,20 @@ class TDDEnforcer(BaseAgent):
 
     DEFAULT_TEST_COMMAND: Sequence[str] = ("pytest", "-q")
 
-    def __init__(self, test_command: Sequence[str] | None = None):
+    def __init__(
+        self,
+        test_command: Sequence[str] | None = None,
+        test_index: TestFileIndex | None = None,
+        impact_analyzer: TestImpactAnalyzer | None = None,
+        shards: int | None = None,
+        timing_db: TimingDatabase | None = None,
+    ):
         super().__init__(config=AGENTS["tdd_enforcer"])
         self.test_command: Sequence[str] = test_command or self.DEFAULT_TEST_COMMAND
+        self.test_index: Optional[TestFileIndex] = test_index
+        self.impact_analyzer: Optional[TestImpactAnalyzer] = impact_analyzer
+        self.shards: int = max(1, shards or 1)
+        self.timing_db: Optional[TimingDatabase] = timing_db
 
     def _expected_tests(self, code_path: Path) -> List[Path]:
         """Return likely test file locations for a given code file."""
@@ -33,6 +58,14 @@ class TDDEnforcer(BaseAgent):
     def review(self, changed_files: Iterable[str | Path], run_tests: bool = False) -> str:
         """Assess whether changes adhere to TDD expectations.
 
+        When a :class:`TestFileIndex` is configured, the index is refreshed
+        incrementally once and every lookup is answered from memory instead of
+        probing candidate paths on disk. When a :class:`TestImpactAnalyzer` is
+        configured, ``run_tests`` only runs the test files that can reach the
+        change set, falling back to the full suite when narrowing is unsafe.
+        With ``shards`` above one, test files are bin-packed by recorded
+        duration and run as concurrent subprocesses whose results are merged.
+
         Args:
             changed_files: Files touched in the change set.
             run_tests: If True, execute the configured fast-feedback test command.
@@ -45,18 +78,12 @@ class TDDEnforcer(BaseAgent):
         if not paths:
             raise ValueError("No files provided to review.")
 
-        test_paths: List[Path] = [p for p in paths if "test" in p.name.lower() or "tests" in p.parts]
-        code_paths: List[Path] = [p for p in paths if p not in test_paths]
-
-        missing_tests: List[str] = []
+        code_paths, test_paths = self._split(paths)
+        missing_tests: List[str] = [str(p) for _, expected in self._untested(code_paths, test_paths) for p in expected]
         found_tests: List[str] = [str(p) for p in test_paths]
 
-        for code_path in code_paths:
-            expected = self._expected_tests(code_path)
-            discovered = [p for p in expected if p.exists()]
-            if not discovered and not any(code_path.stem in t.name for t in test_paths):
-                missing_tests.extend(str(p) for p in expected)
-
+        self.observe("input_files", len(paths))
+        self.observe("findings", len(set(missing_tests)))
         lines: List[str] = [
             f"Reviewed {len(paths)} files (code: {len(code_paths)}, tests: {len(test_paths)}).",
         ]
@@ -73,24 +100,206 @@ class TDDEnforcer(BaseAgent):
         else:
             lines.append("All code changes appear to have adjacent or discoverable tests.")
 
+        selected: Optional[List[str]] = None
+        skipped = False
+        if run_tests and self.impact_analyzer is not None:
+            selection = self.impact_analyzer.select(paths)
+            if selection.tests is None:
+                lines.append(f"Running the full test suite: {selection.reason}.")
+            elif not selection.tests:
+                lines.append("Impact analysis found no affected tests; skipped test execution.")
+                run_tests, skipped = False, True
+            else:
+                lines.append(f"Impact analysis selected {len(selection.tests)} affected test file(s).")
+                selected = selection.tests
+
         if run_tests:
-            def _operation() -> str:
-                completed = subprocess.run(
-                    self.test_command,
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.config.time_limit_minutes * 60,
-                )
-                summary = completed.stdout + completed.stderr
-                if completed.returncode != 0:
-                    return f"Fast-feedback tests failed (exit {completed.returncode}).\n{summary}"
-                return f"Fast-feedback tests passed.\n{summary}"
-
-            test_report = self.run_with_deadline(minutes=None, operation=_operation)
+            if self.shards > 1:
+                test_files = selected if selected is not None else self._discover_tests()
+                test_report = self.run_with_deadline(minutes=None, operation=lambda: self._run_sharded(test_files))
+            else:
+                command = [*self.test_command, *(selected or [])]
+                test_report = self.run_with_deadline(minutes=None, operation=lambda: self._run_suite(command))
             lines.append(test_report)
-        else:
+        elif not skipped:
             lines.append("Tests were not executed; enable run_tests=True for fast feedback.")
 
         report = "\n".join(lines)
         return self.deliver(report, context=["tdd", "tests", "coverage"])
+
+    def iter_missing_tests(self, changed_files: Iterable[str | Path]) -> Iterator[Finding]:
+        """Yield a finding for each changed code file without discoverable tests."""
+
+        code_paths, test_paths = self._split([Path(p) for p in changed_files])
+        for code_path, expected in self._untested(code_paths, test_paths):
+            message = "No tests found; add or update tests at: " + ", ".join(str(p) for p in expected)
+            yield Finding(self.config.name, "missing-test", message, WARNING, path=str(code_path))
+
+    @staticmethod
+    def _split(paths: List[Path]) -> Tuple[List[Path], List[Path]]:
+        """Return ``(code paths, test paths)``."""
+
+        test_paths: List[Path] = [p for p in paths if "test" in p.name.lower() or "tests" in p.parts]
+        test_set: Set[Path] = set(test_paths)
+        return [p for p in paths if p not in test_set], test_paths
+
+    def _untested(self, code_paths: List[Path], test_paths: List[Path]) -> Iterator[Tuple[Path, List[Path]]]:
+        """Yield ``(code path, expected test locations)`` for code files lacking tests.
+
+        A code file counts as tested when a changed test file's name contains
+        its stem, or when a test file exists at one of its expected locations.
+        With a :class:`TestFileIndex`, existence is answered from the index
+        rather than the disk; the rule is the same either way.
+        """
+
+        index = self.test_index
+        if index is not None:
+            index.refresh()
+
+        def _exists(path: Path) -> bool:
+            if index is not None and path.suffix in index.suffixes:
+                return path in index
+            return path.exists()
+
+        for code_path in code_paths:
+            if any(code_path.stem in t.name for t in test_paths):
+                continue
+            expected = self._expected_tests(code_path)
+            if not any(_exists(p) for p in expected):
+                yield code_path, expected
+
+    def _run_suite(self, command: Sequence[str]) -> str:
+        completed = self.run_command(command)
+        summary = completed.output
+        if completed.timed_out:
+            return (
+                f"Fast-feedback tests truncated at the {self.budget_minutes():g}-minute deadline; "
+                f"partial output:\n{summary}"
+            )
+        if completed.returncode != 0:
+            return f"Fast-feedback tests failed (exit {completed.returncode}).\n{summary}"
+        return f"Fast-feedback tests passed.\n{summary}"
+
+    def _discover_tests(self) -> List[str]:
+        """List the repository's test files for sharding."""
+
+        if self.test_index is not None:
+            root = self.test_index.root
+            return sorted(
+                (root / p).as_posix() for p in self.test_index if p.name.startswith("test_") or p.stem.endswith("_test")
+            )
+        found: List[str] = []
+        for directory, dirnames, filenames in os.walk("."):
+            dirnames[:] = prune_dirs(dirnames)
+            for name in filenames:
+                if name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py")):
+                    found.append(Path(os.path.relpath(os.path.join(directory, name))).as_posix())
+        return sorted(found)
+
+    def _uses_pytest(self) -> bool:
+        return any("pytest" in Path(part).name for part in self.test_command[:3])
+
+    def _run_sharded(self, test_files: Sequence[str]) -> str:
+        """Run test files in duration-balanced shards and merge their results."""
+
+        if not test_files:
+            return "No test files found to run."
+        history = self.timing_db.durations(test_files) if self.timing_db is not None else {}
+        shards = plan_shards(test_files, history, self.shards)
+
+        deadline = self.active_deadline()
+        with tempfile.TemporaryDirectory(prefix="tdd-shards-") as report_dir:
+
+            def _run(shard: Shard) -> Tuple[ProcessResult, float, Dict[str, float]]:
+                command = [*self.test_command, *shard.files]
+                junit_path = os.path.join(report_dir, f"shard-{shard.index}.xml")
+                if self._uses_pytest():
+                    command.append(f"--junitxml={junit_path}")
+                started = time.monotonic()
+                result = self.run_command(command, deadline)
+                elapsed = time.monotonic() - started
+                measured = _junit_durations(junit_path, shard.files)
+                if not measured and not result.timed_out:
+                    measured = _apportion(elapsed, shard.files, history)
+                return result, elapsed, measured
+
+            with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+                outcomes = list(pool.map(_run, shards))
+
+        if self.timing_db is not None:
+            self.timing_db.record({f: d for _, _, measured in outcomes for f, d in measured.items()})
+
+        total = len(shards)
+        failed = [
+            (shard, result)
+            for shard, (result, _, _) in zip(shards, outcomes)
+            if result.returncode != 0 or result.timed_out
+        ]
+        if any(result.timed_out for _, result in failed):
+            headline = (
+                f"Fast-feedback tests truncated at the {self.budget_minutes():g}-minute deadline "
+                f"across {total} shards."
+            )
+        elif failed:
+            headline = f"Fast-feedback tests failed in {len(failed)} of {total} shards."
+        else:
+            headline = f"Fast-feedback tests passed across {total} shards."
+
+        lines = [headline]
+        for shard, (result, elapsed, _) in zip(shards, outcomes):
+            if result.timed_out:
+                status = "timed out"
+            else:
+                status = "passed" if result.returncode == 0 else f"failed (exit {result.returncode})"
+            lines.append(f"- Shard {shard.index + 1}/{total}: {len(shard.files)} file(s), {elapsed:.1f}s, {status}")
+
+        durations = [elapsed for _, elapsed, _ in outcomes]
+        median = statistics.median(durations)
+        long_tail = [
+            f"shard {shard.index + 1} ({elapsed:.1f}s vs median {median:.1f}s)"
+            for shard, elapsed in zip(shards, durations)
+            if median > 0 and elapsed > _LONG_TAIL_FACTOR * median
+        ]
+        if long_tail:
+            lines.append("Long-tail shards: " + ", ".join(long_tail))
+
+        for shard, result in failed:
+            lines.append(f"Output from shard {shard.index + 1}/{total}:\n{result.output}")
+        return "\n".join(lines)
+
+
+def _junit_durations(junit_path: str, test_files: Sequence[str]) -> Dict[str, float]:
+    """Sum per-file test durations from a pytest JUnit XML report."""
+
+    if not os.path.exists(junit_path):
+        return {}
+    by_module = {Path(f).with_suffix("").as_posix().replace("/", "."): f for f in test_files}
+    durations: Dict[str, float] = {}
+    try:
+        for _, element in ElementTree.iterparse(junit_path):
+            if element.tag != "testcase":
+                continue
+            test_file = element.get("file")
+            if test_file not in test_files:
+                classname = element.get("classname", "")
+                test_file = None
+                while classname:
+                    if classname in by_module:
+                        test_file = by_module[classname]
+                        break
+                    classname = classname.rpartition(".")[0]
+            if test_file is not None:
+                durations[test_file] = durations.get(test_file, 0.0) + float(element.get("time") or 0.0)
+            element.clear()
+    except (ElementTree.ParseError, ValueError):
+        return {}
+    return durations
+
+
+def _apportion(elapsed: float, test_files: Sequence[str], history: Dict[str, float]) -> Dict[str, float]:
+    """Split a shard's wall time across its files in proportion to their history."""
+
+    default = statistics.median(history.values()) if history else 1.0
+    weights = {f: history.get(f, default) for f in test_files}
+    total = sum(weights.values()) or 1.0
+    return {f: elapsed * weight / total for f, weight in weights.items()}
@@ -0,0 +1,164 @@
+"""Repository-wide index of test files for the TDD Enforcer.
+
+Instead of probing candidate test paths on disk for every changed code file,
+the index walks the repository once, records which directories hold test
+files, and answers ``code stem -> test files`` lookups from memory. The walk
+state is persisted as JSON and refreshed incrementally: directories whose
+modification time has not changed are not listed again.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .storage import is_skipped_dir, load_json_cache, save_json_cache
+
+NamingConvention = Callable[[str], Optional[str]]
+"""Maps a test file stem (e.g. ``test_app``) to the code stem it covers, or None."""
+
+_CACHE_VERSION = 1
+
+
+def prefix_convention(stem: str) -> Optional[str]:
+    """``test_<module>`` files cover ``<module>``."""
+
+    return stem[len("test_") :] if stem.startswith("test_") else None
+
+
+def suffix_convention(stem: str) -> Optional[str]:
+    """``<module>_test`` files cover ``<module>``."""
+
+    return stem[: -len("_test")] if stem.endswith("_test") else None
+
+
+DEFAULT_CONVENTIONS: Tuple[NamingConvention, ...] = (prefix_convention, suffix_convention)
+
+
+class TestFileIndex:
+    """Stem-to-test-file map built from a single directory walk.
+
+    Args:
+        root: Repository root to index.
+        cache_path: Optional JSON file used to persist the walk between runs.
+        conventions: Naming conventions mapping test stems to code stems.
+            Custom conventions plug in here without adding filesystem probes.
+        suffixes: File suffixes considered test sources.
+    """
+
+    __test__ = False  # keep pytest from collecting this class
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        cache_path: str | Path | None = None,
+        conventions: Sequence[NamingConvention] = DEFAULT_CONVENTIONS,
+        suffixes: Sequence[str] = (".py",),
+    ):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.conventions: Tuple[NamingConvention, ...] = tuple(conventions)
+        self.suffixes: Tuple[str, ...] = tuple(suffixes)
+        # relative dir -> (mtime_ns, subdirectory names, candidate test file names)
+        self._dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self._by_stem: Dict[str, List[Path]] = {}
+        self._loaded = False
+
+    def code_stems(self, test_name: str) -> Set[str]:
+        """Return the code stems a test file name covers under the conventions."""
+
+        stem = Path(test_name).stem
+        return {code for code in (convention(stem) for convention in self.conventions) if code}
+
+    def tests_for(self, code_path: str | Path) -> List[Path]:
+        """Return indexed test files covering the given code file."""
+
+        if not self._loaded:
+            self.refresh()
+        return list(self._by_stem.get(Path(code_path).stem, []))
+
+    def __contains__(self, path: object) -> bool:
+        """Whether ``path`` (absolute or relative to the CWD) is an indexed test file."""
+
+        if not isinstance(path, (str, Path)):
+            return False
+        if not self._loaded:
+            self.refresh()
+        try:
+            rel = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root))
+        except ValueError:
+            return False
+        entry = self._dirs.get(os.path.dirname(rel))
+        return entry is not None and os.path.basename(rel) in entry[2]
+
+    def refresh(self) -> None:
+        """Bring the index up to date, re-listing only directories that changed."""
+
+        if not self._loaded:
+            self._load_cache()
+        previous = self._dirs
+        current: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            directory = self.root / rel if rel else self.root
+            try:
+                mtime = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            cached = previous.get(rel)
+            if cached is not None and cached[0] == mtime:
+                entry = cached
+            else:
+                entry = self._scan(directory, mtime)
+            current[rel] = entry
+            stack.extend(os.path.join(rel, name) if rel else name for name in entry[1])
+
+        changed = current != previous
+        self._dirs = current
+        self._rebuild()
+        self._loaded = True
+        if changed:
+            self._save_cache()
+
+    def _scan(self, directory: Path, mtime: int) -> Tuple[int, List[str], List[str]]:
+        subdirs: List[str] = []
+        tests: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not is_skipped_dir(entry.name):
+                            subdirs.append(entry.name)
+                    elif "test" in entry.name.lower() and entry.name.endswith(self.suffixes):
+                        tests.append(entry.name)
+        except OSError:
+            pass
+        return mtime, sorted(subdirs), sorted(tests)
+
+    def _rebuild(self) -> None:
+        by_stem: Dict[str, List[Path]] = {}
+        for rel, (_, _, tests) in self._dirs.items():
+            for name in tests:
+                for code_stem in self.code_stems(name):
+                    by_stem.setdefault(code_stem, []).append(Path(rel) / name)
+        for paths in by_stem.values():
+            paths.sort()
+        self._by_stem = by_stem
+
+    def _load_cache(self) -> None:
+        payload = load_json_cache(self.cache_path, _CACHE_VERSION, self.root)
+        if payload is None:
+            return
+        self._dirs = {rel: (mtime, subdirs, tests) for rel, (mtime, subdirs, tests) in payload["dirs"].items()}
+
+    def _save_cache(self) -> None:
+        save_json_cache(self.cache_path, _CACHE_VERSION, {"dirs": self._dirs}, self.root)
+
+    def __iter__(self) -> Iterator[Path]:
+        if not self._loaded:
+            self.refresh()
+        for rel, (_, _, tests) in sorted(self._dirs.items()):
+            for name in tests:
+                yield Path(rel) / name
@@ -0,0 +1,110 @@
+"""Per-test-file timing history and duration-aware shard planning.
+
+The TDD Enforcer records how long each test file took in a small SQLite
+database and uses those durations to bin-pack test files into balanced shards
+that run as concurrent subprocesses.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .storage import connect, transaction
+
+DEFAULT_TEST_SECONDS = 1.0
+
+
+class TimingDatabase:
+    """SQLite store of smoothed per-test-file durations.
+
+    Args:
+        path: Location of the database file; parent directories are created.
+        smoothing: Weight given to the newest observation when updating the
+            exponentially weighted moving average (1.0 keeps only the latest).
+    """
+
+    def __init__(self, path: str | Path, smoothing: float = 0.5, busy_timeout: float = 30.0):
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1].")
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.busy_timeout = busy_timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS test_durations ("
+                "test_file TEXT PRIMARY KEY, seconds REAL NOT NULL, "
+                "runs INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect(self.path, self.busy_timeout)
+
+    def durations(self, test_files: Iterable[str] | None = None) -> Dict[str, float]:
+        """Return recorded durations, optionally limited to the given files."""
+
+        with self._connect() as conn:
+            rows = conn.execute("SELECT test_file, seconds FROM test_durations").fetchall()
+        known = dict(rows)
+        if test_files is None:
+            return known
+        return {f: known[f] for f in test_files if f in known}
+
+    def record(self, durations: Mapping[str, float]) -> None:
+        """Fold new observations into the moving averages."""
+
+        if not durations:
+            return
+        now = time.time()
+        alpha = self.smoothing
+        with self._connect() as conn, transaction(conn):
+            conn.executemany(
+                "INSERT INTO test_durations (test_file, seconds, runs, updated_at) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(test_file) DO UPDATE SET "
+                "seconds = ? * excluded.seconds + (1 - ?) * seconds, runs = runs + 1, updated_at = excluded.updated_at",
+                [(test_file, seconds, now, alpha, alpha) for test_file, seconds in durations.items()],
+            )
+
+
+@dataclass
+class Shard:
+    """A group of test files expected to take ``estimated_seconds`` to run."""
+
+    index: int
+    files: List[str] = field(default_factory=list)
+    estimated_seconds: float = 0.0
+
+
+def plan_shards(
+    test_files: Sequence[str],
+    durations: Mapping[str, float],
+    shard_count: int,
+    default_seconds: Optional[float] = None,
+) -> List[Shard]:
+    """Bin-pack test files into balanced shards, longest first.
+
+    Files without history are weighted with ``default_seconds``, which defaults
+    to the median of the known durations (or one second with no history).
+    Empty shards are dropped.
+    """
+
+    if default_seconds is None:
+        default_seconds = statistics.median(durations.values()) if durations else DEFAULT_TEST_SECONDS
+    shards = [Shard(index=i) for i in range(max(1, min(shard_count, len(test_files))))]
+    heap = [(0.0, shard.index) for shard in shards]
+    weights = {f: durations.get(f, default_seconds) for f in test_files}
+    for test_file in sorted(test_files, key=lambda f: (-weights[f], f)):
+        load, index = heapq.heappop(heap)
+        shards[index].files.append(test_file)
+        shards[index].estimated_seconds = load + weights[test_file]
+        heapq.heappush(heap, (shards[index].estimated_seconds, index))
+    for shard in shards:
+        shard.files.sort()
+    return [shard for shard in shards if shard.files]
@@ -0,0 +1,834 @@
+"""Distribute agent jobs as serializable tasks over a pluggable work queue.
+
+A job splits one agent call into :class:`Task` records: lint shards, manifest
+batches, advisory batches, or claim batches. Each record carries a handler
+name and a JSON payload. Tasks go onto a queue, where workers claim them
+under a lease, run them, and post JSON results. The job then folds the
+results back into the agent's normal report. There are two backends:
+
+* :class:`LocalQueue` keeps its state in memory. :func:`run_local` drains it
+  with worker threads that hand each task to a process pool, so one machine's
+  cores are used without any setup.
+* :class:`SQLiteQueue` keeps its state in a SQLite file. Any number of worker
+  processes can share it (``python -m agents.work_queue worker QUEUE.db``).
+  With ``wal=False`` the file can also sit on a filesystem shared by several
+  hosts, provided that filesystem honours POSIX locks.
+
+Failed tasks are retried up to ``max_attempts`` times. A worker that dies
+stops renewing its lease, and the task becomes claimable again once the lease
+expires. An idle worker may also steal a task that has been running longer
+than ``steal_after`` seconds. The first result posted wins, so one slow shard
+cannot hold up the whole job.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union,
+)
+
+from .advisories import AdvisoryIndex
+from .dependency_steward import DependencySteward
+from .evidence_index import EvidenceIndex
+from .hallucination_sentinel import HallucinationSentinel
+from .lint_tester import LintTester
+from .lockfiles import DependencySpec, canonical_name
+from .process import Deadline, ProcessResult
+from .storage import connect, transaction
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+# Extra seconds :func:`run_job` waits past the agent's budget for shards to report their truncation.
+_TIMEOUT_GRACE_SECONDS = 5.0
+
+# Handler name -> function from a task payload to a JSON-serializable result.
+TASK_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def task_handler(kind: str) -> Callable[[Callable[[Dict[str, Any]], Any]], Callable[[Dict[str, Any]], Any]]:
+    """Register a module-level function as the handler for ``kind`` tasks.
+
+    Workers look handlers up by name, so the registering module must be
+    imported in every worker process (forked pool workers inherit it).
+    """
+
+    def _register(function: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+        TASK_HANDLERS[kind] = function
+        return function
+
+    return _register
+
+
+def execute_task(kind: str, payload: Dict[str, Any]) -> Any:
+    """Run one task payload through its registered handler."""
+
+    handler = TASK_HANDLERS.get(kind)
+    if handler is None:
+        raise LookupError(f"No handler registered for task kind {kind!r}.")
+    return handler(payload)
+
+
+@dataclass
+class Task:
+    """A unit of work with a JSON-serializable payload.
+
+    Attributes:
+        kind: Name of the handler in :data:`TASK_HANDLERS`.
+        payload: Handler arguments; must round-trip through JSON.
+        id: Unique task id.
+        max_attempts: Runs allowed, counting failures and expired leases, before the task fails.
+    """
+
+    kind: str
+    payload: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    max_attempts: int = 3
+
+
+class TaskFailed(RuntimeError):
+    """A task exhausted its attempts; ``error`` holds the last failure."""
+
+    def __init__(self, task_id: str, error: str):
+        super().__init__(f"Task {task_id} failed: {error}")
+        self.task_id = task_id
+        self.error = error
+
+
+@dataclass
+class _Entry:
+    task: Task
+    status: str = PENDING
+    attempts: int = 0
+    owner: Optional[str] = None
+    claimed_at: float = 0.0
+    lease_expires: float = 0.0
+    stolen: bool = False
+    result: Any = None
+    error: Optional[str] = None
+
+
+class LocalQueue:
+    """Thread-safe in-memory queue for a single process (see :func:`run_local`)."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def put(self, tasks: Iterable[Task]) -> List[str]:
+        with self._lock:
+            ids = []
+            for task in tasks:
+                payload = json.loads(json.dumps(task.payload))  # reject payloads a shared queue could not store
+                self._entries[task.id] = _Entry(Task(task.kind, payload, task.id, task.max_attempts))
+                ids.append(task.id)
+            return ids
+
+    def claim(self, worker: str, lease_seconds: float, steal_after: Optional[float] = None) -> Optional[Task]:
+        """Lease the oldest claimable task to ``worker``; steal a straggler if none is free."""
+
+        now = time.time()
+        with self._lock:
+            # Entries stay in insertion order, so the first match is the oldest task.
+            candidates = [entry for entry in self._entries.values() if entry.status in (PENDING, RUNNING)]
+            for entry in candidates:
+                if entry.status == RUNNING and entry.lease_expires <= now and entry.attempts >= entry.task.max_attempts:
+                    entry.status, entry.error = FAILED, f"Lease expired after {entry.attempts} attempt(s)."
+            for entry in candidates:
+                if entry.status == PENDING or (entry.status == RUNNING and entry.lease_expires <= now):
+                    entry.attempts += 1
+                    entry.stolen = False
+                    return self._lease(entry, worker, lease_seconds, now)
+            if steal_after is not None:
+                stragglers = [
+                    entry for entry in candidates
+                    if entry.status == RUNNING and not entry.stolen and entry.owner != worker
+                    and entry.claimed_at <= now - steal_after
+                ]
+                if stragglers:
+                    entry = min(stragglers, key=lambda entry: entry.claimed_at)
+                    entry.stolen = True
+                    return self._lease(entry, worker, lease_seconds, now)
+        return None
+
+    @staticmethod
+    def _lease(entry: _Entry, worker: str, lease_seconds: float, now: float) -> Task:
+        entry.status, entry.owner = RUNNING, worker
+        entry.claimed_at, entry.lease_expires = now, now + lease_seconds
+        return entry.task
+
+    def renew(self, task_id: str, worker: str, lease_seconds: float) -> bool:
+        """Extend ``worker``'s lease; False once the task was stolen or finished."""
+
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or entry.status != RUNNING or entry.owner != worker:
+                return False
+            entry.lease_expires = time.time() + lease_seconds
+            return True
+
+    def complete(self, task_id: str, worker: str, result: Any) -> bool:
+        """Record a result; False when another worker already finished the task."""
+
+        encoded = json.loads(json.dumps(result))
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or entry.status in (DONE, FAILED):
+                return False
+            entry.status, entry.result, entry.owner = DONE, encoded, worker
+            return True
+
+    def fail(self, task_id: str, worker: str, error: str) -> None:
+        """Record a failed attempt by the task's current owner; retry it or give up."""
+
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or entry.status != RUNNING or entry.owner != worker:
+                return
+            entry.error = error
+            entry.status = FAILED if entry.attempts >= entry.task.max_attempts else PENDING
+
+    def results(self, task_ids: Sequence[str]) -> Dict[str, Tuple[str, Any, Optional[str]]]:
+        """Return ``(status, result, error)`` for each known task."""
+
+        with self._lock:
+            return {
+                task_id: (entry.status, entry.result, entry.error)
+                for task_id in task_ids
+                if (entry := self._entries.get(task_id)) is not None
+            }
+
+    def purge(self, task_ids: Iterable[str]) -> None:
+        with self._lock:
+            for task_id in task_ids:
+                self._entries.pop(task_id, None)
+
+
+class SQLiteQueue:
+    """Queue stored in a SQLite file shared by worker processes or hosts.
+
+    Args:
+        path: Database file; parent directories are created.
+        wal: Use write-ahead logging (fast, single host only). Pass False when
+            hosts share the file over a network filesystem.
+        busy_timeout: Seconds to wait for another worker's write lock.
+    """
+
+    def __init__(self, path: str | Path, wal: bool = True, busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, kind TEXT NOT NULL, "
+                "payload TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "max_attempts INTEGER NOT NULL, owner TEXT, claimed_at REAL NOT NULL DEFAULT 0, "
+                "lease_expires REAL NOT NULL DEFAULT 0, stolen INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, seq)")
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect(self.path, self.busy_timeout)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn, transaction(conn):
+            yield conn
+
+    def put(self, tasks: Iterable[Task]) -> List[str]:
+        rows = [(task.id, task.kind, json.dumps(task.payload), PENDING, task.max_attempts) for task in tasks]
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO tasks (id, kind, payload, status, max_attempts) VALUES (?, ?, ?, ?, ?)", rows)
+        return [row[0] for row in rows]
+
+    def claim(self, worker: str, lease_seconds: float, steal_after: Optional[float] = None) -> Optional[Task]:
+        """Lease the oldest claimable task to ``worker``; steal a straggler if none is free."""
+
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = 'Lease expired after ' || attempts || ' attempt(s).' "
+                "WHERE status = ? AND lease_expires <= ? AND attempts >= max_attempts",
+                (FAILED, RUNNING, now),
+            )
+            row = conn.execute(
+                "SELECT seq, id, kind, payload, max_attempts FROM tasks "
+                "WHERE status = ? OR (status = ? AND lease_expires <= ?) ORDER BY seq LIMIT 1",
+                (PENDING, RUNNING, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, owner = ?, claimed_at = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, stolen = 0 WHERE seq = ?",
+                    (RUNNING, worker, now, now + lease_seconds, row[0]),
+                )
+            elif steal_after is not None:
+                row = conn.execute(
+                    "SELECT seq, id, kind, payload, max_attempts FROM tasks "
+                    "WHERE status = ? AND stolen = 0 AND owner != ? AND claimed_at <= ? ORDER BY claimed_at LIMIT 1",
+                    (RUNNING, worker, now - steal_after),
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE tasks SET owner = ?, claimed_at = ?, lease_expires = ?, stolen = 1 WHERE seq = ?",
+                        (worker, now, now + lease_seconds, row[0]),
+                    )
+        if row is None:
+            return None
+        _, task_id, kind, payload, max_attempts = row
+        return Task(kind, json.loads(payload), task_id, max_attempts)
+
+    def renew(self, task_id: str, worker: str, lease_seconds: float) -> bool:
+        """Extend ``worker``'s lease; False once the task was stolen or finished."""
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ? AND status = ? AND owner = ?",
+                (time.time() + lease_seconds, task_id, RUNNING, worker),
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, task_id: str, worker: str, result: Any) -> bool:
+        """Record a result; False when another worker already finished the task."""
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, owner = ? WHERE id = ? AND status IN (?, ?)",
+                (DONE, json.dumps(result), worker, task_id, PENDING, RUNNING),
+            )
+        return cursor.rowcount > 0
+
+    def fail(self, task_id: str, worker: str, error: str) -> None:
+        """Record a failed attempt by the task's current owner; retry it or give up."""
+
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET error = ?, status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (error, FAILED, PENDING, task_id, RUNNING, worker),
+            )
+
+    def results(self, task_ids: Sequence[str]) -> Dict[str, Tuple[str, Any, Optional[str]]]:
+        """Return ``(status, result, error)`` for each known task."""
+
+        found: Dict[str, Tuple[str, Any, Optional[str]]] = {}
+        ids = list(task_ids)
+        with self._connect() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                rows = conn.execute(
+                    f"SELECT id, status, result, error FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                for task_id, status, result, error in rows:
+                    found[task_id] = (status, json.loads(result) if result is not None else None, error)
+        return found
+
+    def purge(self, task_ids: Iterable[str]) -> None:
+        with self._transaction() as conn:
+            conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+
+WorkQueue = Union[LocalQueue, SQLiteQueue]
+
+
+class Worker:
+    """Claim tasks from a queue, run them, and post their results.
+
+    Args:
+        queue: Queue to drain.
+        worker_id: Unique name; defaults to ``host:pid:random``.
+        lease_seconds: Lease length; it is renewed every third of it while a task runs.
+        steal_after: When idle, re-run another worker's task that has been
+            running this long (None disables stealing).
+        executor: Runs the handlers (e.g. a process pool); None runs them inline.
+        poll_interval: Sleep between claims while the queue is empty.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 60.0,
+        steal_after: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        poll_interval: float = 0.2,
+    ):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.steal_after = steal_after
+        self.executor = executor
+        self.poll_interval = poll_interval
+
+    def run_once(self) -> bool:
+        """Claim and run one task; False when nothing was claimable."""
+
+        task = self.queue.claim(self.worker_id, self.lease_seconds, self.steal_after)
+        if task is None:
+            return False
+        stop = threading.Event()
+
+        def _heartbeat() -> None:
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.queue.renew(task.id, self.worker_id, self.lease_seconds):
+                    return
+
+        heartbeat = threading.Thread(target=_heartbeat, name=f"lease-{task.id}", daemon=True)
+        heartbeat.start()
+        try:
+            if self.executor is not None:
+                result = self.executor.submit(execute_task, task.kind, task.payload).result()
+            else:
+                result = execute_task(task.kind, task.payload)
+            self.queue.complete(task.id, self.worker_id, result)
+        except Exception as exc:
+            self.queue.fail(task.id, self.worker_id, f"{type(exc).__name__}: {exc}")
+        finally:
+            stop.set()
+            heartbeat.join()
+        return True
+
+    def run(self, idle_timeout: Optional[float] = 0.0, stop: Optional[threading.Event] = None) -> int:
+        """Process tasks until ``stop`` is set or the queue stays empty for ``idle_timeout`` seconds.
+
+        ``idle_timeout=None`` keeps polling forever. Returns the number of tasks run.
+        """
+
+        processed = 0
+        idle_since = time.monotonic()
+        while stop is None or not stop.is_set():
+            if self.run_once():
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(self.poll_interval)
+        return processed
+
+
+def gather(
+    queue: WorkQueue,
+    task_ids: Sequence[str],
+    timeout: Optional[float] = None,
+    poll_interval: float = 0.2,
+    purge: bool = True,
+) -> List[Any]:
+    """Wait for the tasks to finish and return their results in ``task_ids`` order.
+
+    Raises:
+        TaskFailed: A task exhausted its attempts.
+        TimeoutError: ``timeout`` seconds passed first.
+    """
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        states = queue.results(task_ids)
+        missing = [task_id for task_id in task_ids if task_id not in states]
+        if missing:
+            raise KeyError(f"Unknown task(s): {', '.join(missing[:5])}")
+        for task_id in task_ids:
+            status, _, error = states[task_id]
+            if status == FAILED:
+                raise TaskFailed(task_id, error or "unknown error")
+        if all(states[task_id][0] == DONE for task_id in task_ids):
+            if purge:
+                queue.purge(task_ids)
+            return [states[task_id][1] for task_id in task_ids]
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"{sum(s[0] != DONE for s in states.values())} task(s) still unfinished.")
+        time.sleep(poll_interval)
+
+
+class _ProcessPool(Executor):
+    """Process pool that can kill its workers.
+
+    :class:`ProcessPoolExecutor` can only wait for running calls, and it waits
+    for them again at interpreter exit, so a straggler whose task was stolen
+    would keep the caller alive. ``shutdown(wait=False)`` here terminates the
+    workers instead and fails the calls they were running.
+    """
+
+    def __init__(self, processes: int):
+        self._pool = multiprocessing.Pool(processes)
+        self._running: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            self._running.add(future)
+
+        def _settle(result: Any = None, error: Optional[BaseException] = None) -> None:
+            with self._lock:
+                if future not in self._running:
+                    return
+                self._running.discard(future)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def _fail(error: BaseException) -> None:
+            _settle(error=error)
+
+        self._pool.apply_async(fn, args, kwargs, callback=_settle, error_callback=_fail)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if wait and not cancel_futures:
+            self._pool.close()
+            self._pool.join()
+            return
+        self._pool.terminate()
+        with self._lock:
+            running, self._running = self._running, set()
+        for future in running:
+            future.set_exception(RuntimeError("The process pool was shut down before the task finished."))
+
+
+def run_local(
+    tasks: Sequence[Task],
+    queue: Optional[WorkQueue] = None,
+    workers: Optional[int] = None,
+    processes: bool = True,
+    lease_seconds: float = 60.0,
+    steal_after: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """Run tasks on this machine and return their results in order.
+
+    ``workers`` threads (default: the core count) drain the queue. With
+    ``processes`` they hand each task to a shared process pool, so CPU-bound
+    handlers use every core. Otherwise handlers run on the threads themselves,
+    which suits subprocess-bound work such as lint shards.
+
+    Results are returned as soon as every task has one. The pool's workers
+    are then killed, so a straggler whose task was stolen stops too. Handlers
+    running on threads cannot be killed; they finish in the background on
+    daemon threads (lint shards stop at their own deadline).
+
+    Raises:
+        TaskFailed: A task exhausted its attempts.
+        TimeoutError: ``timeout`` seconds passed first; the unfinished tasks are purged from the queue.
+    """
+
+    queue = queue if queue is not None else LocalQueue()
+    task_ids = queue.put(tasks)
+    expires_at = time.monotonic() + timeout if timeout is not None else None
+    count = max(1, min(workers or os.cpu_count() or 1, len(task_ids)))
+    pool = _ProcessPool(count) if processes and task_ids else None
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=Worker(queue, f"local-{os.getpid()}-{index}", lease_seconds, steal_after, pool).run,
+            args=(None, stop),
+            name=f"work-queue-{index}",
+            daemon=True,
+        )
+        for index in range(count)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            states = queue.results(task_ids)
+            if all(states[task_id][0] in (DONE, FAILED) for task_id in task_ids):
+                break
+            if expires_at is not None and time.monotonic() >= expires_at:
+                break
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    try:
+        return gather(queue, task_ids, timeout=0)
+    except TimeoutError:
+        queue.purge(task_ids)
+        raise
+
+
+def _batched(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    if size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class LintJob:
+    """Lint shards for a :class:`LintTester`; honours the agent's :class:`LintCache`.
+
+    Every shard shares the agent's remaining time budget as one wall-clock
+    deadline, fixed when the job is created, so a shard that starts late gets
+    what is left of the budget rather than a fresh one. Shards cut off by the
+    deadline show up as a truncated report.
+
+    Args:
+        agent: Supplies the command, cache, time budget, and report format.
+        paths: Files or directories to lint.
+        shards: Number of shards (defaults to the agent's ``workers``).
+    """
+
+    def __init__(self, agent: LintTester, paths: Iterable[str | Path], shards: Optional[int] = None):
+        self.agent = agent
+        self.plan = agent.plan(paths, shards)
+        self.expires_at = time.time() + agent.active_deadline().remaining()
+
+    def tasks(self) -> List[Task]:
+        return [
+            Task("lint_shard", {"command": list(self.agent.command), "files": batch, "expires_at": self.expires_at})
+            for batch in self.plan.batches
+        ]
+
+    def report(self, results: Sequence[Mapping[str, Any]]) -> str:
+        return self.agent.report(self.plan, [ProcessResult(**result) for result in results])
+
+
+class DriftJob:
+    """Manifest batches for :meth:`DependencySteward.detect_drift`."""
+
+    def __init__(self, agent: DependencySteward, manifests: Iterable[Mapping[str, str]], batch_size: int = 1000):
+        self.agent = agent
+        self.batches = [list(batch) for batch in _batched([dict(m) for m in manifests], batch_size)]
+
+    def tasks(self) -> List[Task]:
+        return [Task("manifest_batch", {"manifests": batch}) for batch in self.batches]
+
+    def report(self, results: Sequence[Mapping[str, List[str]]]) -> str:
+        consolidated: Dict[str, set[str]] = {}
+        for result in results:
+            for package, versions in result.items():
+                consolidated.setdefault(package, set()).update(versions)
+        return self.agent.report_drift(consolidated)
+
+
+class AdvisoryJob:
+    """Spec batches for :meth:`DependencySteward.flag_insecure`.
+
+    Args:
+        agent: Supplies the report format.
+        advisories: Package -> vulnerable versions (each batch carries only its
+            packages' entries), or the path of an index written by
+            :meth:`AdvisoryIndex.save`, which workers must be able to read.
+        specs: Dependencies to check.
+        batch_size: Specs per task.
+    """
+
+    def __init__(
+        self,
+        agent: DependencySteward,
+        advisories: Mapping[str, List[str]] | str | Path,
+        specs: Iterable[DependencySpec],
+        batch_size: int = 5000,
+    ):
+        self.agent = agent
+        self.specs = [[spec.name, spec.version, spec.source] for spec in specs]
+        self.batch_size = batch_size
+        if isinstance(advisories, (str, Path)):
+            self.index_path: Optional[str] = str(Path(advisories).resolve())
+            self.advisories: Dict[str, List[str]] = {}
+        else:
+            self.index_path = None
+            self.advisories = {}
+            for package, entries in advisories.items():
+                self.advisories.setdefault(canonical_name(package), []).extend(entries)
+
+    def tasks(self) -> List[Task]:
+        tasks = []
+        for batch in _batched(self.specs, self.batch_size):
+            payload: Dict[str, Any] = {"specs": list(batch)}
+            if self.index_path is not None:
+                payload["index"] = self.index_path
+            else:
+                names = {canonical_name(name) for name, _, _ in batch}
+                payload["advisories"] = {name: self.advisories[name] for name in names if name in self.advisories}
+            tasks.append(Task("advisory_batch", payload))
+        return tasks
+
+    def report(self, results: Sequence[List[str]]) -> str:
+        return self.agent.report_insecure(itertools.chain.from_iterable(results))
+
+
+class ClaimJob:
+    """Claim batches for :meth:`HallucinationSentinel.verify_claims`.
+
+    Claims without explicit evidence are searched in a persisted
+    :class:`EvidenceIndex`: ``index_path``, or the agent's own index when it
+    has a ``path``. Workers open the index file themselves.
+    """
+
+    def __init__(
+        self,
+        agent: HallucinationSentinel,
+        claims: Iterable[str],
+        evidence: Optional[Mapping[str, List[str]]] = None,
+        index_path: str | Path | None = None,
+        threshold: float = 0.5,
+        top_k: int = 3,
+        batch_size: int = 500,
+    ):
+        if index_path is None and agent.evidence_index is not None:
+            if agent.evidence_index.path is None:
+                raise ValueError("Distributed claim checks need a persisted EvidenceIndex (one opened with a path).")
+            index_path = agent.evidence_index.path
+        self.agent = agent
+        self.claims = list(claims)
+        self.evidence = dict(evidence or {})
+        self.index_path = str(Path(index_path).resolve()) if index_path is not None else None
+        self.threshold = threshold
+        self.top_k = top_k
+        self.batch_size = batch_size
+
+    def tasks(self) -> List[Task]:
+        return [
+            Task("claim_batch", {
+                "claims": list(batch),
+                "evidence": {claim: self.evidence[claim] for claim in batch if claim in self.evidence},
+                "index": self.index_path,
+                "threshold": self.threshold,
+                "top_k": self.top_k,
+            })
+            for batch in _batched(self.claims, self.batch_size)
+        ]
+
+    def report(self, results: Sequence[List[Optional[str]]]) -> str:
+        summary_lines: List[str] = []
+        missing: List[str] = []
+        for claim, support in zip(self.claims, itertools.chain.from_iterable(results)):
+            if support is None:
+                missing.append(claim)
+            else:
+                summary_lines.append(support)
+        return self.agent.report_claims(summary_lines, missing)
+
+
+Job = Union[LintJob, DriftJob, AdvisoryJob, ClaimJob]
+
+
+def run_job(job: Job, queue: Optional[WorkQueue] = None, workers: Optional[int] = None, **options: Any) -> str:
+    """Run a job's tasks locally (see :func:`run_local`) and return the agent's report.
+
+    Lint shards run on worker threads, since each one is a subprocess already;
+    other jobs use a process pool unless ``processes=False`` is passed.
+
+    The run is bounded by the agent's time budget, plus a short grace so lint
+    shards killed at their deadline can still report a truncated run. Past it,
+    :class:`TimeoutError` is raised; pass ``timeout=None`` to wait for every task.
+    """
+
+    if isinstance(job, LintJob):
+        remaining = job.expires_at - time.time()
+    else:
+        remaining = job.agent.active_deadline().remaining()
+    options.setdefault("timeout", max(0.0, remaining) + _TIMEOUT_GRACE_SECONDS)
+    options.setdefault("processes", not isinstance(job, LintJob))
+    return job.report(run_local(job.tasks(), queue=queue, workers=workers, **options))
+
+
+@task_handler("lint_shard")
+def _lint_shard(payload: Dict[str, Any]) -> Dict[str, Any]:
+    deadline = Deadline.after(max(0.0, payload["expires_at"] - time.time()))
+    result = LintTester(command=payload["command"]).lint_batch(payload["files"], deadline)
+    return {"returncode": result.returncode, "stdout": result.stdout, "stderr": result.stderr,
+            "timed_out": result.timed_out, "truncated": result.truncated}
+
+
+@task_handler("manifest_batch")
+def _manifest_batch(payload: Dict[str, Any]) -> Dict[str, List[str]]:
+    consolidated = DependencySteward.consolidate(payload["manifests"])
+    return {package: sorted(versions) for package, versions in consolidated.items()}
+
+
+@lru_cache(maxsize=4)
+def _load_advisories(path: str) -> AdvisoryIndex:
+    return AdvisoryIndex.load(path)
+
+
+@task_handler("advisory_batch")
+def _advisory_batch(payload: Dict[str, Any]) -> List[str]:
+    if "index" in payload:
+        index = _load_advisories(payload["index"])
+    else:
+        index = AdvisoryIndex.from_mapping(payload["advisories"])
+    specs = (DependencySpec(*spec) for spec in payload["specs"])
+    return [finding.message for finding in DependencySteward().iter_insecure(index, specs)]
+
+
+@lru_cache(maxsize=4)
+def _open_evidence(path: str) -> EvidenceIndex:
+    return EvidenceIndex(path)
+
+
+@task_handler("claim_batch")
+def _claim_batch(payload: Dict[str, Any]) -> List[Optional[str]]:
+    index = _open_evidence(payload["index"]) if payload.get("index") else None
+    return [
+        HallucinationSentinel.claim_support(claim, payload["evidence"], index, payload["threshold"], payload["top_k"])
+        for claim in payload["claims"]
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m agents.work_queue", description="Work-queue worker.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="Drain a shared SQLite queue.")
+    worker.add_argument("queue", type=Path, help="Queue database file.")
+    worker.add_argument("--processes", type=int, default=1, help="Handler processes (default: 1, run inline).")
+    worker.add_argument("--lease", type=float, default=60.0, help="Lease length in seconds.")
+    worker.add_argument("--steal-after", type=float, default=None, help="Steal tasks running this many seconds.")
+    worker.add_argument("--idle-timeout", type=float, default=None, help="Exit after this many idle seconds.")
+    worker.add_argument("--no-wal", action="store_true", help="Use rollback journaling (network filesystems).")
+    args = parser.parse_args(argv)
+
+    queue = SQLiteQueue(args.queue, wal=not args.no_wal)
+    pool = ProcessPoolExecutor(max_workers=args.processes) if args.processes > 1 else None
+    stop = threading.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    threads = [
+        threading.Thread(
+            target=Worker(queue, f"{prefix}:{index}", args.lease, args.steal_after, pool).run,
+            args=(args.idle_timeout, stop),
+        )
+        for index in range(max(1, args.processes))
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)  # a timed join keeps Ctrl-C responsive
+    except KeyboardInterrupt:
+        # Let running tasks finish; unfinished ones are re-leased once their leases expire.
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return 130
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""Scaling benchmarks for the agent suite.
+
+Run ``python -m benchmarks`` from the repository root. Every case builds its
+workload from a seeded generator, then records throughput and peak traced
+memory. Results can be saved as a JSON baseline and compared on later runs;
+the command exits non-zero when a case regresses past the threshold.
+"""
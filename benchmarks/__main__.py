@@ -0,0 +1,49 @@
+"""Command-line entry point: ``python -m benchmarks [options]``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .cases import CASES
+from .runner import format_result, load_baseline, measure, regressions, save_baseline
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the agent scaling benchmarks.")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all). Available: {', '.join(CASES)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every workload size (e.g. 0.01).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the fastest counts.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the workload generators.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression as a fraction.")
+    parser.add_argument("--update", action="store_true", help="Record the results as the new baseline.")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    failures = 0
+    for name in args.cases or CASES:
+        result = measure(CASES[name], scale=args.scale, repeat=args.repeat, seed=args.seed)
+        results.append(result)
+        print(format_result(result, baseline.get(name)), flush=True)
+        for problem in regressions(result, baseline.get(name), args.threshold):
+            failures += 1
+            print(f"  REGRESSION: {problem}", flush=True)
+
+    if args.update:
+        print(f"Baseline written to {save_baseline(args.baseline, results)}")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Benchmark case registry.
+
+A case's ``setup`` builds the workload (untimed) and returns the callable to
+measure. ``size`` is the number of items that callable processes at scale 1.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from agents import (
+    AdvisoryIndex,
+    APIDocsmith,
+    DependencySteward,
+    EvidenceIndex,
+    HallucinationSentinel,
+    LintTester,
+    SOCIIGuardian,
+    TDDEnforcer,
+    TestFileIndex,
+)
+
+from . import generators
+
+Workload = Callable[[], Any]
+
+# Reports a finding for every seventh file passed on the command line, in ruff's output format.
+_STUB_LINT = (
+    "import sys\n"
+    "for index, path in enumerate(sys.argv[1:]):\n"
+    "    if index % 7 == 0:\n"
+    "        print(f'{path}:1:1: F401 `os` imported but unused')\n"
+    "sys.exit(1 if len(sys.argv) > 1 else 0)\n"
+)
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark: a named workload of ``size`` items at scale 1."""
+
+    name: str
+    size: int
+    setup: Callable[[random.Random, int, Path], Workload]
+    description: str = ""
+
+
+def _detect_drift(rng: random.Random, size: int, workdir: Path) -> Workload:
+    manifests = generators.manifests(rng, size)
+    steward = DependencySteward()
+    return lambda: steward.detect_drift(manifests)
+
+
+def _flag_insecure(rng: random.Random, size: int, workdir: Path) -> Workload:
+    advisories, specs = generators.advisories_and_specs(rng, size)
+    steward = DependencySteward()
+    # Index construction is part of the measured call, as it is for a plain mapping.
+    return lambda: steward.flag_insecure(AdvisoryIndex.from_mapping(advisories), specs)
+
+
+def _review_ports(rng: random.Random, size: int, workdir: Path) -> Workload:
+    services = list(generators.service_ports(rng, size))
+    guardian = SOCIIGuardian()
+    return lambda: guardian.review_ports(services)
+
+
+def _verify_claims(rng: random.Random, size: int, workdir: Path) -> Workload:
+    claims, evidence, corpus = generators.claims_and_evidence(rng, size, snippets=size * 20)
+    # No query cache, so repeated runs keep hitting the index.
+    index = EvidenceIndex(query_cache_size=0)
+    index.add_many(corpus)
+    sentinel = HallucinationSentinel(evidence_index=index)
+    return lambda: sentinel.verify_claims(claims, evidence)
+
+
+def _tdd_review(rng: random.Random, size: int, workdir: Path, indexed: bool) -> Workload:
+    root = workdir / "tree"
+    code_files = generators.source_tree(rng, root, size)
+    changed = rng.sample(code_files, max(1, size // 10))
+
+    def _run() -> str:
+        # A fresh index per run, so the measurement includes the full tree walk.
+        enforcer = TDDEnforcer(test_index=TestFileIndex(root) if indexed else None)
+        return enforcer.review(changed)
+
+    return _run
+
+
+def _generate_markdown(rng: random.Random, size: int, workdir: Path) -> Workload:
+    endpoints = generators.endpoints(rng, size)
+    output = workdir / "api.md"
+    docsmith = APIDocsmith()
+
+    def _run() -> str:
+        # Drop the splice manifest so every run renders the full reference.
+        output.with_name(output.name + ".manifest.json").unlink(missing_ok=True)
+        return docsmith.generate_markdown(endpoints, output)
+
+    return _run
+
+
+def _lint(rng: random.Random, size: int, workdir: Path) -> Workload:
+    files = generators.lint_files(rng, workdir / "lint", size)
+    tester = LintTester(command=(sys.executable, "-c", _STUB_LINT), workers=4)
+    return lambda: tester.run(files)
+
+
+CASES: Dict[str, Case] = {
+    case.name: case
+    for case in (
+        Case("dependency_detect_drift", 100_000, _detect_drift, "DependencySteward.detect_drift, 100k manifests"),
+        Case("dependency_flag_insecure", 100_000, _flag_insecure, "DependencySteward.flag_insecure, 100k specs"),
+        Case("socii_review_ports", 1_000_000, _review_ports, "SOCIIGuardian.review_ports, 1M services"),
+        Case("sentinel_verify_claims", 2_000, _verify_claims, "HallucinationSentinel.verify_claims, 40k snippets"),
+        Case(
+            "tdd_review_indexed",
+            50_000,
+            partial(_tdd_review, indexed=True),
+            "TDDEnforcer.review with a cold TestFileIndex, 50k-file tree",
+        ),
+        Case(
+            "tdd_review_probing",
+            50_000,
+            partial(_tdd_review, indexed=False),
+            "TDDEnforcer.review probing the filesystem, 50k-file tree",
+        ),
+        Case("docsmith_generate_markdown", 10_000, _generate_markdown, "APIDocsmith.generate_markdown, 10k endpoints"),
+        Case("lint_tester_stub", 5_000, _lint, "LintTester.run with a stub lint command, 5k files"),
+    )
+}
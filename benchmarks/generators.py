@@ -0,0 +1,163 @@
+"""Seeded synthetic workloads for the benchmark cases.
+
+Every generator takes a :class:`random.Random` so a given seed always yields
+the same data, keeping runs comparable with their baselines.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from agents.infra_scan import ServicePort
+from agents.lockfiles import DependencySpec
+
+_WORDS = (
+    "account", "audit", "billing", "cache", "cluster", "config", "deploy", "event", "export", "gateway",
+    "health", "invoice", "ledger", "metric", "network", "order", "payment", "policy", "queue", "report",
+    "schema", "search", "session", "storage", "tenant", "token", "upload", "user", "webhook", "worker",
+)
+_ENVIRONMENTS = (None, "prod", "staging", "dev")
+
+
+def package_names(rng: random.Random, count: int) -> List[str]:
+    return [f"{rng.choice(_WORDS)}-{rng.choice(_WORDS)}-{index}" for index in range(count)]
+
+
+def version(rng: random.Random) -> str:
+    return f"{rng.randint(0, 4)}.{rng.randint(0, 20)}.{rng.randint(0, 30)}"
+
+
+def manifests(rng: random.Random, count: int, packages: int = 2000, per_manifest: int = 40) -> List[Dict[str, str]]:
+    """Manifests pinning overlapping packages; roughly one pin in ten drifts."""
+
+    names = package_names(rng, packages)
+    canonical = {name: version(rng) for name in names}
+    result: List[Dict[str, str]] = []
+    for _ in range(count):
+        chosen = rng.sample(names, per_manifest)
+        result.append({name: version(rng) if rng.random() < 0.1 else canonical[name] for name in chosen})
+    return result
+
+
+def advisories_and_specs(
+    rng: random.Random, count: int, packages: int = 5000
+) -> Tuple[Dict[str, List[str]], List[DependencySpec]]:
+    """Advisories mixing exact versions and ranges, plus ``count`` specs to check against them."""
+
+    names = package_names(rng, packages)
+    advisories: Dict[str, List[str]] = {}
+    for name in rng.sample(names, packages // 5):
+        entries = [version(rng) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.5:
+            entries.append(f">={rng.randint(0, 2)}.0,<{rng.randint(3, 4)}.{rng.randint(0, 9)}")
+        advisories[name] = entries
+    specs = [DependencySpec(rng.choice(names), version(rng), f"svc-{index % 500}/requirements.txt")
+             for index in range(count)]
+    return advisories, specs
+
+
+def service_ports(rng: random.Random, count: int) -> Iterator[ServicePort]:
+    """Services on a skewed port mix: mostly web ports, some plaintext and denied ones."""
+
+    common = (443, 443, 443, 8443, 80, 8080, 5432, 6379, 21, 23, 9090)
+    for index in range(count):
+        port = rng.choice(common) if rng.random() < 0.9 else rng.randint(1, 65535)
+        yield ServicePort(f"svc-{index}", port, rng.random() < 0.8, rng.choice(_ENVIRONMENTS))
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Distinct pseudo-words built from syllables."""
+
+    syllables = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "dra", "pel", "qua", "ster", "bin", "gor")
+    words: Dict[str, None] = {}
+    while len(words) < size:
+        words["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))] = None
+    return list(words)
+
+
+def claims_and_evidence(
+    rng: random.Random, claims: int, snippets: int, vocabulary_size: int = 20000
+) -> Tuple[List[str], Dict[str, List[str]], List[Tuple[str, str, str]]]:
+    """Claims (half with explicit citations) and an evidence corpus that supports some of the rest.
+
+    Words follow a Zipf-like distribution over a synthetic vocabulary, as in natural text.
+    """
+
+    words = vocabulary(rng, vocabulary_size)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary_size + 1)))
+
+    def _text(count: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=weights, k=count))
+
+    corpus = [(f"doc-{index}", _text(rng.randint(8, 40)), f"doc-{index // 20}.md") for index in range(snippets)]
+    claim_texts: List[str] = []
+    evidence: Dict[str, List[str]] = {}
+    for index in range(claims):
+        if rng.random() < 0.3:
+            # Paraphrase part of a snippet so the index has something to find.
+            snippet = rng.choice(corpus)[1].split()
+            claim = " ".join(snippet[: rng.randint(5, len(snippet))])
+        else:
+            claim = _text(rng.randint(5, 12))
+        claim = f"{claim} ({index})"
+        claim_texts.append(claim)
+        if index % 2 == 0:
+            evidence[claim] = [f"[{rng.randint(1, 99)}]"]
+    return claim_texts, evidence, corpus
+
+
+def source_tree(rng: random.Random, root: Path, files: int, test_ratio: float = 0.3) -> List[Path]:
+    """Write a package tree of empty modules; about ``test_ratio`` of modules get a test file.
+
+    Returns the code files, in creation order.
+    """
+
+    code_files: List[Path] = []
+    per_dir = 50
+    for index in range(files):
+        package = root / "src" / f"pkg{index // (per_dir * 20)}" / f"mod{index // per_dir}"
+        tests = root / "tests" / f"pkg{index // (per_dir * 20)}" / f"mod{index // per_dir}"
+        if index % per_dir == 0:
+            package.mkdir(parents=True, exist_ok=True)
+            tests.mkdir(parents=True, exist_ok=True)
+        name = f"{rng.choice(_WORDS)}_{index}"
+        code = package / f"{name}.py"
+        code.touch()
+        code_files.append(code)
+        if rng.random() < test_ratio:
+            (tests / f"test_{name}.py").touch()
+    return code_files
+
+
+def endpoints(rng: random.Random, count: int) -> List[Dict[str, str]]:
+    methods = ("GET", "POST", "PUT", "PATCH", "DELETE")
+    return [
+        {
+            "name": f"{sentence(rng, 2).title()} {index}",
+            "method": rng.choice(methods),
+            "path": f"/v1/{rng.choice(_WORDS)}/{index}",
+            "description": sentence(rng, rng.randint(10, 60)),
+        }
+        for index in range(count)
+    ]
+
+
+def lint_files(rng: random.Random, root: Path, files: int) -> List[Path]:
+    """Small Python files for the stub lint command."""
+
+    paths: List[Path] = []
+    for index in range(files):
+        directory = root / f"pkg{index // 100}"
+        if index % 100 == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{rng.choice(_WORDS)}_{index}.py"
+        path.write_text(f"def {rng.choice(_WORDS)}_{index}():\n    return {index}\n")
+        paths.append(path)
+    return paths
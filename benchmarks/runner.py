@@ -0,0 +1,131 @@
+"""Measure benchmark cases and compare them against a JSON baseline."""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from agents.storage import atomic_write_text
+
+from .cases import Case
+
+_BASELINE_VERSION = 1
+
+
+@dataclass
+class Result:
+    """Measurements for one case.
+
+    Attributes:
+        name: Case name.
+        items: Items processed per run.
+        seconds: Fastest wall time over the repeats.
+        throughput: ``items / seconds``.
+        peak_bytes: Peak traced Python allocation during one extra, traced run.
+    """
+
+    name: str
+    items: int
+    seconds: float
+    throughput: float
+    peak_bytes: int
+
+
+def measure(case: Case, scale: float = 1.0, repeat: int = 3, seed: int = 0) -> Result:
+    """Build the case's workload with a seeded RNG, then time it and trace its peak memory."""
+
+    items = max(1, int(case.size * scale))
+    with tempfile.TemporaryDirectory(prefix=f"bench-{case.name}-") as workdir:
+        workload = case.setup(random.Random(seed), items, Path(workdir))
+        timings: List[float] = []
+        for _ in range(max(1, repeat)):
+            gc.collect()
+            started = time.perf_counter()
+            workload()
+            timings.append(time.perf_counter() - started)
+        # Tracing slows allocation-heavy code down, so it gets a run of its own.
+        gc.collect()
+        tracemalloc.start()
+        try:
+            workload()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    seconds = min(timings)
+    return Result(case.name, items, seconds, items / seconds if seconds else float("inf"), peak)
+
+
+def load_baseline(path: str | Path) -> Dict[str, Dict[str, Any]]:
+    """Return ``{case name: recorded result}``; empty when missing or from another format version."""
+
+    try:
+        payload = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if payload.get("version") != _BASELINE_VERSION:
+        return {}
+    return payload.get("results", {})
+
+
+def save_baseline(path: str | Path, results: Iterable[Result], merge: bool = True) -> Path:
+    """Write results as the new baseline, keeping recorded cases that were not re-run when ``merge``."""
+
+    path = Path(path)
+    recorded = load_baseline(path) if merge else {}
+    recorded.update({result.name: asdict(result) for result in results})
+    payload = {
+        "version": _BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": dict(sorted(recorded.items())),
+    }
+    atomic_write_text(path, json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def regressions(result: Result, baseline: Optional[Dict[str, Any]], threshold: float) -> List[str]:
+    """Describe how ``result`` regressed past ``threshold`` (a fraction) relative to its baseline entry.
+
+    Results measured at a different item count are not comparable and never regress.
+    """
+
+    if not baseline or baseline.get("items") != result.items:
+        return []
+    problems: List[str] = []
+    floor = baseline["throughput"] * (1 - threshold)
+    if result.throughput < floor:
+        problems.append(
+            f"throughput {result.throughput:,.0f}/s is below {floor:,.0f}/s "
+            f"(baseline {baseline['throughput']:,.0f}/s)"
+        )
+    ceiling = baseline["peak_bytes"] * (1 + threshold)
+    if result.peak_bytes > ceiling:
+        problems.append(
+            f"peak memory {_mib(result.peak_bytes)} exceeds {_mib(ceiling)} (baseline {_mib(baseline['peak_bytes'])})"
+        )
+    return problems
+
+
+def _mib(size: float) -> str:
+    return f"{size / (1 << 20):.1f} MiB"
+
+
+def format_result(result: Result, baseline: Optional[Dict[str, Any]] = None) -> str:
+    line = (
+        f"{result.name:<28} {result.items:>9,} items  {result.seconds:8.3f}s  "
+        f"{result.throughput:>12,.0f}/s  peak {_mib(result.peak_bytes):>11}"
+    )
+    if baseline and baseline.get("items") == result.items and baseline.get("throughput"):
+        change = result.throughput / baseline["throughput"] - 1
+        line += f"  ({change:+.1%} vs baseline)"
+    return line
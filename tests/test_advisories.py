@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from agents.advisories import AdvisoryIndex, version_key
+
+
+def test_version_ordering_follows_pep440():
+    ordered = ["1.0.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0.post1", "1.1"]
+    assert sorted(ordered, key=version_key) == ordered
+    assert version_key("1.0") == version_key("1.0.0")
+
+
+def test_specifier_sets_keep_every_clause():
+    index = AdvisoryIndex.from_mapping({"pkg": ["1.0, 1.1, >=2.0,<2.5", "3.0", "~=4.1", "==5.*"]})
+
+    for version in ["1.0", "1.1", "2.0", "2.4.9", "3.0", "4.1", "4.9", "5.3"]:
+        assert index.is_vulnerable("pkg", version), version
+    for version in ["1.2", "2.5", "3.1", "6.0", "4.0"]:
+        assert not index.is_vulnerable("pkg", version), version
+
+
+def test_entries_that_are_not_specifiers_are_matched_verbatim():
+    index = AdvisoryIndex.from_mapping({"pkg": ["1.0 beta", ">= 2.0 , < 2.1", ""]})
+
+    assert index.is_vulnerable("pkg", "1.0 beta")
+    assert index.is_vulnerable("pkg", "2.0.5")
+    assert not index.is_vulnerable("pkg", "1.0")
+
+
+def test_not_equal_alone_flags_nothing():
+    index = AdvisoryIndex.from_mapping({"pkg": ["!=1.0"]})
+
+    assert not index.is_vulnerable("pkg", "1.0")
+    assert not index.is_vulnerable("pkg", "2.0")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = AdvisoryIndex.from_mapping({"Django": ["3.2.1", ">=4.0,<4.1.2"], "left-pad": ["1.0.0"]})
+    path = tmp_path / "advisories.idx"
+    index.save(path)
+    loaded = AdvisoryIndex.load(path)
+
+    assert loaded.is_vulnerable("django", "3.2.1")
+    assert loaded.is_vulnerable("django", "4.1.1")
+    assert not loaded.is_vulnerable("django", "4.1.2")
+    assert loaded.is_vulnerable("left-pad", "1.0.0")
+    assert [p.name for p in tmp_path.iterdir()] == ["advisories.idx"]
+
+    path.write_bytes(b"AIDX1\n" + b"\x00")
+    with pytest.raises(ValueError):
+        AdvisoryIndex.load(path)
+
+
+def test_saved_index_is_json_and_rejects_other_payloads(tmp_path):
+    index = AdvisoryIndex.from_mapping({"pkg": [">=1.0.0-beta.2,<1.2rc1", "<0.5", ">=9"]})
+    path = tmp_path / "advisories.idx"
+    index.save(path)
+    magic, _, body = path.read_bytes().partition(b"\n")
+    loaded = AdvisoryIndex.load(path)
+
+    assert magic == b"AIDX3"
+    assert sorted(json.loads(body)) == ["exact", "ranges"]
+    for version, vulnerable in [("1.0.0-beta.2", True), ("1.1.9", True), ("1.2", False), ("0.1", True), ("10", True)]:
+        assert loaded.is_vulnerable("pkg", version) is vulnerable, version
+
+    malformed = {"exact": {}, "ranges": {"pkg": [[[1.5], True, None, False]]}}
+    path.write_bytes(magic + b"\n" + json.dumps(malformed).encode())
+    with pytest.raises(ValueError, match="malformed"):
+        AdvisoryIndex.load(path)
+    path.write_bytes(b"AIDX2\n" + b"\x80\x04N.")  # an older pickle payload is never unpickled
+    with pytest.raises(ValueError):
+        AdvisoryIndex.load(path)
+
+
+def test_malformed_wildcards_are_skipped_and_recorded():
+    index = AdvisoryIndex.from_mapping({"pkg": ["==1.0rc.*", "~=2", "==3.*", "~=1!4.1"]})
+
+    assert index.invalid == [("pkg", "==1.0rc.*"), ("pkg", "~=2")]
+    assert index.is_vulnerable("pkg", "3.9")
+    assert index.is_vulnerable("pkg", "1!4.5")
+    assert not index.is_vulnerable("pkg", "1!5.0")
+    assert not index.is_vulnerable("pkg", "1.0rc1")
+
+
+def test_osv_dump_is_filtered_to_one_ecosystem(tmp_path):
+    records = {
+        "PYSEC-1.json": {"affected": [{"package": {"ecosystem": "PyPI", "name": "request"},
+                                       "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"},
+                                                                                  {"fixed": "2.0"}]}]}]},
+        "GHSA-1.json": {"affected": [{"package": {"ecosystem": "npm", "name": "request"}, "versions": ["9.9.9"],
+                                      "ranges": [{"type": "SEMVER", "events": [{"introduced": "3.0.0"},
+                                                                              {"last_affected": "3.5.0"}]}]}]},
+    }
+    for name, record in records.items():
+        (tmp_path / name).write_text(json.dumps(record))
+
+    pypi = AdvisoryIndex.from_osv(tmp_path, ecosystem="PyPI")
+    npm = AdvisoryIndex.from_osv(tmp_path, ecosystem="npm")
+
+    assert pypi.is_vulnerable("request", "1.5") and not pypi.is_vulnerable("request", "3.1.0")
+    assert npm.is_vulnerable("request", "3.5.0") and npm.is_vulnerable("request", "9.9.9")
+    assert not npm.is_vulnerable("request", "1.5")
+    with pytest.raises(TypeError):
+        AdvisoryIndex.from_osv(tmp_path)
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from agents.ai_delegate import AIDelegate, SimulatedGenerator
+from agents.delegate_cache import CachingAIDelegate
+
+
+def test_enhance_with_coroutine_generator_inside_a_running_loop():
+    sim = SimulatedGenerator(latency_seconds=0)
+    delegate = AIDelegate(generator=sim.agenerate)
+
+    async def main():
+        return delegate.enhance("line")
+
+    assert asyncio.run(main()).endswith("- line")
+    assert delegate.enhance("line").endswith("- line")
+
+
+def test_enhance_many_coalesces_duplicates_and_keeps_order():
+    sim = SimulatedGenerator(latency_seconds=0.01)
+    results = AIDelegate(generator=sim).enhance_many(["a", "b", "a", ("b", ["ctx"])])
+
+    assert [r.splitlines()[-1] for r in results] == ["- a", "- b", "- a", "- b"]
+    assert sim.calls == 3
+
+
+def test_batch_generator_must_return_one_result_per_request():
+    delegate = AIDelegate(batch_generator=lambda requests: ["only one"])
+
+    with pytest.raises(ValueError):
+        delegate.enhance_many(["a", "b"])
+
+
+def test_caching_covers_batch_sync_and_async_paths():
+    sim = SimulatedGenerator(latency_seconds=0, batch_overhead_seconds=0, per_item_seconds=0)
+    delegate = CachingAIDelegate(generator=sim.agenerate, batch_generator=sim.batch, generator_id="sim")
+
+    first = delegate.enhance_many(["a", "b", "c"])
+    assert sim.batch_calls == 1
+
+    assert delegate.enhance_many(["a", "b", "c", "d"]) == [*first, delegate.enhance("d")]
+    assert (sim.batch_calls, sim.calls) == (1, 1)  # only "d" was generated, as a batch of one
+
+    async def main():
+        return await asyncio.gather(delegate.enhance_async("a"), delegate.enhance_async("e"))
+
+    cached_a, fresh_e = asyncio.run(main())
+    assert cached_a == first[0]
+    assert sim.calls == 2
+    assert delegate.enhance("e") == fresh_e
+    assert sim.calls == 2
+
+
+def test_sync_generator_async_path_is_cached():
+    sim = SimulatedGenerator(latency_seconds=0)
+    delegate = CachingAIDelegate(generator=sim, generator_id="sim")
+
+    async def main():
+        return [await delegate.enhance_async("x") for _ in range(3)]
+
+    assert len(set(asyncio.run(main()))) == 1
+    assert sim.calls == 1
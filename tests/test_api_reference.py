@@ -0,0 +1,107 @@
+import os
+import threading
+
+from agents.api_reference import HEADER, iter_openapi_endpoints, manifest_path_for, render_endpoint, write_reference
+
+
+def _endpoints(count, changed=()):
+    return [
+        {
+            "name": f"Endpoint {i}",
+            "method": "GET",
+            "path": f"/items/{i}",
+            "description": "Changed." if i in changed else f"Returns item {i}.",
+        }
+        for i in range(count)
+    ]
+
+
+def _full(endpoints):
+    return HEADER + "".join(render_endpoint(endpoint) for endpoint in endpoints)
+
+
+def test_rebuild_only_renders_changed_sections(tmp_path):
+    output = tmp_path / "docs" / "api.md"
+    first = write_reference(_endpoints(20), output)
+    assert first.rendered == 20
+    assert manifest_path_for(output).exists()
+
+    again = write_reference(_endpoints(20), output)
+    assert again.unchanged
+    assert again.reused == 20
+
+    changed = _endpoints(19, changed={3, 15})
+    build = write_reference(changed, output)
+    assert (build.rendered, build.reused, build.removed) == (2, 17, 1)
+    assert build.bytes_copied > 0
+    assert output.read_text() == _full(changed)
+
+
+def test_edited_output_invalidates_the_manifest(tmp_path):
+    output = tmp_path / "api.md"
+    write_reference(_endpoints(3), output)
+    output.write_text("hand edited\n")
+
+    build = write_reference(_endpoints(3), output)
+    assert build.rendered == 3
+    assert output.read_text() == _full(_endpoints(3))
+
+
+def test_staging_files_are_unique_and_cleaned_up(tmp_path):
+    output = tmp_path / "api.md"
+    errors = []
+
+    def build(index):
+        try:
+            for round_ in range(10):
+                write_reference(_endpoints(30, changed={index, round_}), output, tmp_path / f"manifest-{index}.json")
+        except Exception as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    threads = [threading.Thread(target=build, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert output.read_text() in {_full(_endpoints(30, changed={i, 9})) for i in range(4)}
+    assert sorted(os.listdir(tmp_path)) == ["api.md", *(f"manifest-{i}.json" for i in range(4))]
+
+
+def test_rebuild_without_posix_only_calls_honours_the_umask(tmp_path, monkeypatch):
+    output = tmp_path / "api.md"
+    write_reference(_endpoints(10), output)
+    for name in ("pread", "fchmod", "copy_file_range"):
+        monkeypatch.delattr(os, name, raising=False)
+    previous = os.umask(0o027)
+    try:
+        build = write_reference(_endpoints(10, changed={4}), output)
+    finally:
+        os.umask(previous)
+
+    assert (build.rendered, build.reused) == (1, 9)
+    assert output.read_text() == _full(_endpoints(10, changed={4}))
+    assert output.stat().st_mode & 0o777 == 0o640
+
+
+def test_iter_openapi_endpoints_reads_operations():
+    spec = {
+        "info": {"version": "2.1"},
+        "paths": {
+            "/users": {
+                "description": "User collection.",
+                "get": {"summary": "List users ", "tags": ["users"]},
+                "post": {"operationId": "createUser", "description": "Create a user."},
+                "parameters": [],
+            },
+        },
+    }
+
+    endpoints = list(iter_openapi_endpoints(spec))
+    assert [(e["name"], e["method"], e["description"]) for e in endpoints] == [
+        ("List users", "GET", "User collection."),
+        ("createUser", "POST", "Create a user."),
+    ]
+    assert endpoints[0]["tags"] == "users"
+    assert endpoints[0]["version"] == "2.1"
@@ -0,0 +1,72 @@
+import sys
+import threading
+import time
+
+from agents import base
+from agents.base import BaseAgent
+from agents.config import AGENTS
+from agents.lint_tester import LintTester
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def test_concurrent_operations_keep_their_own_deadline():
+    agent = BaseAgent(config=AGENTS["lint_tester"])
+    barrier = threading.Barrier(2, timeout=5)
+    seen = {}
+
+    def call(minutes):
+        def _operation():
+            barrier.wait()  # both calls are in flight before either reads its deadline
+            return f"{agent.active_deadline().budget:g}|{agent.budget_minutes():g}"
+
+        seen[minutes] = agent.run_with_deadline(minutes=minutes, operation=_operation)
+
+    threads = [threading.Thread(target=call, args=(m,)) for m in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {1: "60|1", 2: "120|2"}
+    assert agent.budget_minutes() == AGENTS["lint_tester"].time_limit_minutes
+
+
+def test_run_command_is_killed_at_the_operation_deadline():
+    agent = BaseAgent(config=AGENTS["lint_tester"])
+    started = time.monotonic()
+    report = agent.run_with_deadline(minutes=0.01, operation=lambda: str(agent.run_command(SLEEP).timed_out))
+
+    assert report == "True"
+    assert time.monotonic() - started < 10
+
+
+def test_truncation_messages_quote_the_override(monkeypatch):
+    monkeypatch.setattr(base, "_CANCEL_GRACE_SECONDS", 0.05)
+    agent = BaseAgent(config=AGENTS["lint_tester"])
+    report = agent.run_with_deadline(minutes=0.005, operation=lambda: time.sleep(1) or "late")
+
+    assert report.startswith("Agent 'Lint Tester' exceeded the 0.005-minute budget")
+
+    lint = LintTester(command=SLEEP)
+    report = lint.run_with_deadline(minutes=0.005, operation=lambda: lint._format(0, "", timed_out=True))
+    assert report.startswith("Linting truncated at the 0.005-minute deadline")
+
+
+def test_sharded_lint_batches_share_the_operation_deadline(tmp_path, monkeypatch):
+    monkeypatch.setattr("agents.lint_tester.os.cpu_count", lambda: 4)
+    files = []
+    for index in range(4):
+        path = tmp_path / f"m{index}.py"
+        path.write_text("x = 1\n")
+        files.append(str(path))
+    lint = LintTester(command=SLEEP, workers=4)
+    started = time.monotonic()
+
+    def _operation():
+        return str(all(result.timed_out for result in lint._lint_batches(lint.plan(files).batches)))
+
+    report = lint.run_with_deadline(minutes=0.01, operation=_operation)
+
+    assert report == "True"
+    assert time.monotonic() - started < 10
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from benchmarks import __main__ as cli
+from benchmarks.cases import CASES, Case
+from benchmarks.runner import Result, format_result, load_baseline, measure, regressions, save_baseline
+
+
+def _case(name="tiny", size=100):
+    def _setup(rng, items, workdir):
+        data = [rng.random() for _ in range(items)]
+        (workdir / "marker").write_text("x")
+        return lambda: sorted(data)
+
+    return Case(name, size, _setup)
+
+
+def _result(name="tiny", items=100, throughput=1000.0, peak_bytes=1 << 20):
+    return Result(name, items, items / throughput, throughput, peak_bytes)
+
+
+def test_measure_scales_items_and_records_time_and_memory():
+    result = measure(_case(size=1000), scale=0.05, repeat=2)
+
+    assert result.name == "tiny"
+    assert result.items == 50
+    assert result.seconds > 0
+    assert result.throughput == pytest.approx(50 / result.seconds)
+    assert result.peak_bytes > 0
+    assert measure(_case(size=10), scale=0.001, repeat=1).items == 1
+
+
+def test_baseline_round_trip_merges_and_checks_version(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_baseline(path, [_result("a"), _result("b")])
+    save_baseline(path, [_result("b", throughput=5.0)])
+
+    recorded = load_baseline(path)
+    assert sorted(recorded) == ["a", "b"]
+    assert recorded["b"]["throughput"] == 5.0
+    assert sorted(load_baseline(save_baseline(path, [_result("c")], merge=False))) == ["c"]
+    assert [p.name for p in tmp_path.iterdir()] == ["baseline.json"]
+
+    payload = json.loads(path.read_text())
+    payload["version"] = 0
+    path.write_text(json.dumps(payload))
+    assert load_baseline(path) == {}
+    assert load_baseline(tmp_path / "missing.json") == {}
+
+
+def test_regressions_flag_throughput_and_memory_past_the_threshold():
+    baseline = {"items": 100, "throughput": 1000.0, "peak_bytes": 1 << 20}
+
+    assert regressions(_result(throughput=800.0), baseline, 0.25) == []
+    (slow,) = regressions(_result(throughput=700.0), baseline, 0.25)
+    assert slow.startswith("throughput 700/s is below 750/s")
+    (heavy,) = regressions(_result(peak_bytes=2 << 20), baseline, 0.25)
+    assert heavy == "peak memory 2.0 MiB exceeds 1.2 MiB (baseline 1.0 MiB)"
+    assert regressions(_result(items=50, throughput=1.0), baseline, 0.25) == []
+    assert regressions(_result(throughput=1.0), None, 0.25) == []
+
+
+def test_format_result_compares_against_matching_baseline():
+    baseline = {"items": 100, "throughput": 1000.0, "peak_bytes": 1}
+
+    assert "(+10.0% vs baseline)" in format_result(_result(throughput=1100.0), baseline)
+    assert "vs baseline" not in format_result(_result(items=10), baseline)
+
+
+def test_cli_records_a_baseline_then_fails_on_regression(tmp_path, monkeypatch, capsys):
+    speed = {"throughput": 1000.0}
+
+    def _measure(case, scale, repeat, seed):
+        return _result(case.name, throughput=speed["throughput"])
+
+    monkeypatch.setattr(cli, "CASES", {"tiny": _case()})
+    monkeypatch.setattr(cli, "measure", _measure)
+    baseline = tmp_path / "baseline.json"
+
+    assert cli.main(["--baseline", str(baseline), "--update"]) == 0
+    assert load_baseline(baseline)["tiny"]["throughput"] == 1000.0
+    assert cli.main(["--baseline", str(baseline)]) == 0
+
+    speed["throughput"] = 500.0
+    assert cli.main(["--baseline", str(baseline), "--threshold", "0.25"]) == 1
+    assert "REGRESSION: throughput 500/s" in capsys.readouterr().out
+    assert cli.main(["--baseline", str(baseline), "--threshold", "0.6"]) == 0
+    with pytest.raises(SystemExit):
+        cli.main(["nope"])
+
+
+@pytest.mark.parametrize("name", ["docsmith_generate_markdown", "sentinel_verify_claims"])
+def test_registered_cases_run_at_a_small_scale(name):
+    result = measure(CASES[name], scale=0.002, repeat=1)
+
+    assert result.items == max(1, int(CASES[name].size * 0.002))
+    assert result.throughput > 0
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import stat
+import threading
+
+import pytest
+
+from agents.daemon import __main__ as cli
+from agents.daemon.client import INVALID_PARAMS, METHOD_NOT_FOUND, DaemonClient, DaemonError, default_socket_path
+from agents.daemon.server import AgentDaemon
+
+
+class _Echo:
+    def summarize_changes(self, changelog):
+        return f"{len(changelog)} change(s)"
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = tmp_path / "run" / "d.sock"
+    server = AgentDaemon(socket_path, agents={"api_docsmith": _Echo()})
+    modes = {}
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    with DaemonClient(socket_path, timeout=5) as client:
+        for _ in range(200):
+            try:
+                client.call("daemon.ping")
+                break
+            except OSError:
+                threading.Event().wait(0.01)
+        modes["socket"] = stat.S_IMODE(os.stat(socket_path).st_mode)
+        modes["directory"] = stat.S_IMODE(os.stat(socket_path.parent).st_mode)
+        yield client, modes
+        client.call("daemon.shutdown")
+    thread.join(5)
+    assert not socket_path.exists()
+
+
+def test_calls_exposed_methods_and_rejects_bad_requests(daemon):
+    client, _ = daemon
+
+    assert client.call("api_docsmith.summarize_changes", changelog=["a", "b"]) == "2 change(s)"
+    with pytest.raises(DaemonError) as missing:
+        client.call("api_docsmith.__init__")
+    assert missing.value.code == METHOD_NOT_FOUND
+    with pytest.raises(DaemonError) as invalid:
+        client.call("api_docsmith.summarize_changes", nope=1)
+    assert invalid.value.code == INVALID_PARAMS
+
+
+def test_socket_is_created_private(daemon):
+    _, modes = daemon
+
+    assert modes == {"socket": 0o600, "directory": 0o700}
+
+
+def test_bind_runs_under_a_restrictive_umask(tmp_path, monkeypatch):
+    seen = []
+    real_start = asyncio.start_unix_server
+
+    async def start(*args, **kwargs):
+        current = os.umask(0)
+        os.umask(current)
+        seen.append(current)
+        return await real_start(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "start_unix_server", start)
+    server = AgentDaemon(tmp_path / "d.sock")
+
+    async def _serve_once():
+        task = asyncio.create_task(server.serve())
+        while server._stopping is None or server._server is None:
+            await asyncio.sleep(0.01)
+        server._stopping.set()
+        await task
+
+    before = os.umask(0o022)
+    try:
+        asyncio.run(_serve_once())
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(before)
+    assert seen == [0o177]
+
+
+def test_fallback_socket_lives_in_a_private_per_user_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr("tempfile.gettempdir", lambda: str(tmp_path))
+    path = default_socket_path()
+
+    assert path.parent == tmp_path / f"my-coding-agents-{os.getuid()}"
+    AgentDaemon()._claim_socket()
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+
+    os.chmod(path.parent, 0o777)
+    with pytest.raises(PermissionError):
+        AgentDaemon()._claim_socket()
+    with pytest.raises(PermissionError):
+        DaemonClient().call("daemon.ping")
+
+
+def test_cli_requires_params_to_be_a_json_object(capsys):
+    for params in ("[1, 2]", "3", "not json"):
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(["call", "daemon.ping", params])
+        assert exit_info.value.code == 2
+    assert "params must be a JSON object" in capsys.readouterr().err
+
+
+def test_cli_reports_an_unreachable_daemon(tmp_path, capsys):
+    assert cli.main(["--socket", str(tmp_path / "none.sock"), "ping"]) == 2
+    assert "Cannot reach the daemon" in capsys.readouterr().err
@@ -0,0 +1,85 @@
+import functools
+
+import pytest
+
+from agents.ai_delegate import SimulatedGenerator
+from agents.delegate_cache import CachingAIDelegate, generator_identity
+
+CALLS = []
+
+
+def shout(report, context=None):
+    CALLS.append(report)
+    return report.upper()
+
+
+def whisper(report, context=None, suffix="..."):
+    return report.lower() + suffix
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+def test_module_level_generator_is_memoized():
+    delegate = CachingAIDelegate(generator=shout)
+
+    assert delegate.enhance("hi", ["lint"]) == "HI"
+    assert delegate.enhance("hi", ["lint"]) == "HI"
+    assert delegate.enhance("hi", ["tests"]) == "HI"
+    assert CALLS == ["hi", "hi"]
+    assert delegate.stats.hits == 1
+
+
+@pytest.mark.parametrize(
+    "generator",
+    [
+        lambda report, context=None: report,
+        functools.partial(whisper, suffix="!"),
+        SimulatedGenerator(latency_seconds=0).agenerate,
+        SimulatedGenerator(latency_seconds=0),
+    ],
+    ids=["lambda", "partial", "bound-method", "callable-instance"],
+)
+def test_generators_without_a_stable_name_need_an_explicit_identity(generator):
+    with pytest.raises(ValueError, match="generator_id"):
+        generator_identity(generator)
+    with pytest.raises(ValueError):
+        CachingAIDelegate(generator=generator)
+
+    assert CachingAIDelegate(generator=generator, generator_id="model-a").cache_key("r") != CachingAIDelegate(
+        generator=generator, generator_id="model-b"
+    ).cache_key("r")
+
+
+def test_partials_with_different_arguments_do_not_share_a_store(tmp_path):
+    store = tmp_path / "ai.db"
+    bang = CachingAIDelegate(generator=functools.partial(whisper, suffix="!"), generator_id="bang", store_path=store)
+    dots = CachingAIDelegate(generator=functools.partial(whisper, suffix="..."), generator_id="dots", store_path=store)
+
+    assert bang.enhance("Hi") == "hi!"
+    assert dots.enhance("Hi") == "hi..."
+
+
+def test_store_is_shared_and_entries_expire(tmp_path):
+    now = [1000.0]
+    store = tmp_path / "ai.db"
+    CachingAIDelegate(generator=shout, store_path=store, clock=lambda: now[0]).enhance("a")
+    reader = CachingAIDelegate(generator=shout, store_path=store, ttl_seconds=60, clock=lambda: now[0])
+
+    assert reader.enhance("a") == "A"
+    assert CALLS == ["a"]
+    now[0] += 120
+    assert reader.enhance("a") == "A"
+    assert CALLS == ["a", "a"]
+    assert reader.stats.expirations == 1
+
+
+def test_batch_generator_is_part_of_the_identity():
+    with pytest.raises(ValueError):
+        CachingAIDelegate(generator=shout, batch_generator=lambda requests: [r for r, _ in requests])
+
+    assert CachingAIDelegate(generator=shout).cache_key("r") != CachingAIDelegate(
+        generator=shout, batch_generator=whisper
+    ).cache_key("r")
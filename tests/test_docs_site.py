@@ -0,0 +1,105 @@
+import json
+import os
+
+from agents.api_docsmith import APIDocsmith
+from agents.docs_site import MANIFEST_NAME, build_site, partition
+
+
+def _endpoint(name, path, tags="", version="", description="Does a thing."):
+    return {"name": name, "method": "GET", "path": path, "tags": tags, "version": version, "description": description}
+
+
+def _manifest(output_dir):
+    return json.loads((output_dir / MANIFEST_NAME).read_text())
+
+
+def _documents(output_dir):
+    manifest = _manifest(output_dir)
+    return [doc for block in manifest["search"]["doc_blocks"] for doc in json.loads((output_dir / block).read_text())]
+
+
+def test_partition_by_version_and_tag():
+    endpoints = [_endpoint("a", "/a", "users, admin", "v1"), _endpoint("b", "/b")]
+
+    assert sorted(partition(endpoints)) == [("latest", "default"), ("v1", "admin"), ("v1", "users")]
+
+
+def test_build_writes_pages_search_shards_and_manifest(tmp_path):
+    endpoints = [
+        _endpoint("List users", "/users", "users", "v1", "Returns every user."),
+        _endpoint("Get order", "/orders/1", "orders", "v1", "Returns one order."),
+    ]
+    build = build_site(endpoints, tmp_path, workers=1)
+
+    assert (build.pages, build.pages_written, build.endpoints) == (2, 2, 2)
+    manifest = _manifest(tmp_path)
+    pages = {(page["version"], page["tag"]): page["path"] for page in manifest["pages"]}
+    assert "## List users" in (tmp_path / pages[("v1", "users")]).read_text()
+    shard = json.loads((tmp_path / manifest["search"]["shards"]["us"]).read_text())
+    (doc_id,) = shard["users"]
+    assert _documents(tmp_path)[doc_id][:3] == ["List users", "GET", "/users"]
+
+
+def test_rebuild_skips_unchanged_pages_and_removes_stale_artifacts(tmp_path):
+    endpoints = [_endpoint("A", "/a", "one"), _endpoint("B", "/b", "two")]
+    build_site(endpoints, tmp_path, workers=1)
+    assert build_site(endpoints, tmp_path, workers=1).pages_written == 0
+
+    build = build_site(endpoints[:1], tmp_path, workers=1)
+    assert build.removed > 0
+    listed = {page["path"] for page in _manifest(tmp_path)["pages"]}
+    on_disk = {p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.md")}
+    assert on_disk == listed
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith(".tmp")]
+
+
+def test_rebuild_never_deletes_outside_the_output_dir(tmp_path):
+    site = tmp_path / "site"
+    outside = tmp_path / "keep.txt"
+    outside.write_text("precious")
+    build_site([_endpoint("A", "/a", "one")], site, workers=1)
+    manifest = _manifest(site)
+    manifest["pages"].append({"version": "x", "tag": "y", "path": "../keep.txt", "endpoints": 1})
+    manifest["search"]["doc_blocks"].append(str(outside))
+    (site / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    build_site([_endpoint("A", "/a", "one")], site, workers=1)
+
+    assert outside.read_text() == "precious"
+
+
+def test_duplicate_headings_get_distinct_anchors(tmp_path):
+    endpoints = [
+        _endpoint("Get item", "/a", "items"),
+        _endpoint("Get item", "/b", "items"),
+        _endpoint("Get item", "/c", "items"),
+        _endpoint("items API (latest)", "/d", "items"),
+        _endpoint("Get item", "/e", "other"),
+    ]
+    build_site(endpoints, tmp_path, workers=1)
+
+    anchors = {(doc[3], doc[2]): doc[4] for doc in _documents(tmp_path)}
+    pages = [page["tag"] for page in _manifest(tmp_path)["pages"]]
+    items, other = pages.index("items"), pages.index("other")
+    assert [anchors[(items, path)] for path in ("/a", "/b", "/c", "/d")] == [
+        "get-item",
+        "get-item-1",
+        "get-item-2",
+        "items-api-latest-1",
+    ]
+    assert anchors[(other, "/e")] == "get-item"
+
+
+def test_parallel_build_matches_serial_build(tmp_path):
+    endpoints = [_endpoint(f"Op {i}", f"/op/{i}", f"tag{i % 3}", f"v{i % 2}") for i in range(30)]
+    build_site(endpoints, tmp_path / "serial", workers=1)
+    build_site(endpoints, tmp_path / "parallel", workers=2)
+
+    assert (tmp_path / "serial" / MANIFEST_NAME).read_bytes() == (tmp_path / "parallel" / MANIFEST_NAME).read_bytes()
+
+
+def test_agent_builds_site_from_openapi_spec(tmp_path):
+    spec = {"paths": {"/ping": {"get": {"summary": "Ping", "tags": ["health"]}}}}
+
+    report = APIDocsmith().build_site(spec, tmp_path, workers=1)
+    assert "1 page(s) for 1 endpoint(s)" in report
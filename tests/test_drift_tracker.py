@@ -0,0 +1,66 @@
+import random
+
+from agents.dependency_steward import DependencySteward
+from agents.drift_tracker import DriftTracker
+
+
+def _recompute(manifests):
+    versions = {}
+    for manifest in manifests.values():
+        for package, version in manifest.items():
+            versions.setdefault(package, set()).add(version)
+    return {package: tuple(sorted(v)) for package, v in sorted(versions.items()) if len(v) > 1}
+
+
+def test_upsert_and_remove_report_transitions():
+    tracker = DriftTracker()
+    assert not tracker.upsert("a", {"requests": "2.31.0", "idna": "3.4"})
+
+    delta = tracker.upsert("b", {"requests": "2.30.0", "idna": "3.4"})
+    assert delta.introduced == {"requests": ("2.30.0", "2.31.0")}
+
+    delta = tracker.upsert("c", {"requests": "2.29.0"})
+    assert delta.changed == {"requests": ("2.29.0", "2.30.0", "2.31.0")}
+
+    tracker.remove("b")
+    delta = tracker.remove("c")
+    assert delta.resolved == {"requests": ("2.31.0",)}
+    assert tracker.drifting() == {}
+    assert len(tracker) == 1 and "a" in tracker and "c" not in tracker
+    assert not tracker.remove("missing")
+
+
+def test_apply_unpins_with_none():
+    tracker = DriftTracker()
+    tracker.load([("a", {"x": "1"}), ("b", {"x": "2"})])
+
+    delta = tracker.apply("b", {"x": None, "y": "1"})
+
+    assert delta.resolved == {"x": ("1",)}
+    assert tracker.drifting() == {}
+
+
+def test_incremental_state_matches_full_recomputation():
+    rng = random.Random(7)
+    tracker = DriftTracker()
+    manifests = {}
+    for _ in range(500):
+        manifest_id = f"m{rng.randrange(20)}"
+        if rng.random() < 0.2:
+            tracker.remove(manifest_id)
+            manifests.pop(manifest_id, None)
+        else:
+            manifest = {f"p{rng.randrange(8)}": f"1.{rng.randrange(3)}" for _ in range(rng.randrange(1, 6))}
+            tracker.upsert(manifest_id, manifest)
+            manifests[manifest_id] = manifest
+        assert tracker.drifting() == _recompute(manifests)
+
+
+def test_steward_reports_only_the_drift_a_manifest_changed():
+    steward = DependencySteward()
+    steward.track_manifest("svc-a", {"requests": "2.31.0"})
+
+    report = steward.track_manifest("svc-b", {"requests": "2.30.0"})
+
+    assert report.startswith("Version drift introduced:\n- requests: 2.30.0, 2.31.0")
+    assert steward.track_manifest("svc-b", {"requests": "2.30.0"}) == "No drift changes detected."
@@ -0,0 +1,78 @@
+import os
+
+from agents.evidence_index import EvidenceIndex
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_search_ranks_matching_snippets_and_tolerates_misspellings():
+    index = EvidenceIndex()
+    index.add("a", "The scheduler retries failed jobs with exponential backoff.")
+    index.add("b", "Configuration lives in a TOML file.")
+
+    assert [match.doc_id for match in index.search("failed jobs are retried")][:1] == ["a"]
+    assert index.search("schedular backof")[0].doc_id == "a"
+    assert index.remove("a") == 1
+    assert "a" not in index
+    assert all(match.doc_id != "a" for match in index.search("scheduler"))
+
+
+def test_sync_directory_only_rereads_changed_files(tmp_path):
+    docs = tmp_path / "docs"
+    _write(docs / "guide.md", "First paragraph.\n\nSecond paragraph.")
+    _write(docs / "notes.txt", "Notes.")
+    _write(docs / ".hidden" / "skip.md", "Hidden.")
+    index = EvidenceIndex()
+
+    assert index.sync_directory(docs) == (2, 0)
+    assert f"{docs.as_posix()}/guide.md#2" in index
+    assert len(index) == 3
+    assert index.sync_directory(docs) == (0, 0)
+
+    _write(docs / "guide.md", "Rewritten paragraph with more words.")
+    (docs / "notes.txt").unlink()
+    assert index.sync_directory(docs) == (1, 1)
+    assert len(index) == 1
+
+
+def test_sync_directory_leaves_other_roots_alone(tmp_path):
+    _write(tmp_path / "docs" / "README.md", "Docs readme about deployment.")
+    _write(tmp_path / "handbook" / "README.md", "Handbook readme about onboarding.")
+    index = EvidenceIndex()
+
+    assert index.sync_directory(tmp_path / "docs") == (1, 0)
+    assert index.sync_directory(tmp_path / "handbook") == (1, 0)
+    assert index.sync_directory(tmp_path / "docs") == (0, 0)
+    assert len(index) == 2
+    assert index.search("onboarding")[0].source == (tmp_path / "handbook" / "README.md").as_posix()
+
+    (tmp_path / "handbook" / "README.md").unlink()
+    assert index.sync_directory(tmp_path / "handbook") == (0, 1)
+    assert [match.doc_id for match in index.search("deployment")] == [f"{(tmp_path / 'docs').as_posix()}/README.md#1"]
+
+
+def test_sync_directory_keys_sources_by_the_root_as_given(tmp_path, monkeypatch):
+    _write(tmp_path / "docs" / "guide.md", "Guide.")
+    monkeypatch.chdir(tmp_path)
+    index = EvidenceIndex()
+
+    index.sync_directory("docs/")
+    assert "docs/guide.md#1" in index
+
+
+def test_persisted_index_resumes_incremental_sync(tmp_path):
+    docs = tmp_path / "docs"
+    _write(docs / "a.md", "Alpha paragraph.")
+    _write(docs / "b.md", "Beta paragraph.")
+    db = tmp_path / "cache" / "evidence.db"
+    assert EvidenceIndex(db).sync_directory(docs) == (2, 0)
+
+    os.remove(docs / "b.md")
+    reopened = EvidenceIndex(db)
+    assert len(reopened) == 2
+    assert reopened.sync_directory(docs) == (0, 1)
+    assert len(EvidenceIndex(db)) == 1
+    assert EvidenceIndex(db).sync_directory(docs) == (0, 0)
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from agents.first_prompt_trigger import FirstPromptTrigger
+
+
+def test_requires_callbacks():
+    with pytest.raises(ValueError):
+        FirstPromptTrigger([])
+
+
+def test_call_runs_callbacks_once():
+    calls = []
+    trigger = FirstPromptTrigger([lambda p: calls.append(p) or f"a:{p}", lambda p: f"b:{p}"])
+
+    assert trigger("hello") == ["a:hello", "b:hello"]
+    assert trigger.fired
+    assert trigger("again") == []
+    assert calls == ["hello"]
+
+
+def test_submit_runs_callbacks_concurrently_in_callback_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def callback(name):
+        def _run(prompt):
+            barrier.wait()  # deadlocks unless all three run at the same time
+            return f"{name}:{prompt}"
+
+        return _run
+
+    trigger = FirstPromptTrigger([callback("a"), callback("b"), callback("c")])
+    futures = trigger.submit("go")
+
+    assert [future.result(timeout=5) for future in futures] == ["a:go", "b:go", "c:go"]
+    assert trigger.submit("go") == []
+
+
+def test_submit_isolates_failing_callback():
+    def broken(prompt):
+        raise RuntimeError("boom")
+
+    futures = FirstPromptTrigger([broken, lambda p: "ok"]).submit("x")
+
+    with pytest.raises(RuntimeError):
+        futures[0].result(timeout=5)
+    assert futures[1].result(timeout=5) == "ok"
+
+
+def test_stream_yields_in_completion_order_and_reports_failures():
+    def slow(prompt):
+        time.sleep(0.2)
+        return "slow"
+
+    def broken(prompt):
+        raise ValueError("bad")
+
+    reports = list(FirstPromptTrigger([slow, lambda p: "fast", broken]).stream("x"))
+
+    assert reports[-1] == "slow"
+    assert "fast" in reports
+    assert any(report.startswith("Callback failed: ValueError") for report in reports)
+
+
+def test_exactly_once_across_entry_points_under_contention():
+    calls = []
+    trigger = FirstPromptTrigger([lambda p: calls.append(p) or p])
+    threads = [threading.Thread(target=trigger, args=(str(i),)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert trigger.submit("late") == []
+    assert list(trigger.stream("late")) == []
@@ -0,0 +1,67 @@
+import pytest
+
+from agents.impact_analysis import ImportGraph, TestImpactAnalyzer
+from agents.tdd_enforcer import TDDEnforcer
+
+FILES = {
+    "pkg/__init__.py": "",
+    "pkg/core.py": "VALUE = 1\n",
+    "pkg/util.py": "from pkg.core import VALUE\n",
+    "pkg/settings.yaml": "debug: true\n",
+    "tests/test_util.py": "from pkg import util\n",
+    "tests/test_other.py": "import json\n",
+}
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    for rel, text in FILES.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+    return TestImpactAnalyzer(ImportGraph(tmp_path), coverage_map={"tests/test_other.py": ["pkg/data.py"]})
+
+
+def test_selects_tests_reaching_a_changed_module(analyzer, tmp_path):
+    selection = analyzer.select(["pkg/core.py"])
+
+    assert selection.tests == [(tmp_path / "tests/test_util.py").as_posix()]
+
+
+def test_non_python_change_runs_the_full_suite(analyzer):
+    selection = analyzer.select(["pkg/core.py", "pkg/settings.yaml"])
+
+    assert selection.tests is None
+    assert "pkg/settings.yaml" in selection.reason
+
+
+def test_unknown_module_runs_the_full_suite(analyzer):
+    assert analyzer.select(["pkg/deleted.py"]).tests is None
+
+
+def test_module_known_only_to_the_coverage_map_narrows(analyzer, tmp_path):
+    assert analyzer.select(["pkg/data.py"]).tests == [(tmp_path / "tests/test_other.py").as_posix()]
+
+
+@pytest.mark.parametrize(
+    "conftest",
+    ["from pkg.factory import make\n", "pytest_plugins = ['pkg.plugin']\n"],
+)
+def test_change_reaching_a_conftest_runs_the_full_suite(analyzer, tmp_path, conftest):
+    (tmp_path / "pkg/factory.py").write_text("def make():\n    return 1\n")
+    (tmp_path / "pkg/plugin.py").write_text("from pkg.factory import make\n")
+    (tmp_path / "tests/conftest.py").write_text(conftest)
+    (tmp_path / "tests/test_uses_fixture.py").write_text("def test_it(made):\n    assert made\n")
+
+    selection = analyzer.select(["pkg/factory.py"])
+
+    assert selection.tests is None
+    assert "tests/conftest.py" in selection.reason
+
+
+def test_enforcer_runs_everything_for_a_data_file_change(analyzer, tmp_path):
+    enforcer = TDDEnforcer(test_command=["true"], impact_analyzer=analyzer)
+
+    report = enforcer.review([tmp_path / "pkg/settings.yaml"], run_tests=True)
+
+    assert "Running the full test suite" in report
+    assert "skipped test execution" not in report
@@ -0,0 +1,110 @@
+import sys
+import textwrap
+
+import pytest
+
+from agents.lint_cache import LintCache, hash_configs
+from agents.lint_tester import LintTester, _attribute_output
+
+LINTER = textwrap.dedent(
+    """
+    import os, sys
+    log, paths = sys.argv[1], sys.argv[2:]
+    with open(log, "a") as handle:
+        handle.write(" ".join(os.path.basename(p) for p in paths) + "\\n")
+    found = 0
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"{path}:1:1: E902 No such file or directory")
+            found += 1
+        elif "bad" in open(path).read():
+            print(f"{path}:1:1: E001 bad code")
+            found += 1
+    print(f"Found {found} errors.")
+    sys.exit(1 if found else 0)
+    """
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "linter.py").write_text(LINTER)
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.py").write_text("bad = 1\n")
+    (src / "b.py").write_text("good = 1\n")
+    return tmp_path
+
+
+def _tester(project):
+    command = [sys.executable, str(project / "linter.py"), str(project / "calls.log")]
+    return LintTester(command=command, cache=LintCache(project / "cache" / "lint.db"))
+
+
+def _calls(project):
+    return (project / "calls.log").read_text().splitlines()
+
+
+def test_warm_report_matches_cold_report_including_summary(project):
+    cold = _tester(project).run([project / "src"])
+    warm = _tester(project).run([project / "src"])
+
+    assert warm == cold
+    assert "Found 1 errors." in cold
+    assert "a.py:1:1: E001 bad code" in cold
+    assert _calls(project) == ["a.py b.py"]
+
+
+def test_changed_lint_configuration_invalidates_cached_findings(project):
+    (project / "pyproject.toml").write_text("[tool.ruff]\nline-length = 100\n")
+    _tester(project).run([project / "src"])
+    (project / "pyproject.toml").write_text("[tool.ruff]\nline-length = 120\n")
+    _tester(project).run([project / "src"])
+    (project / "src" / "setup.cfg").write_text("[flake8]\n")
+    _tester(project).run([project / "src"])
+
+    assert _calls(project) == ["a.py b.py"] * 3
+
+
+def test_only_changed_files_are_relinted(project):
+    _tester(project).run([project / "src"])
+    (project / "src" / "b.py").write_text("bad = 2\n")
+    report = _tester(project).run([project / "src"])
+
+    assert _calls(project) == ["a.py b.py", "b.py"]
+    assert "a.py:1:1: E001" in report and "b.py:1:1: E001" in report
+
+
+def test_deleted_file_is_a_cache_miss(project):
+    missing = project / "src" / "gone.py"
+    report = _tester(project).run([missing])
+
+    assert "gone.py:1:1: E902" in report
+    assert _calls(project) == ["gone.py"]
+
+
+def test_hash_configs_covers_ancestor_directories(tmp_path):
+    nested = tmp_path / "pkg" / "sub"
+    nested.mkdir(parents=True)
+    before = hash_configs(nested)
+    (tmp_path / ".flake8").write_text("[flake8]\n")
+    memo = {}
+
+    assert hash_configs(nested, memo) != before
+    assert hash_configs(tmp_path / "pkg", memo) == memo[str(tmp_path / "pkg")]
+
+
+def test_summary_after_concise_findings_is_not_attributed_to_the_last_file():
+    output = "a.py:1:1: E1 first\nb.py:2:3: E2 second\nFound 2 errors.\n"
+    per_file, unattributed = _attribute_output(output, ["a.py", "b.py"])
+
+    assert per_file == {"a.py": ["a.py:1:1: E1 first"], "b.py": ["b.py:2:3: E2 second"]}
+    assert unattributed == ["Found 2 errors."]
+
+
+def test_code_frames_stay_with_their_finding():
+    output = "a.py:1:8: F401 unused\n  |\n1 | import os\n  |        ^^ F401\n  |\n  = help: remove\n\nFound 1 error.\n"
+    per_file, unattributed = _attribute_output(output, ["a.py"])
+
+    assert per_file["a.py"][:3] == ["a.py:1:8: F401 unused", "  |", "1 | import os"]
+    assert unattributed == ["Found 1 error."]
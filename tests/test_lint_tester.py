@@ -0,0 +1,116 @@
+import dataclasses
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from agents.lint_tester import LintTester
+from agents.metrics import Metrics
+
+LINTER = textwrap.dedent(
+    """
+    import sys
+    print("linter: using default configuration", file=sys.stderr)
+    for path in sys.argv[1:]:
+        text = open(path).read()
+        for row, line in enumerate(text.splitlines(), 1):
+            if "bad" in line:
+                print(f"{path}:{row}:1: E001 bad code")
+    sys.exit(1 if any("bad" in open(p).read() for p in sys.argv[1:]) else 0)
+    """
+)
+
+
+@pytest.fixture
+def files(tmp_path):
+    (tmp_path / "linter.py").write_text(LINTER)
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"m{index}.py"
+        path.write_text("bad = 1\nbad = 2\n" if index % 2 else "good = 1\n")
+        paths.append(str(path))
+    return tmp_path, paths
+
+
+def test_sharded_report_matches_unsharded_report(files, monkeypatch):
+    root, paths = files
+    command = [sys.executable, str(root / "linter.py")]
+    unsharded = LintTester(command=command).run(paths)
+    monkeypatch.setattr("agents.lint_tester.os.cpu_count", lambda: 4)
+    sharded = LintTester(command=command, workers=3).run(paths)
+
+    assert sharded == unsharded
+    assert sharded.count("linter: using default configuration") == 1
+    assert "exit 1" in sharded
+
+
+def test_findings_metric_counts_findings_not_files(files):
+    root, paths = files
+    tester = LintTester(command=[sys.executable, str(root / "linter.py")])
+    tester.metrics = Metrics(enabled=True)
+    plan = tester.plan(paths)
+    tester.report(plan, tester._lint_batches(plan.batches))
+
+    histograms = {metric: histogram for (metric, _), histogram in tester.metrics.histograms().items()}
+    assert histograms["findings"].total == 6
+    assert histograms["input_files"].total == 6
+
+
+def test_failed_batch_without_findings_is_reported_as_error(tmp_path):
+    crash = [sys.executable, "-c", "import sys; print('internal error: boom'); sys.exit(2)"]
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    tester = LintTester(command=crash)
+    plan = tester.plan([path])
+    report = tester.report(plan, tester._lint_batches(plan.batches))
+
+    assert "exit 2" in report
+    assert "internal error: boom" in report
+
+
+def test_expanded_runs_match_ruff_file_selection(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    for name in ("a.py", "b.pyi", "c.ipynb", "notes.txt"):
+        (tmp_path / "pkg" / name).write_text("")
+    tester = LintTester(workers=1)
+
+    assert tester.command == ("ruff", "check", "--force-exclude")
+    assert [Path(f).name for f in tester.plan([tmp_path / "pkg"]).files] == ["a.py", "b.pyi", "c.ipynb"]
+    assert LintTester(command=["ruff", "check", "--force-exclude"]).command == ["ruff", "check", "--force-exclude"]
+    assert LintTester(command=["flake8"]).command == ["flake8"]
+
+
+def test_iter_findings_streams_findings_without_failure_records(files):
+    root, paths = files
+    findings = list(LintTester(command=[sys.executable, str(root / "linter.py")]).iter_findings(paths))
+
+    assert len(findings) == 6
+    assert {(f.rule, f.severity, f.line) for f in findings} == {("E001", "warning", 1), ("E001", "warning", 2)}
+
+
+def test_iter_findings_reports_a_failed_batch(tmp_path):
+    crash = [sys.executable, "-c", "import sys; print('loading config'); print('internal error: boom'); sys.exit(2)"]
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+
+    (finding,) = LintTester(command=crash).iter_findings([str(path)])
+    assert (finding.rule, finding.severity) == ("lint-failed", "error")
+    assert "status 2" in finding.message
+    assert "loading config | internal error: boom" in finding.message
+
+
+def test_iter_findings_reports_the_deadline(tmp_path):
+    slow = [sys.executable, "-c", "import sys, time; print(sys.argv[1] + ':1:1: E001 bad', flush=True); time.sleep(30)"]
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    tester = LintTester(command=slow)
+    tester.config = dataclasses.replace(tester.config, time_limit_minutes=0.005)
+
+    started = time.monotonic()
+    findings = list(tester.iter_findings([str(path)]))
+    assert time.monotonic() - started < 5
+    assert [f.rule for f in findings] == ["E001", "lint-truncated"]
+    assert findings[1].severity == "error"
+    assert "1 of 1 path(s) were not fully linted" in findings[1].message
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from agents.dependency_steward import DependencySteward
+from agents.lockfiles import iter_json_scalars, iter_lockfile, iter_specs
+
+
+def _flatten(value, path=()):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, (*path, key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _flatten(item, (*path, index))
+    else:
+        yield path, value
+
+
+def test_json_scalars_match_the_stdlib_parser(tmp_path):
+    document = {
+        "name": 'quote " and \\ slash',
+        "nested": {"list": [1, -2.5, 3e2, [True, None], {"k": "v"}], "empty": {}, "unicode": "é"},
+        "flag": False,
+    }
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps(document, indent=2))
+
+    assert list(iter_json_scalars(path)) == list(_flatten(document))
+
+
+def test_empty_json_file_yields_nothing(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    assert list(iter_json_scalars(path)) == []
+
+
+def test_requirements_follow_continuations_and_skip_unpinned(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text(
+        "Django==4.2.1 \\\n    --hash=sha256:abc\nrequests>=2\nzope.interface[extra]===6.0 ; python_version>'3'\n"
+    )
+
+    assert [(s.name, s.version) for s in iter_lockfile(path)] == [("django", "4.2.1"), ("zope-interface", "6.0")]
+
+
+def test_poetry_pipfile_and_npm_lockfiles(tmp_path):
+    poetry = tmp_path / "poetry.lock"
+    poetry.write_text('[[package]]\nname = "Requests"\nversion = "2.31.0"\n\n[package.extras]\nx = "1"\n'
+                      '[[package]]\nname = "idna"\nversion = "3.4"\n\n[metadata]\nlock-version = "2.0"\n')
+    pipfile = tmp_path / "Pipfile.lock"
+    pipfile.write_text(json.dumps({"_meta": {"hash": {"sha256": "x"}}, "default": {"requests": {"version": "==2.30.0"}},
+                                   "develop": {"pytest": {"version": "==8.0.0"}}}))
+    npm = tmp_path / "package-lock.json"
+    npm.write_text(json.dumps({
+        "version": "1.0.0",
+        "packages": {"": {"version": "1.0.0"}, "node_modules/left-pad": {"version": "1.3.0"},
+                     "node_modules/a/node_modules/left-pad": {"version": "1.1.0"}},
+        "dependencies": {"lodash": {"version": "4.17.21", "dependencies": {"left-pad": {"version": "1.2.0"}}}},
+    }))
+
+    specs = {(s.name, s.version) for s in iter_specs([poetry, pipfile, npm])}
+    assert specs == {
+        ("requests", "2.31.0"), ("idna", "3.4"), ("requests", "2.30.0"), ("pytest", "8.0.0"),
+        ("left-pad", "1.3.0"), ("left-pad", "1.1.0"), ("lodash", "4.17.21"), ("left-pad", "1.2.0"),
+    }
+
+
+def test_unknown_manifest_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        iter_lockfile(tmp_path / "Cargo.lock")
+
+
+def test_reconcile_reports_drift_across_manifests(tmp_path):
+    (tmp_path / "requirements.txt").write_text("requests==2.31.0\nidna==3.4\n")
+    (tmp_path / "requirements-dev.txt").write_text("Requests==2.30.0\nidna==3.4\n")
+
+    report = DependencySteward().reconcile([tmp_path / "requirements.txt", tmp_path / "requirements-dev.txt"])
+
+    assert report == "Version drift detected:\n- requests: 2.30.0, 2.31.0"
+
+
+def _package_lock(path, packages):
+    path.write_text(json.dumps({"lockfileVersion": 3, "packages": {"": {}, **packages}}))
+    return path
+
+
+def test_reconcile_ignores_nested_duplicates_within_one_lockfile(tmp_path):
+    nested = {
+        "node_modules/debug": {"version": "4.3.4"},
+        "node_modules/send/node_modules/debug": {"version": "2.6.9"},
+    }
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    first = _package_lock(tmp_path / "a" / "package-lock.json", nested)
+    second = _package_lock(tmp_path / "b" / "package-lock.json", nested)
+    steward = DependencySteward()
+
+    assert steward.reconcile([first]) == "No version drift detected across manifests."
+    assert steward.reconcile([first, second]) == "No version drift detected across manifests."
+    _package_lock(second, {"node_modules/debug": {"version": "4.3.5"}})
+    assert steward.reconcile([first, second]) == "Version drift detected:\n- debug: 2.6.9, 4.3.4, 4.3.5"
+
+
+def test_reconcile_keeps_ecosystems_apart(tmp_path):
+    npm = _package_lock(tmp_path / "package-lock.json", {"node_modules/debug": {"version": "4.3.4"}})
+    (tmp_path / "requirements.txt").write_text("debug==0.3.2\n")
+    (tmp_path / "requirements-dev.txt").write_text("debug==0.3.1\n")
+    steward = DependencySteward()
+
+    assert steward.reconcile([npm, tmp_path / "requirements.txt"]) == "No version drift detected across manifests."
+    report = steward.reconcile([npm, tmp_path / "requirements.txt", tmp_path / "requirements-dev.txt"])
+    assert report == "Version drift detected:\n- debug (pypi): 0.3.1, 0.3.2"
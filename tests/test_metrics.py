@@ -0,0 +1,126 @@
+import json
+import sys
+import threading
+
+import pytest
+
+from agents.base import BaseAgent
+from agents.config import AGENTS
+from agents.metrics import SIZE_BUCKETS, Histogram, Metrics
+
+
+def test_disabled_registry_records_nothing():
+    metrics = Metrics()
+    metrics.observe("files", 3)
+    with metrics.span("op", "op_seconds") as span:
+        span.set(status="ok")
+
+    assert metrics.histograms() == {}
+    assert metrics.spans() == []
+    assert metrics.render_prometheus() == ""
+
+
+def test_histogram_buckets_are_inclusive_upper_bounds():
+    histogram = Histogram([1, 5])
+    for value in (0, 1, 2, 5, 6):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [2, 4, 5]
+    assert (histogram.count, histogram.total) == (5, 14)
+
+
+def test_observe_keys_by_metric_and_labels_and_picks_default_buckets():
+    metrics = Metrics(enabled=True)
+    metrics.observe("files", 3, agent="b", kind="x")
+    metrics.observe("files", 4, kind="x", agent="b")
+    metrics.observe("files", 1, agent="c")
+    metrics.observe("run_seconds", 0.2)
+
+    histograms = metrics.histograms()
+    assert histograms[("files", (("agent", "b"), ("kind", "x")))].count == 2
+    assert histograms[("files", (("agent", "c"),))].buckets == tuple(SIZE_BUCKETS)
+    assert histograms[("run_seconds", ())].buckets[0] == 0.001
+
+
+def test_render_prometheus_text_format():
+    metrics = Metrics(enabled=True, prefix="t_")
+    metrics.observe("size", 3, buckets=[1, 5], agent='say "hi"\n')
+
+    assert metrics.render_prometheus().splitlines() == [
+        "# TYPE t_size histogram",
+        't_size_bucket{agent="say \\"hi\\"\\n",le="1"} 0',
+        't_size_bucket{agent="say \\"hi\\"\\n",le="5"} 1',
+        't_size_bucket{agent="say \\"hi\\"\\n",le="+Inf"} 1',
+        't_size_sum{agent="say \\"hi\\"\\n"} 3',
+        't_size_count{agent="say \\"hi\\"\\n"} 1',
+    ]
+
+
+def test_spans_nest_record_errors_and_observe_their_metric():
+    metrics = Metrics(enabled=True)
+    with metrics.span("outer", "outer_seconds", agent="a") as outer:
+        outer.set(status="ok")
+        with pytest.raises(ValueError):
+            with metrics.span("inner"):
+                raise ValueError("boom")
+
+    inner, outer = metrics.spans()
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id is None
+    assert inner.attributes == {"error": "ValueError"}
+    assert outer.attributes == {"agent": "a", "status": "ok"}
+    assert metrics.histograms()[("outer_seconds", (("agent", "a"),))].count == 1
+
+
+def test_span_ring_is_bounded_and_reset_clears_everything():
+    metrics = Metrics(enabled=True, max_spans=2)
+    for name in "abc":
+        with metrics.span(name):
+            pass
+    metrics.observe("files", 1)
+
+    assert [span.name for span in metrics.spans()] == ["b", "c"]
+    metrics.reset()
+    assert metrics.spans() == [] and metrics.histograms() == {}
+
+
+def test_agent_hooks_nest_subprocess_spans_under_the_operation(tmp_path):
+    agent = BaseAgent(config=AGENTS["lint_tester"])
+    agent.metrics = Metrics(enabled=True)
+
+    result = agent.run_with_deadline(
+        minutes=1, operation=lambda: agent.run_command([sys.executable, "-c", "print('ok')"]).stdout
+    )
+
+    assert result.strip() == "ok"
+    by_name = {span.name: span for span in agent.metrics.spans()}
+    assert by_name["subprocess"].parent_id == by_name["agent.operation"].span_id
+    assert by_name["subprocess"].attributes["returncode"] == 0
+    assert by_name["agent.operation"].attributes["status"] == "ok"
+    metric_names = {metric for metric, _ in agent.metrics.histograms()}
+    assert {"operation_seconds", "subprocess_seconds", "subprocess_spawn_seconds"} <= metric_names
+
+    trace = json.loads(agent.metrics.write_trace(tmp_path / "trace.json").read_text())
+    assert {span["name"] for span in trace} == {"agent.operation", "subprocess"}
+    text = agent.metrics.write_prometheus(tmp_path / "metrics.prom").read_text()
+    assert 'agents_operation_seconds_count{agent="Lint Tester"} 1' in text
+
+
+def test_operation_span_records_its_status(monkeypatch):
+    monkeypatch.setattr("agents.base._CANCEL_GRACE_SECONDS", 0.05)
+    agent = BaseAgent(config=AGENTS["lint_tester"])
+    agent.metrics = Metrics(enabled=True)
+    release = threading.Event()
+
+    def _error():
+        raise RuntimeError("boom")
+
+    agent.run_with_deadline(1, lambda: "done")
+    with pytest.raises(RuntimeError):
+        agent.run_with_deadline(1, _error)
+    report = agent.run_with_deadline(0.002, lambda: str(release.wait(5)))
+    release.set()
+
+    assert "report truncated" in report
+    statuses = [span.attributes["status"] for span in agent.metrics.spans() if span.name == "agent.operation"]
+    assert statuses == ["ok", "error", "truncated"]
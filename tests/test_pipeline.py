@@ -0,0 +1,206 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from agents.dependency_steward import DependencySteward
+from agents.hallucination_sentinel import HallucinationSentinel
+from agents.infra_scan import ServicePort
+from agents.lockfiles import DependencySpec
+from agents.lint_tester import LintTester
+from agents.pipeline import CANCELLED, FAILED, PASSED, TIMED_OUT, GitTreeHasher, Pipeline, Stage, report_passed
+from agents.socii_guardian import SOCIIGuardian
+from agents.tdd_enforcer import TDDEnforcer
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "sub" / "pkg").mkdir(parents=True)
+    (tmp_path / "sub" / "pkg" / "a.py").write_text("a = 1\n")
+    (tmp_path / "sub" / "b.py").write_text("b = 1\n")
+    (tmp_path / "top.txt").write_text("top\n")
+    return tmp_path
+
+
+def test_hashes_are_relative_to_a_subdirectory_repo(repo):
+    root = GitTreeHasher(repo).hashes(["sub", "sub/pkg", "sub/pkg/a.py", "top.txt"])
+    sub = GitTreeHasher(repo / "sub").hashes([".", "pkg", "pkg/a.py", "./b.py", "top.txt"])
+
+    assert sub["."] == root["sub"]
+    assert sub["pkg"] == root["sub/pkg"]
+    assert sub["pkg/a.py"] == root["sub/pkg/a.py"]
+    assert sub["b.py"] != "missing"
+    assert sub["top.txt"] == "missing"
+    assert len({root["sub"], root["sub/pkg"], root["sub/pkg/a.py"]}) == 3
+
+
+def test_snapshot_sees_uncommitted_changes_without_touching_the_index(repo):
+    before = GitTreeHasher(repo).hashes(["sub/pkg"])["sub/pkg"]
+    (repo / "sub" / "pkg" / "a.py").write_text("a = 2\n")
+
+    assert GitTreeHasher(repo).hashes(["sub/pkg"])["sub/pkg"] != before
+    assert _git(repo, "status", "--porcelain") == "?? sub/\n?? top.txt\n"
+
+
+def test_unchanged_inputs_replay_the_cached_result(repo, tmp_path_factory):
+    cache = tmp_path_factory.mktemp("cache") / "pipeline.json"
+    calls = []
+
+    def _stages():
+        return [
+            Stage("lint_tester", lambda: calls.append("lint") or "Linting succeeded:\n", inputs=("pkg",)),
+            Stage("ghost", lambda: calls.append("ghost") or "ok", inputs=("nope",), time_limit_minutes=1),
+        ]
+
+    first = Pipeline(_stages(), cache_path=cache, repo=repo / "sub").run()
+    second = Pipeline(_stages(), cache_path=cache, repo=repo / "sub").run()
+    assert first.passed and second.passed
+    assert second.results["lint_tester"].cached
+    assert not second.results["ghost"].cached  # inputs that do not exist are never cached
+    assert calls == ["lint", "ghost", "ghost"]
+
+    (repo / "sub" / "pkg" / "a.py").write_text("a = 3\n")
+    third = Pipeline(_stages(), cache_path=cache, repo=repo / "sub").run()
+    assert not third.results["lint_tester"].cached
+
+
+def test_stages_run_uncached_outside_a_git_repository(tmp_path):
+    calls = []
+    stages = [Stage("lint_tester", lambda: calls.append("lint") or "Linting succeeded:\n", inputs=("src",))]
+
+    for _ in range(2):
+        result = Pipeline(stages, cache_path=tmp_path / "cache" / "pipeline.json", repo=tmp_path).run()
+        assert result.passed and not result.results["lint_tester"].cached
+    assert calls == ["lint", "lint"]
+
+
+def test_failed_blocking_stage_cancels_only_its_dependents(repo):
+    stages = [
+        Stage("lint_tester", lambda: "Linting completed with issues (exit 1):\nx"),
+        Stage("api_docsmith", lambda: "docs", needs=("lint_tester",)),
+        Stage("tdd_enforcer", lambda: "ok", needs=("api_docsmith",)),
+        Stage("dependency_steward", lambda: "No version drift detected."),
+    ]
+    result = Pipeline(stages, repo=repo).run()
+
+    statuses = {key: stage.status for key, stage in result.results.items()}
+    assert statuses == {
+        "lint_tester": FAILED,
+        "api_docsmith": CANCELLED,
+        "tdd_enforcer": CANCELLED,
+        "dependency_steward": PASSED,
+    }
+    assert not result.passed
+
+
+def test_stage_budget_times_out_without_waiting_for_the_stage(repo):
+    release = threading.Event()
+    stages = [Stage("slow", lambda: str(release.wait(5)), time_limit_minutes=0.002)]
+    try:
+        result = Pipeline(stages, repo=repo).run()
+    finally:
+        release.set()
+
+    assert result.results["slow"].status == TIMED_OUT
+
+
+def test_queued_stages_are_not_charged_for_waiting(repo):
+    def _stage(key):
+        return Stage(key, lambda: time.sleep(0.3) or "ok", time_limit_minutes=0.5 / 60)
+
+    result = Pipeline([_stage("a"), _stage("b"), _stage("c")], repo=repo, max_workers=1).run()
+
+    assert {key: stage.status for key, stage in result.results.items()} == {"a": PASSED, "b": PASSED, "c": PASSED}
+    assert all(stage.seconds < 0.5 for stage in result.results.values())
+
+
+def test_truncated_reports_fail_the_gate():
+    truncated_scan = (
+        "Security review findings:\n- Scan truncated at the 1-minute deadline; "
+        "3 of 9 infrastructure files were not reviewed."
+    )
+
+    assert not report_passed("socii_guardian", truncated_scan)
+    assert not report_passed("lint_tester", "Linting truncated at the 1-minute deadline; partial output:\n")
+    assert report_passed("socii_guardian", "All services are using secure ports with TLS enforced.")
+
+
+def test_rejects_unknown_needs_and_cycles():
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline([Stage("a", lambda: "", needs=("b",), time_limit_minutes=1)])
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline([Stage("a", lambda: "", needs=("b",)), Stage("b", lambda: "", needs=("a",))])
+
+
+def _lint(tmp_path, exit_code):
+    (tmp_path / "m.py").write_text("x = 1\n")
+    command = [sys.executable, "-c", f"print('m.py:1:1: E1 bad'); raise SystemExit({exit_code})"]
+    return LintTester(command=command).run([tmp_path / "m.py"])
+
+
+def _tdd(tmp_path, with_test):
+    (tmp_path / "mod.py").write_text("x = 1\n")
+    if with_test:
+        (tmp_path / "test_mod.py").write_text("")
+    return TDDEnforcer().review([tmp_path / "mod.py"])
+
+
+REPORTS = {
+    "lint_tester": (lambda tmp_path: _lint(tmp_path, 1), lambda tmp_path: _lint(tmp_path, 0)),
+    "socii_guardian (ports)": (
+        lambda _: SOCIIGuardian().review_ports([ServicePort("web", 23)]),
+        lambda _: SOCIIGuardian().review_ports([ServicePort("web", 443)]),
+    ),
+    "socii_guardian (inventory)": (
+        lambda _: SOCIIGuardian().audit_inventory({"name": ["web"], "port": [23]}),
+        lambda _: SOCIIGuardian().audit_inventory({"name": ["web"], "port": [443]}),
+    ),
+    "socii_guardian (controls)": (
+        lambda _: SOCIIGuardian().review_controls({"mfa": False}),
+        lambda _: SOCIIGuardian().review_controls({"mfa": True}),
+    ),
+    "dependency_steward (drift)": (
+        lambda _: DependencySteward().detect_drift([{"a": "1"}, {"a": "2"}]),
+        lambda _: DependencySteward().detect_drift([{"a": "1"}, {"a": "1"}]),
+    ),
+    "dependency_steward (tracked)": (
+        lambda _: _tracked({"a": "3"}),
+        lambda _: _tracked({"a": "1"}),
+    ),
+    "dependency_steward (advisories)": (
+        lambda _: DependencySteward().flag_insecure({"a": ["1"]}, [DependencySpec("a", "1", "x")]),
+        lambda _: DependencySteward().flag_insecure({"a": ["1"]}, [DependencySpec("a", "2", "x")]),
+    ),
+    "hallucination_sentinel (claims)": (
+        lambda _: HallucinationSentinel().verify_claims(["c"]),
+        lambda _: HallucinationSentinel().verify_claims(["c"], {"c": ["doc"]}),
+    ),
+    "hallucination_sentinel (gate)": (
+        lambda _: HallucinationSentinel().gate_stream(["no evidence"], max_unsupported_chars=5),
+        lambda _: HallucinationSentinel().gate_response("See [1].", contains_evidence=True),
+    ),
+    "tdd_enforcer": (lambda tmp_path: _tdd(tmp_path, False), lambda tmp_path: _tdd(tmp_path, True)),
+}
+
+
+def _tracked(final):
+    steward = DependencySteward()
+    steward.track_manifest("one", {"a": "1"})
+    steward.track_manifest("two", {"a": "2"})
+    return steward.track_manifest("two", final)
+
+
+@pytest.mark.parametrize("name", sorted(REPORTS))
+def test_gate_recognizes_each_agent_report_format(name, tmp_path):
+    failing, passing = REPORTS[name]
+    key = name.split(" ")[0]
+
+    assert not report_passed(key, failing(tmp_path))
+    assert report_passed(key, passing(tmp_path))
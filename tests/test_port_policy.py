@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from agents.port_policy import PolicyFindings, PortPolicy, iter_inventory
+
+
+def test_default_policy_denies_plaintext_ports_and_requires_tls():
+    policy = PortPolicy()
+
+    assert policy.check("web", 80) == (True, False)
+    assert policy.check("web", 443) == (False, False)
+    assert policy.check("web", 443, tls_required=False) == (False, True)
+    assert policy.check("web", 70000) == (False, False)
+
+
+def test_allowlist_and_ranges():
+    policy = PortPolicy(denied=["6000-6002"], allowed=[(1, 1023), 8443])
+
+    assert policy.check("x", 22)[0] is False
+    assert policy.check("x", 8443)[0] is False
+    assert policy.check("x", 8080)[0] is True
+    assert policy.check("x", 6001)[0] is True
+    with pytest.raises(ValueError):
+        PortPolicy(denied=["90-80"])
+
+
+def test_tls_rules_are_per_environment_and_later_rules_win():
+    policy = PortPolicy().tls(False, environment="dev", ports=["8000-8999"]).tls(True, environment="dev", ports=[8443])
+
+    assert policy.check("svc", 8080, tls_required=False, environment="dev") == (False, False)
+    assert policy.check("svc", 8443, tls_required=False, environment="dev") == (False, True)
+    assert policy.check("svc", 8080, tls_required=False, environment="prod") == (False, True)
+
+
+def test_mutating_a_compiled_policy_recompiles():
+    policy = PortPolicy().compile()
+    assert policy.check("svc", 8080) == (False, False)
+
+    policy.deny(8080)
+    assert policy.check("svc", 8080) == (True, False)
+
+
+def test_exceptions_waive_specific_ports_or_whole_services():
+    policy = PortPolicy().exempt("sftp", [21]).exempt("debug")
+
+    assert policy.check("sftp", 21) == (False, False)
+    assert policy.check("sftp", 23) == (True, False)
+    assert policy.check("debug", 80, tls_required=False) == (False, False)
+
+
+def test_load_from_json(tmp_path):
+    path = tmp_path / "policy.json"
+    path.write_text(
+        json.dumps(
+            {
+                "denied": [80, "6000-6063"],
+                "tls": {"dev": [{"required": False, "ports": ["8000-8999"]}], "lab": False},
+                "exceptions": {"legacy": [6010]},
+            }
+        )
+    )
+    policy = PortPolicy.load(path)
+
+    assert policy.check("svc", 6001)[0] is True
+    assert policy.check("legacy", 6010) == (False, False)
+    assert policy.check("svc", 21) == (False, False)
+    assert policy.check("svc", 8001, tls_required=False, environment="dev") == (False, False)
+    assert policy.check("svc", 443, tls_required=False, environment="lab") == (False, False)
+
+
+def test_audit_aggregates_findings_per_port():
+    inventory = {
+        "name": ["a", "b", "c", "d", "e", "f"],
+        "port": [80, 80, 443, 8080, 99999, 21],
+        "tls_required": [True, "yes", True, "false", True, True],
+        "environment": [None, "prod", None, "prod", None, None],
+    }
+    findings = PortPolicy().exempt("f").audit(inventory, max_examples=1)
+
+    assert findings.checked == 6
+    assert findings.insecure == {80: 2}
+    assert findings.plaintext == {8080: 1}
+    assert findings.invalid == 1
+    assert findings.waived == 1
+    assert findings.examples[("insecure", 80)] == ["a"]
+    report = findings.render()
+    assert "Port 80 is insecure" in report
+    assert "(2 services, e.g. a)." in report
+    assert "1 record has a port number outside 0-65535." in report
+    assert "1 finding was waived by policy exceptions." in report
+
+
+def test_audit_merges_chunks_and_reports_clean_inventories():
+    chunks = [{"name": ["a"], "port": [80]}, {"name": ["b", "c"], "port": [80, 443]}]
+    findings = PortPolicy().audit(chunks)
+
+    assert findings.checked == 3
+    assert findings.insecure == {80: 2}
+    assert findings.examples[("insecure", 80)] == ["a", "b"]
+
+    clean = PortPolicy().audit({"name": ["a"], "port": [443]})
+    assert not clean
+    assert clean.render() == "All 1 service ports comply with the port policy."
+    assert not PolicyFindings()
+
+
+def test_audit_reads_csv_inventories_in_chunks(tmp_path):
+    path = tmp_path / "ports.csv"
+    path.write_text("name,port,tls_required,environment\na,80,true,\nb,8080,no,dev\n\nc,443,1,prod\n")
+
+    chunks = list(iter_inventory(path, chunk_size=2))
+    assert [chunk["port"] for chunk in chunks] == [[80, 8080], [443]]
+    assert chunks[0]["tls_required"] == [True, False]
+    assert chunks[0]["environment"] == [None, "dev"]
+
+    findings = PortPolicy().audit(path)
+    assert findings.checked == 3
+    assert findings.insecure == {80: 1}
+    assert findings.plaintext == {8080: 1}
+
+
+def test_iter_inventory_requires_name_and_port(tmp_path):
+    path = tmp_path / "ports.csv"
+    path.write_text("service,port\na,80\n")
+
+    with pytest.raises(ValueError, match="name"):
+        list(iter_inventory(path))
+
+
+def test_vectorized_audit_matches_row_audit():
+    np = pytest.importorskip("numpy")
+    from agents.port_policy import _VECTORIZE_MIN_ROWS
+
+    rows = _VECTORIZE_MIN_ROWS + 10
+    ports = [(80, 443, 8080, 21, 70000)[i % 5] for i in range(rows)]
+    inventory = {
+        "name": [f"svc{i}" for i in range(rows)],
+        "port": np.asarray(ports),
+        "tls_required": [i % 3 != 0 for i in range(rows)],
+        "environment": [("dev", "prod", "")[i % 3] for i in range(rows)],
+    }
+    policy = PortPolicy().tls(False, environment="dev").exempt("svc3")
+
+    vectorized = policy.audit(inventory)
+    rowwise = policy._audit_rows(inventory, 3)
+    assert vectorized.insecure == rowwise.insecure
+    assert vectorized.plaintext == rowwise.plaintext
+    assert (vectorized.invalid, vectorized.waived) == (rowwise.invalid, rowwise.waived)
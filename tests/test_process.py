@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import pytest
+
+from agents.process import Deadline, run_streaming
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs setsid")
+def test_descendant_holding_the_pipes_does_not_outlive_the_deadline():
+    deadline = Deadline.after(0.5)
+    start = time.monotonic()
+
+    result = run_streaming(["sh", "-c", "setsid sleep 5 & echo hi"], deadline)
+
+    assert time.monotonic() - start < 3
+    assert result.stdout == "hi\n"
+    assert result.timed_out and result.truncated
+
+
+def test_output_is_decoded_and_buffers_are_released():
+    deadline = Deadline.after(30)
+    command = [sys.executable, "-c", "import sys; sys.stdout.write('a\\r\\nb'); sys.stderr.write('err\\n')"]
+
+    result = run_streaming(command, deadline)
+
+    assert (result.stdout, result.stderr) == ("a\nb", "err\n")
+    assert not result.timed_out and not result.truncated
+    assert deadline.buffers == []
+
+
+def test_deadline_kills_the_command_and_keeps_partial_output():
+    command = [sys.executable, "-u", "-c", "import time; print('started'); time.sleep(30)"]
+    start = time.monotonic()
+
+    result = run_streaming(command, Deadline.after(0.5))
+
+    assert time.monotonic() - start < 5
+    assert result.timed_out
+    assert result.stdout == "started\n"
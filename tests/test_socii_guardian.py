@@ -0,0 +1,59 @@
+import dataclasses
+import time
+
+import pytest
+
+from agents import infra_scan
+from agents.infra_scan import InfraScanner
+from agents.socii_guardian import SOCIIGuardian
+
+_real_scan_batch = infra_scan._scan_batch
+
+
+def _slow_scan_batch(jobs):
+    time.sleep(1.0)
+    return _real_scan_batch(jobs)
+
+
+@pytest.fixture
+def infra(tmp_path):
+    for index in range(200):
+        (tmp_path / f"docker-compose.{index}.yml").write_text(
+            f"services:\n  web{index}:\n    ports:\n      - \"443:443\"\n"
+        )
+    return tmp_path
+
+
+def test_complete_scan_reports_secure_ports(infra):
+    report = SOCIIGuardian().review_infra(infra, workers=1)
+
+    assert report == "All services are using secure ports with TLS enforced."
+
+
+def test_scan_cut_short_by_the_deadline_fails_closed(infra, monkeypatch):
+    monkeypatch.setattr(infra_scan, "_scan_batch", _slow_scan_batch)
+    guardian = SOCIIGuardian()
+    guardian.config = dataclasses.replace(guardian.config, time_limit_minutes=0.02)
+
+    started = time.monotonic()
+    report = guardian.review_infra(infra, workers=1)
+
+    assert time.monotonic() - started < 5
+    assert report.startswith("Security review findings:")
+    assert "Scan truncated at the 0.02-minute deadline" in report
+    assert "of 200 infrastructure files were not reviewed" in report
+
+
+def test_closing_a_parallel_scan_does_not_wait_for_running_batches(infra, monkeypatch):
+    monkeypatch.setattr(infra_scan, "_scan_batch", _slow_scan_batch)
+    scanner = InfraScanner(infra, workers=2)
+    scan = scanner.scan()
+
+    started = time.monotonic()
+    for _ in range(65):  # every port of the first batch, plus one from the second
+        next(scan)
+    scan.close()
+
+    # Two batches take about a second in parallel; the other two were running or queued and are not awaited.
+    assert time.monotonic() - started < 1.8
+    assert scanner.unreviewed_files == 200 - 64
@@ -0,0 +1,112 @@
+import json
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from agents.storage import (
+    atomic_write_text,
+    connect,
+    is_skipped_dir,
+    load_json_cache,
+    prune_dirs,
+    save_json_cache,
+    transaction,
+)
+
+
+def test_prune_dirs_skips_vcs_virtualenv_and_hidden_directories():
+    assert prune_dirs(["src", ".git", "node_modules", ".cache", "venv", "docs", "__pycache__"]) == ["docs", "src"]
+    assert is_skipped_dir(".tox")
+    assert not is_skipped_dir("tests")
+
+
+def test_transaction_commits_and_rolls_back(tmp_path):
+    path = tmp_path / "db.sqlite"
+    with connect(path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        with transaction(conn):
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pytest.raises(RuntimeError):
+            with transaction(conn):
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("abort")
+    with connect(path) as conn:
+        assert conn.execute("SELECT v FROM t").fetchall() == [(1,)]
+
+
+def test_transaction_serializes_concurrent_writers(tmp_path):
+    path = tmp_path / "db.sqlite"
+    with connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE counter (n INTEGER)")
+        conn.execute("INSERT INTO counter VALUES (0)")
+
+    def bump():
+        for _ in range(25):
+            with connect(path) as conn, transaction(conn):
+                (n,) = conn.execute("SELECT n FROM counter").fetchone()
+                conn.execute("UPDATE counter SET n = ?", (n + 1,))
+
+    threads = [threading.Thread(target=bump) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with connect(path) as conn:
+        assert conn.execute("SELECT n FROM counter").fetchone() == (100,)
+
+
+def test_json_cache_round_trip_checks_version_and_root(tmp_path):
+    cache = tmp_path / "nested" / "cache.json"
+    save_json_cache(cache, 2, {"files": {"a.py": [1, 2]}}, tmp_path)
+
+    assert load_json_cache(cache, 2, tmp_path)["files"] == {"a.py": [1, 2]}
+    assert load_json_cache(cache, 3, tmp_path) is None
+    assert load_json_cache(cache, 2, tmp_path / "nested") is None
+    assert load_json_cache(tmp_path / "missing.json", 2) is None
+    assert load_json_cache(None, 2) is None
+
+
+def test_load_json_cache_ignores_corrupt_files(tmp_path):
+    cache = tmp_path / "cache.json"
+    cache.write_text("{not json")
+    assert load_json_cache(cache, 1) is None
+    cache.write_text(json.dumps([1, 2]))
+    assert load_json_cache(cache, 1) is None
+
+
+def test_atomic_write_uses_unique_staging_files(tmp_path):
+    target = tmp_path / "out.txt"
+    errors = []
+
+    def write(index):
+        try:
+            for _ in range(20):
+                atomic_write_text(target, f"writer {index}\n" * 1000)
+        except Exception as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    lines = set(target.read_text().splitlines())
+    assert len(lines) == 1  # never a mix of two writers
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+
+def test_connect_waits_for_busy_writer(tmp_path):
+    path = tmp_path / "db.sqlite"
+    with connect(path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+    with connect(path) as holder:
+        holder.execute("BEGIN IMMEDIATE")
+        with connect(path, busy_timeout=0.05) as other:
+            with pytest.raises(sqlite3.OperationalError):
+                other.execute("BEGIN IMMEDIATE")
+        holder.execute("ROLLBACK")
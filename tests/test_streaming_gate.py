@@ -0,0 +1,122 @@
+import pytest
+
+from agents.hallucination_sentinel import HallucinationSentinel
+from agents.streaming_gate import APPROVED, BLOCKED, PENDING, StreamingGate
+
+
+def test_approves_at_first_marker_with_its_position():
+    gate = StreamingGate()
+
+    assert gate.feed("The cache is invalidated on write ").state == PENDING
+    decision = gate.feed("[12] and again later.")
+
+    assert decision.state == APPROVED
+    assert decision.marker == "[12]"
+    assert decision.position == len("The cache is invalidated on write [12]")
+    assert decision.early
+    assert gate.close() is decision
+
+
+def test_finds_markers_split_across_chunks():
+    gate = StreamingGate()
+    for chunk in ["See https", ":", "//example.org/spec for details."]:
+        decision = gate.feed(chunk)
+
+    assert decision.state == APPROVED
+    assert decision.marker == "https://e"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Sources: the design doc.",
+        "Covered by tests/unit/test_cache.py.",
+        "Run pytest to confirm.",
+        "As shown in doi:10.1000/182.",
+        "Footnoted claim.[^note-1]",
+    ],
+)
+def test_default_markers(text):
+    gate = StreamingGate()
+    gate.feed(text)
+
+    assert gate.close().state == APPROVED
+
+
+def test_blocks_mid_stream_once_the_unsupported_budget_is_spent():
+    gate = StreamingGate(max_unsupported_chars=10)
+
+    assert gate.feed("12345").state == PENDING
+    decision = gate.feed("67890 [1]")
+    assert decision.state == BLOCKED
+    assert decision.early
+    assert "after 14 characters" in decision.reason
+    assert gate.feed("more [2]").state == BLOCKED
+    assert gate.consumed == 22
+
+
+@pytest.mark.parametrize("text", ["123456 [1] tail", "1234567 [1] tail"])
+def test_decision_does_not_depend_on_chunking(text):
+    whole = StreamingGate(max_unsupported_chars=10)
+    whole.feed(text)
+    by_char = StreamingGate(max_unsupported_chars=10)
+    for char in text:
+        by_char.feed(char)
+
+    assert whole.close().state == by_char.close().state
+
+
+def test_close_fails_closed():
+    assert StreamingGate().close().reason == "Response blocked: empty content."
+    gate = StreamingGate()
+    gate.feed("Plain prose without support.")
+    decision = gate.close()
+    assert decision.state == BLOCKED
+    assert not decision.early
+    assert decision.reason == "Response blocked: insufficient evidence or citations detected."
+    with pytest.raises(ValueError):
+        StreamingGate(max_unsupported_chars=0)
+
+
+def test_filter_stops_consuming_a_blocked_source():
+    pulled = []
+
+    def stream():
+        try:
+            for index in range(100):
+                pulled.append(index)
+                yield "word " * 4
+        finally:
+            pulled.append("closed")
+
+    relayed = list(StreamingGate(max_unsupported_chars=50).filter(stream()))
+
+    assert len(relayed) == 2
+    assert pulled == [0, 1, 2, "closed"]
+
+
+def test_filter_hold_back_withholds_text_until_approved():
+    gate = StreamingGate(max_unsupported_chars=100)
+    assert list(gate.filter(["a ", "b ", "see [3] ", "c"], hold_back=True)) == ["a b ", "see [3] ", "c"]
+    assert gate.decision.state == APPROVED
+
+    gate = StreamingGate(max_unsupported_chars=100)
+    assert list(gate.filter(["a ", "b "], hold_back=True)) == []
+    assert gate.decision.state == BLOCKED
+
+
+def test_sentinel_gate_stream_matches_gate_response():
+    sentinel = HallucinationSentinel()
+    closed = []
+
+    def stream():
+        try:
+            yield "Answer backed by [1]."
+            yield "never pulled"
+        finally:
+            closed.append(True)
+
+    assert sentinel.gate_stream(stream()) == sentinel.gate_response("x", contains_evidence=True)
+    assert closed == [True]
+    assert sentinel.gate_stream([]) == sentinel.gate_response("", contains_evidence=False)
+    assert sentinel.gate_stream(["no support"]) == sentinel.gate_response("x", contains_evidence=False)
@@ -0,0 +1,34 @@
+import pytest
+
+from agents.tdd_enforcer import TDDEnforcer
+from agents.testfile_index import TestFileIndex
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for path in ["pkg/foo.py", "pkg/test_foo.py", "pkg/bar.py", "tests/test_bar.py", "pkg/baz.py",
+                 "tests/other/test_baz.py", "pkg/qux.py", "tests/test_qux_integration.py"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_indexed_and_unindexed_lookups_apply_the_same_rule(repo, indexed):
+    enforcer = TDDEnforcer(test_index=TestFileIndex(".") if indexed else None)
+    changed = ["pkg/foo.py", "pkg/bar.py", "pkg/baz.py", "pkg/qux.py", "tests/test_qux_integration.py"]
+
+    missing = [finding.path for finding in enforcer.iter_missing_tests(changed)]
+
+    # baz only has a test outside its expected locations; qux is covered by the changed test's name.
+    assert missing == ["pkg/baz.py"]
+
+
+def test_index_membership_matches_the_disk(repo):
+    index = TestFileIndex(repo)
+
+    assert "tests/test_bar.py" in index
+    assert repo / "pkg" / "test_foo.py" in index
+    assert "pkg/foo.py" not in index
+    assert "tests/test_missing.py" not in index
@@ -0,0 +1,69 @@
+import sys
+
+import pytest
+
+from agents.tdd_enforcer import TDDEnforcer, _apportion, _junit_durations
+from agents.timing_db import TimingDatabase, plan_shards
+
+
+def test_record_keeps_a_moving_average(tmp_path):
+    db = TimingDatabase(tmp_path / "timings.db", smoothing=0.5)
+    db.record({"tests/test_a.py": 4.0, "tests/test_b.py": 1.0})
+    db.record({"tests/test_a.py": 2.0})
+
+    assert db.durations() == {"tests/test_a.py": 3.0, "tests/test_b.py": 1.0}
+    assert db.durations(["tests/test_b.py", "tests/test_c.py"]) == {"tests/test_b.py": 1.0}
+
+
+def test_smoothing_must_be_a_weight(tmp_path):
+    with pytest.raises(ValueError):
+        TimingDatabase(tmp_path / "timings.db", smoothing=0)
+
+
+def test_plan_shards_balances_by_duration():
+    durations = {"a": 8.0, "b": 4.0, "c": 4.0, "d": 2.0, "e": 2.0}
+    shards = plan_shards(list(durations), durations, 2)
+
+    assert [shard.files for shard in shards] == [["a", "d"], ["b", "c", "e"]]
+    assert [shard.estimated_seconds for shard in shards] == [10.0, 10.0]
+
+
+def test_plan_shards_weights_unknown_files_with_the_median_and_drops_empty_shards():
+    shards = plan_shards(["known", "new"], {"known": 3.0, "other": 5.0}, 4)
+
+    assert len(shards) == 2
+    assert sorted(shard.estimated_seconds for shard in shards) == [3.0, 4.0]
+
+
+def test_junit_durations_sum_per_file(tmp_path):
+    report = tmp_path / "junit.xml"
+    report.write_text(
+        "<testsuites><testsuite>"
+        '<testcase classname="tests.test_a" name="one" time="0.5"/>'
+        '<testcase classname="tests.test_a.TestGroup" name="two" time="1.5"/>'
+        '<testcase file="tests/test_b.py" classname="x" name="three" time="2"/>'
+        "</testsuite></testsuites>"
+    )
+
+    assert _junit_durations(str(report), ["tests/test_a.py", "tests/test_b.py"]) == {
+        "tests/test_a.py": 2.0,
+        "tests/test_b.py": 2.0,
+    }
+    assert _junit_durations(str(tmp_path / "missing.xml"), ["tests/test_a.py"]) == {}
+
+
+def test_apportion_splits_wall_time_by_history():
+    assert _apportion(6.0, ["a", "b"], {"a": 2.0, "b": 1.0}) == {"a": 4.0, "b": 2.0}
+
+
+def test_sharded_run_records_timings_and_reports_failures(tmp_path):
+    script = "import sys; sys.exit(1 if any('fail' in arg for arg in sys.argv[1:]) else 0)"
+    db = TimingDatabase(tmp_path / "timings.db")
+    enforcer = TDDEnforcer(test_command=[sys.executable, "-c", script], shards=2, timing_db=db)
+    files = ["tests/test_ok.py", "tests/test_fail.py", "tests/test_more.py"]
+
+    report = enforcer.run_with_deadline(minutes=None, operation=lambda: enforcer._run_sharded(files))
+
+    assert report.startswith("Fast-feedback tests failed in 1 of 2 shards.")
+    assert report.count("- Shard ") == 2
+    assert set(db.durations()) == set(files)
@@ -0,0 +1,149 @@
+import dataclasses
+import os
+import sys
+import time
+
+import pytest
+
+from agents.dependency_steward import DependencySteward
+from agents.lint_tester import LintTester
+from agents.work_queue import (
+    DONE, FAILED, PENDING, RUNNING, DriftJob, LintJob, LocalQueue, SQLiteQueue, Task, TaskFailed, Worker, gather,
+    run_job, run_local, task_handler,
+)
+
+
+@task_handler("test_echo")
+def _echo(payload):
+    return payload["value"]
+
+
+@task_handler("test_sleep")
+def _sleep(payload):
+    time.sleep(payload["seconds"])
+    return payload["seconds"]
+
+
+@task_handler("test_slow_first")
+def _slow_first(payload):
+    try:
+        os.mkdir(payload["marker"])
+    except FileExistsError:
+        return "stolen copy"
+    time.sleep(30)
+    return "original"
+
+
+@task_handler("test_flaky")
+def _flaky(payload):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(params=["local", "sqlite"])
+def queue(request, tmp_path):
+    return LocalQueue() if request.param == "local" else SQLiteQueue(tmp_path / "queue.db")
+
+
+def _status(queue, task_id):
+    return queue.results([task_id])[task_id][0]
+
+
+def test_claims_oldest_task_first_and_first_result_wins(queue):
+    first, second = queue.put([Task("test_echo", {"value": 1}), Task("test_echo", {"value": 2})])
+
+    assert queue.claim("a", lease_seconds=60).id == first
+    assert queue.claim("b", lease_seconds=60).id == second
+    assert queue.claim("c", lease_seconds=60) is None
+    assert queue.complete(first, "a", "from a")
+    assert not queue.complete(first, "b", "from b")
+    assert queue.results([first])[first] == (DONE, "from a", None)
+
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(queue):
+    (task_id,) = queue.put([Task("test_echo", {"value": 1}, max_attempts=2)])
+
+    assert queue.claim("a", lease_seconds=0).id == task_id
+    assert not queue.renew(task_id, "b", lease_seconds=60)
+    assert queue.claim("b", lease_seconds=0).id == task_id
+    assert not queue.renew(task_id, "a", lease_seconds=60)
+    assert queue.claim("c", lease_seconds=60) is None
+    status, _, error = queue.results([task_id])[task_id]
+    assert (status, error) == (FAILED, "Lease expired after 2 attempt(s).")
+
+
+def test_failed_attempts_are_retried_then_fail_the_task(queue):
+    (task_id,) = queue.put([Task("test_flaky", {}, max_attempts=2)])
+    worker = Worker(queue, "w", lease_seconds=60)
+
+    assert worker.run_once()
+    assert _status(queue, task_id) == PENDING
+    assert worker.run_once()
+    assert queue.results([task_id])[task_id] == (FAILED, None, "RuntimeError: boom")
+    assert not worker.run_once()
+    with pytest.raises(TaskFailed, match="boom"):
+        gather(queue, [task_id], timeout=0)
+
+
+def test_idle_worker_steals_a_straggler_once(queue):
+    (task_id,) = queue.put([Task("test_echo", {"value": 1})])
+    queue.claim("slow", lease_seconds=60)
+
+    assert queue.claim("idle", lease_seconds=60, steal_after=60) is None
+    assert queue.claim("slow", lease_seconds=60, steal_after=0) is None  # never from itself
+    assert queue.claim("idle", lease_seconds=60, steal_after=0).id == task_id
+    assert queue.claim("other", lease_seconds=60, steal_after=0) is None  # stolen tasks are not stolen again
+    assert not queue.renew(task_id, "slow", lease_seconds=60)
+    assert queue.renew(task_id, "idle", lease_seconds=60)
+    assert _status(queue, task_id) == RUNNING
+
+    queue.fail(task_id, "slow", "late failure")  # the original owner no longer decides
+    assert _status(queue, task_id) == RUNNING
+    assert queue.complete(task_id, "slow", "late but first")
+    assert gather(queue, [task_id], timeout=0) == ["late but first"]
+    assert queue.results([task_id]) == {}
+
+
+def test_run_local_returns_results_in_task_order(queue):
+    tasks = [Task("test_echo", {"value": value}) for value in range(5)]
+
+    assert run_local(tasks, queue=queue, workers=2, processes=False) == [0, 1, 2, 3, 4]
+
+
+def test_run_local_returns_the_stolen_copy_without_waiting_for_the_straggler(tmp_path):
+    tasks = [Task("test_slow_first", {"marker": str(tmp_path / "started")}), Task("test_echo", {"value": 1})]
+    start = time.monotonic()
+
+    assert run_local(tasks, workers=2, steal_after=0.2) == ["stolen copy", 1]
+    assert time.monotonic() - start < 10
+
+
+def test_run_local_timeout_kills_running_tasks_in_the_process_pool():
+    tasks = [Task("test_sleep", {"seconds": 30}), Task("test_echo", {"value": 1})]
+    queue = LocalQueue()
+    start = time.monotonic()
+
+    with pytest.raises(TimeoutError):
+        run_local(tasks, queue=queue, workers=2, timeout=0.5)
+    assert time.monotonic() - start < 10
+    assert queue.results([task.id for task in tasks]) == {}
+
+
+def test_run_job_bounds_lint_shards_by_the_agent_budget(tmp_path):
+    for index in range(3):
+        (tmp_path / f"m{index}.py").write_text("x = 1\n")
+    hang = [sys.executable, "-c", "import time; time.sleep(30)"]
+    agent = LintTester(command=hang)
+    agent.config = dataclasses.replace(agent.config, time_limit_minutes=0.01)
+    start = time.monotonic()
+
+    report = run_job(LintJob(agent, [tmp_path], shards=3), workers=3)
+
+    assert time.monotonic() - start < 10
+    assert report.startswith("Linting truncated at the 0.01-minute deadline")
+
+
+def test_drift_job_matches_the_agent_report():
+    manifests = [{"requests": "2.31.0", "idna": "3.4"}, {"requests": "2.32.0"}, {"idna": "3.4"}]
+    agent = DependencySteward()
+
+    assert run_job(DriftJob(agent, manifests, batch_size=2), workers=2) == agent.detect_drift(manifests)